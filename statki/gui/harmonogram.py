@@ -0,0 +1,72 @@
+"""
+
+    statki.gui.harmonogram
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Harmonogram zbiorczych aktualizacji widżetów.
+
+"""
+
+from collections import namedtuple
+
+
+class Harmonogram:
+    """
+    Harmonogram aktualizacji GUI: zbiera zmiany widżetów zlecone w trakcie obsługi zdarzenia (np. salwy) i wykonuje je razem, gdy Tk jest bezczynne. Kolejne zmiany tego samego celu są scalane - opcje widżetu nadpisują się, a z wywołań o tym samym kluczu wykonywane jest tylko ostatnie.
+
+    Harmonogram liczy wywołania Tk zlecone (tyle wykonałaby bezpośrednia aktualizacja) i faktycznie wykonane w każdym zapisie - ich różnica to oszczędność zapisu.
+    """
+
+    Zapis = namedtuple("Zapis", "zlecone wykonane")
+
+    def __init__(self, widzet):
+        self.widzet = widzet  # widżet, którego after_idle() planuje zapisy
+        self.zmiany = {}  # {klucz: [funkcja, argumenty, opcje]} w kolejności zlecenia
+        self.zlecone = 0
+        self.zaplanowany = False
+        self.ostatni_zapis = self.Zapis(0, 0)
+        self.ilosc_zapisow = 0
+        self.suma_zleconych = 0
+        self.suma_wykonanych = 0
+
+    def ustaw(self, widzet, **opcje):
+        """Zleć zmianę opcji widżetu (jak w `configure()`)."""
+        if widzet in self.zmiany:
+            self.zmiany[widzet][2].update(opcje)
+        else:
+            self.zmiany[widzet] = [widzet.configure, (), dict(opcje)]
+        self.zlec(1)
+
+    def wywolaj(self, klucz, funkcja, *argumenty, zlecone=1):
+        """
+        Zleć wywołanie funkcji aktualizującej widżety, zastępując wywołanie zlecone wcześniej z tym samym kluczem. Funkcja może zwrócić ilość wykonanych wywołań Tk (domyślnie liczone jest jedno), a `zlecone` to ilość wywołań Tk, które wykonałaby aktualizacja bezpośrednia.
+        """
+        self.zmiany.pop(klucz, None)  # ostatnie zlecenie trafia na koniec kolejki
+        self.zmiany[klucz] = [funkcja, argumenty, {}]
+        self.zlec(zlecone)
+
+    def zlec(self, ilosc):
+        """Policz zlecone wywołania Tk i zaplanuj zapis (jeśli nie jest już zaplanowany)."""
+        self.zlecone += ilosc
+        if not self.zaplanowany:
+            self.zaplanowany = True
+            self.widzet.after_idle(self.zapisz)
+
+    def zapisz(self):
+        """Wykonaj zebrane zmiany i zapamiętaj statystyki zapisu. Podaj zapis."""
+        zmiany, self.zmiany = self.zmiany, {}
+        wykonane = 0
+        for funkcja, argumenty, opcje in zmiany.values():
+            wynik = funkcja(*argumenty, **opcje)
+            wykonane += wynik if isinstance(wynik, int) else 1
+        self.ostatni_zapis = self.Zapis(self.zlecone, wykonane)
+        self.ilosc_zapisow += 1
+        self.suma_zleconych += self.zlecone
+        self.suma_wykonanych += wykonane
+        self.zlecone = 0
+        self.zaplanowany = False
+        return self.ostatni_zapis
+
+    def podaj_oszczednosc(self):
+        """Podaj łączną ilość wywołań Tk zaoszczędzonych przez wszystkie zapisy."""
+        return self.suma_zleconych - self.suma_wykonanych
@@ -10,24 +10,29 @@
 import tkinter as tk
 from tkinter import ttk
 
-from statki.plansza import Plansza
-from statki.mechanika import Gra
+from statki.mechanika import Gra, Rozgrywka
+from statki.pula import PULA
 from statki.komunikaty import Komunikator
 from .plansza import PlanszaGracza, PlanszaPrzeciwnika
 from .kontrola import KontrolaAtaku, KontrolaFloty, KontrolaGry
 from .komunikaty import PasekKomunikatow
+from .harmonogram import Harmonogram
 from . import stale
 
 
 class Interfejs(ttk.Frame):
     """Główny interfejs gry."""
 
-    def __init__(self, rodzic, kolumny, rzedy):
+    def __init__(self, rodzic, kolumny, rzedy, renderer="przyciski"):
         super().__init__(rodzic)
         self.grid()
+        self.renderer = renderer  # sposób rysowania plansz: "przyciski" lub "kanwa"
+        self.harmonogram = Harmonogram(self)  # zbiorcze aktualizacje widżetów wszystkich sekcji
         self.ustaw_style()
-        gracz = Gra(Plansza(kolumny, rzedy))
-        przeciwnik = Gra(Plansza(kolumny, rzedy))
+        # pulę uzupełnia się dopiero po wyrysowaniu okna, by wątek w tle nie spowalniał budowania interfejsu
+        gracz = Gra(PULA.podaj_plansze(kolumny, rzedy, uzupelniaj=False))
+        przeciwnik = Gra(PULA.podaj_plansze(kolumny, rzedy, uzupelniaj=False))
+        self.rozgrywka = Rozgrywka(gracz, przeciwnik)  # rozstrzyga salwy i prowadzi rundy obu stron
         self.buduj_plansze(gracz, przeciwnik)
         self.buduj_sekcje_kontroli()
         self.buduj_pasek_komunikatow()
@@ -36,6 +41,7 @@ class Interfejs(ttk.Frame):
         self.wybierz_statek_startowy()
         self.przekaz_komunikator()
         self.wyswietl_komunikaty()
+        self.after_idle(PULA.uzupelnij, kolumny, rzedy)
 
     def ustaw_style(self):
         """Ustaw style dla okna głównego."""
@@ -51,8 +57,10 @@ class Interfejs(ttk.Frame):
 
     def buduj_plansze(self, gracz, przeciwnik):
         """Buduj plansze gracza i przeciwnika"""
-        self.plansza_gracza = PlanszaGracza(self, 10, 10, gra=gracz)
-        self.plansza_przeciwnika = PlanszaPrzeciwnika(self, 10, 10, gra=przeciwnik)
+        self.plansza_gracza = PlanszaGracza(self, 10, 10, gra=gracz, renderer=self.renderer,
+                                            harmonogram=self.harmonogram)
+        self.plansza_przeciwnika = PlanszaPrzeciwnika(self, 10, 10, gra=przeciwnik, renderer=self.renderer,
+                                                      harmonogram=self.harmonogram)
 
     def buduj_sekcje_kontroli(self):
         """Buduj sekcje kontroli: ataku, floty i gry po prawej stronie okna głównego."""
@@ -123,6 +131,9 @@ class Interfejs(ttk.Frame):
         self.kontrola_gry.kf = self.kontrola_floty
         # KG
         self.plansza_przeciwnika.kg = self.kontrola_gry
+        # rozgrywka
+        self.plansza_przeciwnika.rozgrywka = self.rozgrywka
+        self.kontrola_gry.rozgrywka = self.rozgrywka
 
     def wybierz_statek_startowy(self):
         """Wybierz największy statek na rozpoczęcie gry."""
@@ -167,7 +167,8 @@ class KontrolaAtaku(Sekcja):
     def na_wybor_orientacji(self, event=None):
         """Czyść pole tekstowe comboboksu orientacji."""
         event.widget.selection_clear()
-        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.get()
+        self.combo_orientacji.orientacja = self.combo_orientacji.get()  # wybór z listy rozwijanej omija set()
+        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.orientacja
 
     def wylacz_salwe_i_orientacje(self):
         """Wyłącz comboboksy salwy i orientacji. Metoda wywoływana po oddaniu ostatniej salwy."""
@@ -230,7 +231,7 @@ class KontrolaAtaku(Sekcja):
         else:
             self.combo_orientacji.set(self.combo_orientacji["values"][0])
         self.combo_orientacji.ostatnia_salwa = salwa
-        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.get()
+        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.orientacja
 
     def wylacz_pozycje_salwy(self, pozycja):
         """Wyłącz podaną pozycję salwy"""
@@ -253,13 +254,13 @@ class KontrolaAtaku(Sekcja):
     # CALLBACK okna głównego
     def na_prawy_przycisk_myszy(self, event=None):
         """Rotuj wybraną orientacją salw (i w efekcie celownikiem na planszy przeciwnika)."""
-        indeks = self.combo_orientacji.current()
-        if indeks == len(self.combo_orientacji["values"]) - 1:
-            indeks = 0
+        orientacje = self.combo_orientacji["values"]
+        if self.combo_orientacji.orientacja in orientacje:
+            indeks = (orientacje.index(self.combo_orientacji.orientacja) + 1) % len(orientacje)
         else:
-            indeks += 1
-        self.combo_orientacji.set(self.combo_orientacji["values"][indeks])
-        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.get()
+            indeks = 0
+        self.combo_orientacji.set(orientacje[indeks])
+        self.combo_orientacji.ostatnia_orientacja = self.combo_orientacji.orientacja
 
 
 class ComboZeZmianaCzcionki(ttk.Combobox):
@@ -279,12 +280,20 @@ class ComboZeZmianaCzcionki(ttk.Combobox):
 class ComboOrientacji(ComboZeZmianaCzcionki):
     """
     Combobox orientacji salwy - zachowuje informację o ostatniej salwie i wybranej orientacji, tak że jeśli kolejna salwa ataku odpowiada poprzedniej - orientacja wybrana poprzednio w comboboksie pozostaje niezmieniona.
+
+    Bieżąca orientacja jest dodatkowo pamiętana po stronie Pythona (`orientacja`), dzięki czemu celownik planszy przeciwnika nie odpytuje comboboksa (Tcl) przy każdym ruchu myszy.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.ostatnia_salwa = 0
         self.ostatnia_orientacja = ""
+        self.orientacja = ""
+
+    def set(self, value):
+        """Ustaw orientację w comboboksie i zapamiętaj ją."""
+        super().set(value)
+        self.orientacja = value
 
 
 class PozycjeSalwy(ttk.Frame):
@@ -705,6 +714,25 @@ class DrzewoFlotyGracza(DrzewoFloty):
         tag_ranga, tag_statek = self.item(iid)["tags"][:2]
         self.item(iid, tags=(tag_ranga, tag_statek, "zablokowane"))
 
+    def aktualizuj_statek(self, statek):
+        """
+        Aktualizuj ilość nietrafionych pól, siłę ognia (obniżaną trafieniami razem z rangą i podwyższaną premiami za ofiary) i ofiary podanego statku. Aktualizacja wykonywana jest zbiorczo przez harmonogram aktualizacji - kilka aktualizacji statku w trakcie jednej salwy czy rundy daje jeden zapis.
+        """
+        iid = str(statek.polozenie)
+        self.plansza_gui.harmonogram.wywolaj((self, iid), self.zapisz_statek, statek, zlecone=2)
+
+    def zapisz_statek(self, statek):
+        """Zapisz w wierszu drzewa bieżące wartości podanego statku. Podaj ilość wywołań Tk."""
+        iid = str(statek.polozenie)
+        wartosci = list(self.item(iid)["values"])
+        wartosci[2:5] = [
+            statek.podaj_nietrafione_na_rozmiar(),
+            str(statek.sila_ognia),
+            "".join([statek.ORDER for ofiara in statek.ofiary])
+        ]
+        self.item(iid, values=wartosci)
+        return 2
+
 
 class DrzewoFlotyPrzeciwnika(DrzewoFloty):
     """
@@ -741,6 +769,7 @@ class KontrolaGry(Sekcja):
         self.pp = kwargs["plansza_przeciwnika"]
         self.ka = None  # sekcja kontroli ataku przekazywana przez GręGUI
         self.kf = None  # sekcja kontroli floty przekazywana przez GręGUI
+        self.rozgrywka = None  # silnik rozgrywki przekazywany przez GręGUI
         self.ustaw_style()
         self.ustaw_etyramke()
         self.ustaw_tytul()
@@ -869,34 +898,42 @@ class KontrolaGry(Sekcja):
             self.nowa_tura = False
 
     def aktualizuj_stan_gry(self, czyj="gracza"):
-        """Aktualizuj etykietę stanu gry."""
+        """Aktualizuj (zbiorczo, przez harmonogram aktualizacji) etykietę stanu gry."""
         if czyj == "gracza":
-            self.stan_g.configure(text=self.podaj_tekst_stanu(self.pg.gra))
+            self.pg.harmonogram.ustaw(self.stan_g, text=self.podaj_tekst_stanu(self.pg.gra))
         elif czyj == "przeciwnika":
-            self.stan_p.configure(text=self.podaj_tekst_stanu(self.pp.gra))
+            self.pg.harmonogram.ustaw(self.stan_p, text=self.podaj_tekst_stanu(self.pp.gra))
 
     # CALLBACK przycisku KONIEC RUNDY
     def na_koniec_rundy(self, event=None):
-        """Zakończ rundę."""
+        """Zakończ rundę. Po ruchu przeciwnika, który zakończył grę, atak pozostaje zablokowany."""
+        if self.rozgrywka.czy_koniec():
+            return
         zgrany_statek = self.pg.gra.tura.runda.napastnik
         self.pg.kasuj_wybor_statku(zgrany_statek)
         self.pg.zmien_stan_statku(zgrany_statek, "disabled")
         self.kf.drzewo_g.wyszarz_statek(zgrany_statek)
-        self.pp.gra.tura.runda.salwy_otrzymane = self.pg.gra.tura.runda.salwy_oddane
-        self.pg.gra.tura.dodaj_runde() if not self.nowa_tura else self.pg.gra.dodaj_ture()
+        self.rozgrywka.zakoncz_runde()  # dodaje kolejną rundę/turę gracza i przekazuje ruch przeciwnikowi
+        self.wykonaj_ruch_przeciwnika()
+        if self.rozgrywka.czy_koniec():
+            self.zakoncz_gre()
+            return
         self.odblokuj_widzety()
         self.pg.wybierz_statek(self.pg.gra.tura.runda.napastnik)
         self.ustaw_tytul()
         self.ustaw_przycisk()
         self.komunikator.o_rundzie(self.pg.gra)  # TODO: komunikat o ruchu przeciwnika
-        # TODO
-        # self.wykonaj_ruch_przeciwnika()
 
     def powiaz_enter(self):
         """Powiąż callback obsługujący naciśnięcie ENTER."""
         self.winfo_toplevel().bind("<Return>", self.na_koniec_rundy)
         self.winfo_toplevel().bind("<KP_Enter>", self.na_koniec_rundy)
 
+    def zakoncz_gre(self):
+        """Zablokuj atak i przycisk KONIEC RUNDY po zakończeniu gry."""
+        self.ka.blokuj_atak()
+        self.koniec_rundy.state(["disabled"])
+
     def odblokuj_widzety(self):
         """
         Odblokuj widżety umożliwiające zmianę statku zablokowane po pierwszej salwie w rundzie oraz comboboksy zablokowane po oddaniu ostatniej salwy.
@@ -908,10 +945,14 @@ class KontrolaGry(Sekcja):
 
     def wykonaj_ruch_przeciwnika(self):
         """
-        Wykonuj ruch przeciwnika.
+        Wykonuj ruch przeciwnika. Silnik rozgrywki rozgrywa całą rundę przeciwnika, przekazuje graczowi otrzymane salwy i usuwa z jego napastników statki zatopione w tej rundzie.
         """
-        # self.pp.gra.zrob_ruch()
-        # salwy = self.pp.gra.tura.runda.salwy_oddane
-        # self.pg.oznacz_salwy(salwy)
-        # self.pg.gra.tura.runda.salwy_otrzymane = salwy
-        # self.pg.gra.tura.filtruj_zatopione()
+        if not self.rozgrywka.czy_koniec():
+            salwy = self.rozgrywka.rozegraj_runde()  # runda gracza może już być nową turą, bez otrzymanych salw
+            self.pg.oznacz_salwy(salwy)
+            self.aktualizuj_stan_gry("gracza")
+            for salwa in salwy:
+                for pole, trafienie in zip(salwa.pola, salwa.trafienia):
+                    statek = self.pg.gra.plansza.podaj_statek(pole) if trafienie else None
+                    if statek in self.pg.gra.plansza.niezatopione:
+                        self.kf.drzewo_g.aktualizuj_statek(statek)
@@ -11,8 +11,10 @@ import tkinter as tk
 from tkinter import ttk
 from collections import namedtuple
 
-from statki.plansza import Plansza, Pole, Salwa
+from statki.plansza import Plansza, Pole
+from statki.mechanika import AI
 from .sekcja import Sekcja
+from .harmonogram import Harmonogram
 
 
 class PoleGUI(ttk.Button):
@@ -62,20 +64,221 @@ class PoleGUI(ttk.Button):
         self.pole = pole
 
 
+WygladPola = namedtuple("WygladPola", "styl tekst stany")  # stany: frozenset stanów ttk (bez "active")
+ZdarzeniePola = namedtuple("ZdarzeniePola", "widget")  # zastępcze zdarzenie przekazywane callbackom pól kanwy
+
+
+class PoleKanwy:
+    """
+    Pole planszy rysowane na kanwie: prostokąt i glif jako elementy kanwy. Udostępnia ten sam podzbiór interfejsu co 'PoleGUI' (`pole`, `configure()`, `state()`), więc plansze obsługują oba rodzaje pól jednakowo. Wygląd pola wynika z jego stylu i stanów - tak jak w przypadku przycisku ttk.
+    """
+
+    def __init__(self, kanwa, pole, prostokat, glif):
+        self.kanwa = kanwa
+        self.pole = pole
+        self.prostokat = prostokat  # id elementu kanwy
+        self.glif = glif  # jw.
+        self.opcje = {"style": "", "text": ""}
+        self.stany = frozenset()
+
+    def configure(self, cnf=None, **kwargs):
+        """
+        Zmień opcje pola (`style` i/lub `text`) i przerysuj je. Wywołana z nazwą opcji podaje krotkę, której ostatnim elementem jest wartość opcji (jak `configure()` w Tkinterze).
+        """
+        if cnf is not None:
+            return cnf, cnf, "", "", self.opcje[cnf]
+        self.opcje.update(kwargs)
+        self.rysuj()
+
+    def state(self, stany):
+        """Zmień stany pola (np. ["disabled"], ["!active"]) i przerysuj je, jeśli się zmieniły."""
+        nowe_stany = set(self.stany)
+        for stan in stany:
+            if stan.startswith("!"):
+                nowe_stany.discard(stan[1:])
+            else:
+                nowe_stany.add(stan)
+        if nowe_stany != self.stany:
+            self.stany = frozenset(nowe_stany)
+            self.rysuj()
+
+    def rysuj(self):
+        """Przerysuj pole wg jego stylu, stanów i tekstu."""
+        tlo, tekst = self.kanwa.podaj_wyglad(self.opcje["style"], self.stany)
+        self.kanwa.itemconfigure(self.prostokat, fill=tlo)
+        self.kanwa.itemconfigure(self.glif, fill=tekst, text=self.opcje["text"])
+
+
+class KanwaPlanszy(tk.Canvas):
+    """
+    Plansza rysowana na jednej kanwie (zamiast osobnego przycisku dla każdego pola): etykiety kolumn i rzędów oraz pola jako elementy kanwy. Zdarzenia myszy obsługiwane są przez kanwę i przekazywane polu pod kursorem.
+    """
+
+    ROZMIAR_POLA = 26  # w pikselach
+    MARGINES_LEWY = 26  # miejsce na etykiety rzędów
+    MARGINES_GORNY = 20  # miejsce na etykiety kolumn
+
+    def __init__(self, rodzic, plansza, styl):
+        super().__init__(
+            rodzic,
+            width=self.MARGINES_LEWY + plansza.kolumny * self.ROZMIAR_POLA + 1,
+            height=self.MARGINES_GORNY + plansza.rzedy * self.ROZMIAR_POLA + 1,
+            highlightthickness=0
+        )
+        self.plansza = plansza
+        self.styl = styl
+        self.wyglady = {}  # {(styl, stany): (kolor tła, kolor tekstu)}
+        self.pola_gui = []
+        self.pole_pod_kursorem = None
+        self.pole_nacisniete = None
+        self.na_klikniecie = None
+        self.zdarzenia = {}
+        self.rysuj_etykiety()
+        self.rysuj_pola()
+
+    def rysuj_etykiety(self):
+        """Rysuje etykiety kolumn i rzędów."""
+        for kolumna in range(1, self.plansza.kolumny + 1):
+            self.create_text(
+                self.MARGINES_LEWY + (kolumna - 0.5) * self.ROZMIAR_POLA,
+                self.MARGINES_GORNY // 2,
+                text=Plansza.ALFABET[kolumna],
+                font="TkDefaultFont"
+            )
+        for rzad in range(1, self.plansza.rzedy + 1):
+            self.create_text(
+                self.MARGINES_LEWY - 6,
+                self.MARGINES_GORNY + (rzad - 0.5) * self.ROZMIAR_POLA,
+                text=str(rzad),
+                anchor=tk.E,
+                font="TkDefaultFont"
+            )
+
+    def rysuj_pola(self):
+        """Rysuje pola planszy i buduje ich matrycę (listę rzędów (list) obiektów klasy PoleKanwy)."""
+        tlo, tekst = self.podaj_wyglad("", frozenset())
+        for rzad in range(1, self.plansza.rzedy + 1):
+            y = self.MARGINES_GORNY + (rzad - 1) * self.ROZMIAR_POLA
+            pola_rzedu = []
+            for kolumna in range(1, self.plansza.kolumny + 1):
+                x = self.MARGINES_LEWY + (kolumna - 1) * self.ROZMIAR_POLA
+                prostokat = self.create_rectangle(
+                    x, y, x + self.ROZMIAR_POLA, y + self.ROZMIAR_POLA, fill=tlo, outline="gray60"
+                )
+                glif = self.create_text(
+                    x + self.ROZMIAR_POLA // 2, y + self.ROZMIAR_POLA // 2, fill=tekst, font="TkDefaultFont"
+                )
+                pola_rzedu.append(PoleKanwy(self, self.plansza.podaj_pole(kolumna, rzad), prostokat, glif))
+            self.pola_gui.append(pola_rzedu)
+
+    def podaj_wyglad(self, styl, stany):
+        """
+        Podaj kolory tła i tekstu pola o wskazanym stylu i stanach. Kolory odczytywane są ze stylów ttk (tych samych co dla pól-przycisków), raz dla każdej kombinacji stylu i stanów.
+        """
+        klucz = (styl, stany)
+        if klucz not in self.wyglady:
+            styl = styl or "TButton"
+            self.wyglady[klucz] = (
+                self.styl.lookup(styl, "background", sorted(stany)),
+                self.styl.lookup(styl, "foreground", sorted(stany))
+            )
+        return self.wyglady[klucz]
+
+    def podaj_pole_gui(self, x, y):
+        """Podaj pole kanwy w punkcie o podanych współrzędnych (w pikselach) lub 'None' poza polami."""
+        kolumna = (x - self.MARGINES_LEWY) // self.ROZMIAR_POLA
+        rzad = (y - self.MARGINES_GORNY) // self.ROZMIAR_POLA
+        if 0 <= kolumna < self.plansza.kolumny and 0 <= rzad < self.plansza.rzedy:
+            return self.pola_gui[rzad][kolumna]
+        return None
+
+    def powiaz(self, na_klikniecie, zdarzenia):
+        """
+        Powiąż callbacki pól: kliknięcie (wywoływane ze współrzędnymi pola) i zdarzenia (wywoływane z obiektem zdarzenia, którego 'widget' to pole pod kursorem). Wejście do pola i wyjście z niego (<Enter> i <Leave>) wykrywane są na podstawie ruchu kursora nad kanwą.
+        """
+        self.na_klikniecie = na_klikniecie
+        self.zdarzenia = zdarzenia
+        self.bind("<Motion>", self.na_ruch)
+        self.bind("<Leave>", lambda event: self.zmien_pole_pod_kursorem(None))
+        self.bind("<ButtonPress-1>", self.na_nacisniecie)
+        self.bind("<ButtonRelease-1>", self.na_puszczenie)
+        for sekwencja, callback in zdarzenia.items():
+            if sekwencja not in ("<Enter>", "<Leave>"):
+                self.bind(sekwencja, lambda event, callback=callback: self.przekaz(callback, event))
+
+    def na_ruch(self, event):
+        """Wykryj zmianę pola pod kursorem."""
+        self.zmien_pole_pod_kursorem(self.podaj_pole_gui(event.x, event.y))
+
+    def zmien_pole_pod_kursorem(self, pole_gui):
+        """
+        Opuść poprzednie pole pod kursorem i wejdź do nowego (podświetlając je jak przycisk ttk: tylko jeśli nie jest wyłączone).
+        """
+        if pole_gui is self.pole_pod_kursorem:
+            return
+        if self.pole_pod_kursorem is not None:
+            self.pole_pod_kursorem.state(["!active"])
+            if "<Leave>" in self.zdarzenia:
+                self.zdarzenia["<Leave>"](ZdarzeniePola(self.pole_pod_kursorem))
+        self.pole_pod_kursorem = pole_gui
+        if pole_gui is not None:
+            if "disabled" not in pole_gui.stany:
+                pole_gui.state(["active"])
+            if "<Enter>" in self.zdarzenia:
+                self.zdarzenia["<Enter>"](ZdarzeniePola(pole_gui))
+
+    def na_nacisniecie(self, event):
+        """Zapamiętaj pole, w którym naciśnięto lewy przycisk myszy."""
+        self.pole_nacisniete = self.podaj_pole_gui(event.x, event.y)
+
+    def na_puszczenie(self, event):
+        """
+        Wywołaj callback kliknięcia, jeśli lewy przycisk myszy puszczono w tym samym (włączonym) polu, w którym go naciśnięto - jak w przypadku przycisku ttk.
+        """
+        pole_gui = self.podaj_pole_gui(event.x, event.y)
+        if pole_gui is not None and pole_gui is self.pole_nacisniete and "disabled" not in pole_gui.stany:
+            self.na_klikniecie(*pole_gui.pole.podaj_wspolrzedne())
+        self.pole_nacisniete = None
+
+    def przekaz(self, callback, event):
+        """Przekaż zdarzenie callbackowi pola pod kursorem."""
+        pole_gui = self.podaj_pole_gui(event.x, event.y)
+        if pole_gui is not None:
+            callback(ZdarzeniePola(pole_gui))
+
+
 class PlanszaGUI(Sekcja):  # nie powinna być powiększana.
     """
     Graficzna reprezentacja planszy - szczegółowa implementacja w klasach potomnych.
+
+    Pola mogą być rysowane jako osobne przyciski (renderer "przyciski") lub jako elementy jednej kanwy (renderer "kanwa") - interfejs planszy jest w obu przypadkach ten sam.
+
+    Wygląd pól (styl, tekst i stany) jest lustrzanie przechowywany po stronie Pythona - plansza nie odpytuje widżetów o ich styl. Zmiany wyglądu zapisywane są w lustrze, a do widżetów trafiają zbiorczo (przez harmonogram aktualizacji wspólny dla całego interfejsu), gdy Tk jest bezczynne - i tylko dla tych pól, których wygląd faktycznie się zmienił. Stan "active" (podświetlenie pod kursorem i celownik) zmieniany jest w widżetach od razu, tak jak robi to sam ttk.
     """
 
+    RENDERERY = ("przyciski", "kanwa")
+
     def __init__(self, rodzic, odstep_zewn, odstep_wewn, tytul, **kwargs):
         super().__init__(rodzic, odstep_zewn, odstep_wewn, tytul)
         self.gra = kwargs["gra"]
+        self.renderer = kwargs.get("renderer", "przyciski")
+        self.harmonogram = kwargs.get("harmonogram") or Harmonogram(self)
+        if self.renderer not in self.RENDERERY:
+            tekst_bledu = "Nieznany renderer planszy: '{}'. Dostępne renderery: {}.".format(
+                self.renderer, ", ".join(self.RENDERERY))
+            raise ValueError(tekst_bledu)
         # self.tytul = tytul
         self.pola_gui = [[0 for kolumna in range(self.gra.plansza.kolumny)]
-                         for rzad in range(self.gra.plansza.rzedy)]  # matryca (lista rzędów (list)) obiektów klasy PoleGUI (tu inicjalizowanych jako "0")
+                         for rzad in range(self.gra.plansza.rzedy)]  # matryca (lista rzędów (list)) obiektów klasy PoleGUI lub PoleKanwy (tu inicjalizowanych jako "0")
+        self.kanwa = None
+        self.wyglady_pol = [WygladPola("", "", frozenset())] * self.gra.plansza.rozmiar  # lustro wyglądu pól (indeksy jak w magazynie planszy)
+        self.zmienione_pola = {}  # {indeks: wygląd pola zapisany ostatnio w widżecie}
         self.ustaw_style()
-        self.buduj_etykiety()
-        self.buduj_pola()
+        if self.renderer == "kanwa":
+            self.buduj_kanwe()
+        else:
+            self.buduj_etykiety()
+            self.buduj_pola()
 
     def ustaw_style(self):
         """Definiuje style dla pól."""
@@ -167,34 +370,103 @@ class PlanszaGUI(Sekcja):  # nie powinna być powiększana.
                 )
                 self.pola_gui[j][i] = pole_gui
 
+    def buduj_kanwe(self):
+        """Buduje kanwę z etykietami i polami planszy."""
+        self.kanwa = KanwaPlanszy(self.etyramka, self.gra.plansza, self.styl)
+        self.kanwa.grid()
+        self.pola_gui = self.kanwa.pola_gui
+
+    def powiaz_pola(self, na_klikniecie, zdarzenia):
+        """
+        Powiąż callbacki wszystkich pól: kliknięcie (wywoływane ze współrzędnymi pola) i zdarzenia w postaci słownika {sekwencja: callback} (wywoływane z obiektem zdarzenia, którego 'widget' to pole GUI).
+        """
+        if self.kanwa is not None:
+            self.kanwa.powiaz(na_klikniecie, zdarzenia)
+            return
+        for i in range(self.gra.plansza.kolumny):
+            for j in range(self.gra.plansza.rzedy):
+                kolumna, rzad = i + 1, j + 1
+                pole_gui = self.podaj_pole_gui(kolumna, rzad)
+                # lambda bez własnych argumentów (w formie: lambda: self.na_klikniecie(kolumna, rzad) nie zadziała prawidłowo w tym przypadku - zmienne przekazywane do każdej funkcji (anonimowej czy nie - bez różnicy) są zawsze ewaluowane dopiero w momencie wywołania tej funkcji, tak więc w tym przypadku w danej iteracji pętli zostają przekazane zmienne "i" i "j" (nazwy) a nie ich wartości - wartości zostaną ewaluowane dopiero w momencie wywołania callbacka (czyli naciśnięcia przycisku) i będzie to wartość z ostatniej iteracji dla wszystkich przycisków, więcej tutaj: https://stackoverflow.com/questions/2295290/what-do-lambda-function-closures-capture/23557126))
+                pole_gui.configure(command=lambda x=kolumna, y=rzad: na_klikniecie(x, y))  # lambda konieczna, bo nie da się tego obsłużyć tak jak niżej z bind() - w przypadku przypisywania callbacków opcją 'command' nie ma przekazywania obiektu zdarzenia, z którego można by pobrać współrzędne pola
+                for sekwencja, callback in zdarzenia.items():
+                    pole_gui.bind(sekwencja, callback)
+
     def podaj_pole_gui(self, kolumna, rzad):
         """Podaje pole planszy."""
         return self.pola_gui[rzad - 1][kolumna - 1]
 
+    def podaj_indeks_pola(self, pole_gui):
+        """Podaj indeks pola GUI w lustrze wyglądu pól."""
+        return self.gra.plansza.podaj_indeks(*pole_gui.pole.podaj_wspolrzedne())
+
+    def podaj_styl(self, pole_gui):
+        """Podaj styl pola (z lustra wyglądu, bez odpytywania widżetu)."""
+        return self.wyglady_pol[self.podaj_indeks_pola(pole_gui)].styl
+
+    def ustaw_wyglad_pola(self, pole_gui, styl=None, tekst=None, stan=None):
+        """Ustaw wygląd pola GUI - patrz: `ustaw_wyglad()`."""
+        self.ustaw_wyglad(self.podaj_indeks_pola(pole_gui), styl, tekst, stan)
+
+    def ustaw_wyglad(self, indeks, styl=None, tekst=None, stan=None):
+        """
+        Ustaw w lustrze styl, tekst i/lub stan (np. "disabled" lub "!disabled") pola o podanym indeksie. Jeśli wygląd pola się zmienił, zaplanuj zapis zmian w widżetach.
+        """
+        wyglad = nowy_wyglad = self.wyglady_pol[indeks]
+        if styl is not None:
+            nowy_wyglad = nowy_wyglad._replace(styl=styl)
+        if tekst is not None:
+            nowy_wyglad = nowy_wyglad._replace(tekst=tekst)
+        if stan is not None:
+            if stan.startswith("!"):
+                nowy_wyglad = nowy_wyglad._replace(stany=nowy_wyglad.stany - {stan[1:]})
+            else:
+                nowy_wyglad = nowy_wyglad._replace(stany=nowy_wyglad.stany | {stan})
+        if nowy_wyglad != wyglad:
+            self.zmienione_pola.setdefault(indeks, wyglad)
+            self.wyglady_pol[indeks] = nowy_wyglad
+            zlecone = (nowy_wyglad[:2] != wyglad[:2]) + (nowy_wyglad.stany != wyglad.stany)  # configure() i/lub state()
+            self.harmonogram.wywolaj(self, self.zapisz_wyglad, zlecone=zlecone)
+
+    def zapisz_wyglad(self):
+        """
+        Zapisz zbiorczo w widżetach zmiany wyglądu pól od ostatniego zapisu. Pola, których wygląd wrócił do zapisanego, są pomijane. Podaj ilość wykonanych wywołań Tk.
+        """
+        kolumny = self.gra.plansza.kolumny
+        wykonane = 0
+        for indeks, zapisany in self.zmienione_pola.items():
+            wyglad = self.wyglady_pol[indeks]
+            pole_gui = self.pola_gui[indeks // kolumny][indeks % kolumny]
+            opcje = {}
+            if wyglad.styl != zapisany.styl:
+                opcje["style"] = wyglad.styl
+            if wyglad.tekst != zapisany.tekst:
+                opcje["text"] = wyglad.tekst
+            if opcje:
+                pole_gui.configure(**opcje)
+                wykonane += 1
+            stany = sorted(wyglad.stany - zapisany.stany)
+            stany += ["!" + stan for stan in sorted(zapisany.stany - wyglad.stany)]
+            if stany:
+                pole_gui.state(stany)
+                wykonane += 1
+        self.zmienione_pola = {}
+        return wykonane
+
     def oznacz_pudlo(self, pole_gui):
         """Oznacza podane pole jako pudło."""
-        pole_gui.pole.znacznik = Pole.ZNACZNIKI.pudlo
-        pole_gui.configure(style=PoleGUI.STYLE.pudlo, text=PoleGUI.GLIFY.pudlo)
+        self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.pudlo, tekst=PoleGUI.GLIFY.pudlo)
 
     def oznacz_trafione(self, pole_gui, symbol=None):
         """Oznacza podane pole jako trafione."""
-        pole_gui.pole.znacznik = Pole.ZNACZNIKI.trafiony
-        if symbol:
-            pole_gui.configure(style=PoleGUI.STYLE.trafiony, text=symbol)
-        else:
-            pole_gui.configure(style=PoleGUI.STYLE.trafiony)
+        self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.trafiony, tekst=symbol or None)
 
     def zatop_statek(self, statek, z_symbolami=False):
         """Oznacza pola wskazanego statku jako zatopione."""
+        symbol = statek.RANGA_BAZOWA.symbol if z_symbolami else None
         for pole in statek.pola:
-            pole.znacznik = Pole.ZNACZNIKI.zatopiony
             pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
-            pole_gui.configure(style=PoleGUI.STYLE.zatopiony)
-            if z_symbolami:
-                pole_gui.configure(text=statek.RANGA_BAZOWA.symbol)
-
-        self.gra.plansza.zatopione.append(statek)
-        self.gra.plansza.niezatopione.remove(statek)
+            self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.zatopiony, tekst=symbol)
 
 
 class PlanszaGracza(PlanszaGUI):
@@ -238,14 +510,10 @@ class PlanszaGracza(PlanszaGUI):
     def powiaz_callbacki(self):
         """Powiąż callbacki."""
         # wszystkie pola
-        for i in range(self.gra.plansza.kolumny):
-            for j in range(self.gra.plansza.rzedy):
-                kolumna, rzad = i + 1, j + 1
-                pole_gui = self.podaj_pole_gui(kolumna, rzad)
-                # lambda bez własnych argumentów (w formie: lambda: self.na_klikniecie(kolumna, rzad) nie zadziała prawidłowo w tym przypadku - zmienne przekazywane do każdej funkcji (anonimowej czy nie - bez różnicy) są zawsze ewaluowane dopiero w momencie wywołania tej funkcji, tak więc w tym przypadku w danej iteracji pętli zostają przekazane zmienne "i" i "j" (nazwy) a nie ich wartości - wartości zostaną ewaluowane dopiero w momencie wywołania callbacka (czyli naciśnięcia przycisku) i będzie to wartość z ostatniej iteracji dla wszystkich przycisków, więcej tutaj: https://stackoverflow.com/questions/2295290/what-do-lambda-function-closures-capture/23557126))
-                pole_gui.configure(command=lambda x=kolumna, y=rzad: self.na_klikniecie(x, y))  # lambda konieczna, bo nie da się tego obsłużyć tak jak niżej z bind() - w przypadku przypisywania callbacków opcją 'command' nie ma przekazywania obiektu zdarzenia, z którego można by pobrać współrzędne pola
-                pole_gui.bind("<Enter>", self.na_wejscie)
-                pole_gui.bind("<Leave>", self.na_wyjscie)
+        self.powiaz_pola(self.na_klikniecie, {
+            "<Enter>": self.na_wejscie,
+            "<Leave>": self.na_wyjscie
+        })
         # okno główne
         self.winfo_toplevel().bind("[", self.na_nawias_kw_lewy)
         self.winfo_toplevel().bind("]", self.na_nawias_kw_prawy)
@@ -303,9 +571,9 @@ class PlanszaGracza(PlanszaGUI):
         for pole in statek.pola:
             pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
             if pole_gui.pole.znacznik == Pole.ZNACZNIKI.trafiony:
-                pole_gui.configure(style=PoleGUI.STYLE.wybrany_trafiony)
+                self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.wybrany_trafiony)
             else:
-                pole_gui.configure(style=PoleGUI.STYLE.wybrany)
+                self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.wybrany)
         self.gra.tura.runda.ustaw_napastnika(statek)
         # kontrola widżetów w innych sekcjach
         self.ka.combo_statku.set(statek)
@@ -322,19 +590,19 @@ class PlanszaGracza(PlanszaGUI):
         for pole in statek.pola:
             pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
             if pole_gui.pole.znacznik == Pole.ZNACZNIKI.trafiony:
-                pole_gui.configure(style=PoleGUI.STYLE.trafiony)
+                self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.trafiony)
             else:
-                pole_gui.configure(style=PoleGUI.STYLE.bazowy)
+                self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.bazowy)
 
     def odkryj_wszystkie_pola(self):
         """Odkryj wszystkie pola planszy."""
         for rzad in self.pola_gui:
             for pole_gui in rzad:
                 if pole_gui.pole.znacznik in (Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.obwiednia):
-                    pole_gui.configure(style=PoleGUI.STYLE.woda)
+                    self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.woda)
                 else:
                     statek = self.gra.plansza.podaj_statek(pole_gui.pole)
-                    pole_gui.configure(text=statek.RANGA_BAZOWA.symbol)
+                    self.ustaw_wyglad_pola(pole_gui, tekst=statek.RANGA_BAZOWA.symbol)
 
     def wylacz_zablokowane_statki(self):
         """
@@ -355,22 +623,45 @@ class PlanszaGracza(PlanszaGUI):
         """Zmień stan podanego statku."""
         for pole in statek.pola:
             pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
-            pole_gui.state([stan])
+            self.ustaw_wyglad_pola(pole_gui, stan=stan)
 
     def oznacz_salwy(self, salwy):
-        """Oznacz otrzymane salwy. Obsłuż ewentualne zatopienia."""
-        pass  # TODO
+        """
+        Oznacz na planszy pola odkryte otrzymanymi salwami: pudła i trafienia. Oznacz zatopione nimi statki (pola statków zachowują symbole rang).
+        """
+        zatopione = []
+        for salwa in salwy:
+            for pole in salwa.pola:
+                pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
+                if pole.znacznik == Pole.ZNACZNIKI.pudlo:
+                    self.oznacz_pudlo(pole_gui)
+                elif pole.znacznik == Pole.ZNACZNIKI.trafiony:
+                    self.oznacz_trafione(pole_gui)
+                else:
+                    statek = self.gra.plansza.podaj_statek(pole)
+                    if statek not in zatopione:
+                        zatopione.append(statek)
+        for statek in zatopione:
+            self.zatop_statek(statek)
 
 
 class PlanszaPrzeciwnika(PlanszaGUI):
     """Graficzna reprezentacja planszy przeciwnika."""
 
+    # przesunięcia (kolumna, rząd) pól celownika względem pola, w które wycelowano salwę - dla każdej orientacji salwy
+    # (z tych samych kierunków salw, z których silnik gry wylicza pokrycia salw)
+    CELOWNIK = {
+        orientacja: tuple(Plansza.PRZESUNIECIA[Plansza.NUMERY_KIERUNKOW[kierunek]] for kierunek in kierunki)
+        for orientacja, kierunki in AI.KIERUNKI_SALWY.items()
+    }
+
     def __init__(self, rodzic, odstep_zewn, odstep_wewn, tytul="Przeciwnik", **kwargs):
         super().__init__(rodzic, odstep_zewn, odstep_wewn, tytul, **kwargs)
         self.pg = None  # przekazywane przez GręGUI
         self.ka = None  # jw.
         self.kf = None  # jw.
         self.kg = None  # jw.
+        self.rozgrywka = None  # jw.
         self.komunikator = None  # jw.
         self.ustaw_style_przeciwnika()
         self.powiaz_callbacki()
@@ -386,98 +677,57 @@ class PlanszaPrzeciwnika(PlanszaGUI):
 
     def wlacz_atak(self):
         """Włącz nieodkryte pola oraz celownik."""
-        for rzad in self.pola_gui:
-            for pole_gui in rzad:
-                if pole_gui.configure("style")[-1] in [PoleGUI.STYLE.bazowy, ""]:
-                    pole_gui.state(["!disabled"])
-                    pole_gui.configure(style=PoleGUI.STYLE.atak)
+        for indeks, wyglad in enumerate(self.wyglady_pol):
+            if wyglad.styl in [PoleGUI.STYLE.bazowy, ""]:
+                self.ustaw_wyglad(indeks, styl=PoleGUI.STYLE.atak, stan="!disabled")
 
     def wylacz_atak(self):
         """Wyłącza nieodkryte pola oraz celownik."""
-        for rzad in self.pola_gui:
-            for pole_gui in rzad:
-                if pole_gui.configure("style")[-1] == PoleGUI.STYLE.atak:
-                    pole_gui.state(["disabled"])
-                    pole_gui.configure(style=PoleGUI.STYLE.bazowy)
+        for indeks, wyglad in enumerate(self.wyglady_pol):
+            if wyglad.styl == PoleGUI.STYLE.atak:
+                self.ustaw_wyglad(indeks, styl=PoleGUI.STYLE.bazowy, stan="disabled")
 
     def powiaz_callbacki(self):
         """Powiąż callbacki we wszystkich polach."""
-        for i in range(self.gra.plansza.kolumny):
-            for j in range(self.gra.plansza.rzedy):
-                kolumna, rzad = i + 1, j + 1
-                pole_gui = self.podaj_pole_gui(kolumna, rzad)
-                pole_gui.configure(command=lambda x=kolumna, y=rzad: self.na_klikniecie(x, y))
-                pole_gui.bind("<Enter>", self.na_wejscie)
-                pole_gui.bind("<Leave>", self.na_wyjscie)
-                # obracanie podświetlaniem
-                pole_gui.bind("<ButtonRelease-3>", self.na_wejscie)
-                pole_gui.bind("<ButtonPress-3>", self.na_wyjscie)
+        self.powiaz_pola(self.na_klikniecie, {
+            "<Enter>": self.na_wejscie,
+            "<Leave>": self.na_wyjscie,
+            # obracanie podświetlaniem
+            "<ButtonRelease-3>": self.na_wejscie,
+            "<ButtonPress-3>": self.na_wyjscie
+        })
 
     # CALLBACK wszystkich pól
     def na_klikniecie(self, kolumna, rzad):
         """
         W zależności od wybranej orientacji w sekcji kontroli ataku oddaj salwę w wybrane pola oraz wyświetl komunikaty o salwie i zatopieniu.
         """
-        if self.pg.gra.tura.runda.mozna_atakowac:
-            ilosc_zatopionych = len(self.gra.plansza.zatopione)
-            # 1 pole
-            if self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.C:
-                self.oddaj_salwe((kolumna, rzad))
-            # 2 pola (w prawo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.E:
-                self.oddaj_salwe((kolumna, rzad), (kolumna + 1, rzad))
-            # 2 pola (w dół)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.S:
-                self.oddaj_salwe((kolumna, rzad), (kolumna, rzad + 1))
-            # 2 pola (w lewo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.W:
-                self.oddaj_salwe((kolumna, rzad), (kolumna - 1, rzad))
-            # 2 pola (w górę)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.N:
-                self.oddaj_salwe((kolumna, rzad), (kolumna, rzad - 1))
-            # 3 pola poziomo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.WE:
-                self.oddaj_salwe((kolumna, rzad), (kolumna - 1, rzad), (kolumna + 1, rzad))
-            # 3 pola pionowo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NS:
-                self.oddaj_salwe((kolumna, rzad), (kolumna, rzad - 1), (kolumna, rzad + 1))
-            # 3 pola L
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NE:
-                self.oddaj_salwe((kolumna, rzad), (kolumna, rzad - 1), (kolumna + 1, rzad))
-            # 3 pola Г
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SE:
-                self.oddaj_salwe((kolumna, rzad), (kolumna, rzad + 1), (kolumna + 1, rzad))
-            # 3 pola Ꞁ
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SW:
-                self.oddaj_salwe((kolumna, rzad), (kolumna - 1, rzad), (kolumna, rzad + 1))
-            # 3 pola ⅃
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NW:
-                self.oddaj_salwe((kolumna, rzad), (kolumna - 1, rzad), (kolumna, rzad - 1))
-
-            oddana_salwa = self.pg.gra.tura.runda.salwy_oddane[-1]
+        if self.pg.gra.tura.runda.mozna_atakowac and not self.rozgrywka.czy_koniec():
+            salwa, zatopione = self.oddaj_salwe(kolumna, rzad, self.ka.combo_orientacji.orientacja)
             napastnik = self.pg.gra.tura.runda.napastnik
             # komunikaty
-            self.komunikator.o_salwie(oddana_salwa, napastnik)
-            if len(self.gra.plansza.zatopione) > ilosc_zatopionych:  # jeśli było zatopienie
-                ofiara = self.gra.plansza.zatopione[-1]
+            self.komunikator.o_salwie(salwa, napastnik)
+            for ofiara in zatopione:
                 self.komunikator.o_zatopieniu(ofiara, napastnik)
+            if zatopione:
+                self.kf.drzewo_g.aktualizuj_statek(napastnik)  # ofiary i premiowe salwy
 
         print("Kliknięcie w polu: ({}{})".format(Plansza.ALFABET[kolumna], rzad))  # test
 
-    def oddaj_salwe(self, *wspolrzedne):
-        """Oddaj salwę w pola o podanych współrzędnych."""
+    def oddaj_salwe(self, kolumna, rzad, orientacja):
+        """
+        Oddaj salwę o wskazanej orientacji w pole o podanych współrzędnych (salwę rozstrzyga silnik rozgrywki) i oznacz jej skutki na planszy. Zwróć salwę i listę zatopionych nią statków.
+        """
         if len(self.gra.tura.runda.salwy_oddane) == 0:
             self.blokuj_zmiane_statku()
 
-        pola_salwy = []
-        for kolumna, rzad in wspolrzedne:
-            if self.gra.plansza.czy_w_planszy(kolumna, rzad):
-                self.odkryj_pole(kolumna, rzad)
-            pola_salwy.append(self.gra.plansza.podaj_pole(kolumna, rzad))
-
-        napastnik = self.pg.gra.tura.runda.napastnik
-        self.pg.gra.tura.runda.dodaj_salwe_oddana(Salwa(napastnik.polozenie, pola_salwy))
-        self.ka.ustaw_combo_salwy()
+        salwa, zatopione = self.rozgrywka.oddaj_salwe(kolumna, rzad, orientacja)
+        self.oznacz_salwe(salwa, zatopione)
+        if self.rozgrywka.czy_koniec():  # po zatopieniu ostatniego statku przeciwnika pozostałe salwy przepadają
+            self.kg.zakoncz_gre()
+        else:
+            self.ka.ustaw_combo_salwy()
+        return salwa, zatopione
 
     def blokuj_zmiane_statku(self):
         """Blokuj w widżetach możliwość zmiany statku po oddaniu pierwszej salwy."""
@@ -488,28 +738,28 @@ class PlanszaPrzeciwnika(PlanszaGUI):
         self.kf.przycisk_do_tylu.state(["disabled"])
         self.kf.przycisk_do_przodu.state(["disabled"])
 
-    def odkryj_pole(self, kolumna, rzad):
+    def oznacz_salwe(self, salwa, zatopione):
         """
-        Odkryj na planszy pole wg podanych współrzędnych. Zaznacz pudło lub trafienie. Jeśli trzeba, zatop trafiony statek (i odkryj pola jego obwiedni).
+        Oznacz na planszy pola odkryte salwą: pudła i trafienia. Oznacz zatopione nią statki (i odkryj pola ich obwiedni).
         """
-        pole_gui = self.podaj_pole_gui(kolumna, rzad)
-        if pole_gui.pole.znacznik in (Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.obwiednia):
-            self.oznacz_pudlo(pole_gui)
-        elif pole_gui.pole.znacznik == Pole.ZNACZNIKI.statek:
-            self.oznacz_trafione(pole_gui, PoleGUI.GLIFY.trafiony)
+        for pole in salwa.pola:
+            pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
+            if pole.znacznik == Pole.ZNACZNIKI.pudlo:
+                self.oznacz_pudlo(pole_gui)
+            else:
+                self.oznacz_trafione(pole_gui, PoleGUI.GLIFY.trafiony)
+        if any(salwa.trafienia):
             self.kg.aktualizuj_stan_gry("przeciwnika")
-            statek = self.gra.plansza.podaj_statek(pole_gui.pole)
-            if statek.czy_zatopiony():
-                self.zatop_statek(statek, z_symbolami=True)
-                self.odkryj_obwiednie(statek)
+        for statek in zatopione:
+            self.zatop_statek(statek, z_symbolami=True)
+            self.odkryj_obwiednie(statek)
 
     def odkryj_obwiednie(self, statek):
         """Odkryj na planszy obwiednie zatopionego statku."""
         for pole in statek.obwiednia:
             pole_gui = self.podaj_pole_gui(*pole.podaj_wspolrzedne())
-            # configure("style") zwraca krotkę, której ostatnim elementem jest nazwa stylu
-            if pole_gui.configure("style")[-1] not in (PoleGUI.STYLE.woda, PoleGUI.STYLE.pudlo):
-                pole_gui.configure(style=PoleGUI.STYLE.woda)
+            if self.podaj_styl(pole_gui) not in (PoleGUI.STYLE.woda, PoleGUI.STYLE.pudlo):
+                self.ustaw_wyglad_pola(pole_gui, styl=PoleGUI.STYLE.woda)
         # test
         print(statek.o_zatopieniu())
 
@@ -520,79 +770,9 @@ class PlanszaPrzeciwnika(PlanszaGUI):
         """
         if self.pg.gra.tura.runda.mozna_atakowac:
             kolumna, rzad = event.widget.pole.podaj_wspolrzedne()
-            # 1 pole
-            if self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.C:
-                self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad))
-            # 2 pola (w prawo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.E:
-                self.zmien_celownik("active", (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad), (kolumna + 1, rzad))
-            # 2 pola (w dół)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.S:
-                self.zmien_celownik("active", (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad), (kolumna, rzad + 1))
-            # 2 pola (w lewo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.W:
-                self.zmien_celownik("active", (kolumna - 1, rzad))
-                self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad), (kolumna - 1, rzad))
-            # 2 pola (w górę)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.N:
-                self.zmien_celownik("active", (kolumna, rzad - 1))
-                self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad), (kolumna, rzad - 1))
-            # 3 pola poziomo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.WE:
-                self.zmien_celownik("active", (kolumna - 1, rzad), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola pionowo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NS:
-                self.zmien_celownik("active", (kolumna, rzad - 1), (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna, rzad - 1),
-                    (kolumna, rzad + 1)
-                )
-            # 3 pola L
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NE:
-                self.zmien_celownik("active", (kolumna, rzad - 1), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna, rzad - 1),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola Г
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SE:
-                self.zmien_celownik("active", (kolumna, rzad + 1), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna, rzad + 1),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola Ꞁ
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SW:
-                self.zmien_celownik("active", (kolumna - 1, rzad), (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna, rzad + 1)
-                )
-            # 3 pola ⅃
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NW:
-                self.zmien_celownik("active", (kolumna - 1, rzad), (kolumna, rzad - 1))
-                self.aktualizuj_pozycje_pol(
-                    "wejście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna, rzad - 1)
-                )
+            celownik = self.podaj_celownik(kolumna, rzad)
+            self.zmien_celownik("active", *celownik)
+            self.aktualizuj_pozycje_pol("wejście", (kolumna, rzad), *celownik)
 
     # CALLBACK wszystkich pól
     def na_wyjscie(self, event):
@@ -601,79 +781,17 @@ class PlanszaPrzeciwnika(PlanszaGUI):
         """
         if self.pg.gra.tura.runda.mozna_atakowac:
             kolumna, rzad = event.widget.pole.podaj_wspolrzedne()
-            # 1 pole
-            if self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.C:
-                self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad))
-            # 2 pola (w prawo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.E:
-                self.zmien_celownik("!active", (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad), (kolumna + 1, rzad))
-            # 2 pola (w dół)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.S:
-                self.zmien_celownik("!active", (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad), (kolumna, rzad + 1))
-            # 2 pola (w lewo)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.W:
-                self.zmien_celownik("!active", (kolumna - 1, rzad))
-                self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad), (kolumna - 1, rzad))
-            # 2 pola (w górę)
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.N:
-                self.zmien_celownik("!active", (kolumna, rzad - 1))
-                self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad), (kolumna, rzad - 1))
-            # 3 pola poziomo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.WE:
-                self.zmien_celownik("!active", (kolumna - 1, rzad), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola pionowo
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NS:
-                self.zmien_celownik("!active", (kolumna, rzad - 1), (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna, rzad - 1),
-                    (kolumna, rzad + 1)
-                )
-            # 3 pola L
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NE:
-                self.zmien_celownik("!active", (kolumna, rzad - 1), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna, rzad - 1),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola Г
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SE:
-                self.zmien_celownik("!active", (kolumna, rzad + 1), (kolumna + 1, rzad))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna, rzad + 1),
-                    (kolumna + 1, rzad)
-                )
-            # 3 pola Ꞁ
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.SW:
-                self.zmien_celownik("!active", (kolumna - 1, rzad), (kolumna, rzad + 1))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna, rzad + 1)
-                )
-            # 3 pola ⅃
-            elif self.ka.combo_orientacji.get() == Salwa.ORIENTACJE.NW:
-                self.zmien_celownik("!active", (kolumna - 1, rzad), (kolumna, rzad - 1))
-                self.aktualizuj_pozycje_pol(
-                    "wyjście",
-                    (kolumna, rzad),
-                    (kolumna - 1, rzad),
-                    (kolumna, rzad - 1)
-                )
+            celownik = self.podaj_celownik(kolumna, rzad)
+            self.zmien_celownik("!active", *celownik)
+            self.aktualizuj_pozycje_pol("wyjście", (kolumna, rzad), *celownik)
+
+    def podaj_celownik(self, kolumna, rzad):
+        """
+        Podaj współrzędne pól celownika (poza polem, w które wycelowano salwę) dla orientacji wybranej w sekcji kontroli ataku. Orientacja brana jest z pamięci comboboksa, a nie z samego widżetu.
+        """
+        przesuniecia = self.CELOWNIK.get(self.ka.combo_orientacji.orientacja, ())
+        return [(kolumna + przesuniecie_kolumny, rzad + przesuniecie_rzedu)
+                for przesuniecie_kolumny, przesuniecie_rzedu in przesuniecia]
 
     def zmien_celownik(self, stan, *wspolrzedne):
         """
@@ -12,8 +12,56 @@ from statki.plansza import Statek
 # TODO: tooltipy
 
 
+class BuforKomunikatu:
+    """
+    Komunikat składany po stronie Pythona z fragmentów (tekst, tagi) i zapisywany w polu tekstowym jednym wstawieniem wielu segmentów - z jednym przełączeniem stanu pola tekstowego zamiast przełączania przy każdym fragmencie. Sąsiednie fragmenty o tych samych tagach są łączone.
+    """
+
+    def __init__(self):
+        self.fragmenty = []  # [[tekst, tagi], ...]
+
+    def dopisz(self, tekst, tagi=()):
+        """Dopisz fragment na końcu komunikatu."""
+        if not tekst:
+            return
+        if self.fragmenty and self.fragmenty[-1][1] == tagi:
+            self.fragmenty[-1][0] += tekst
+        else:
+            self.fragmenty.append([tekst, tagi])
+
+    def usun_koniec(self, ilosc):
+        """Usuń podaną ilość znaków z końca komunikatu."""
+        while ilosc > 0 and self.fragmenty:
+            tekst = self.fragmenty[-1][0]
+            if len(tekst) <= ilosc:
+                self.fragmenty.pop()
+                ilosc -= len(tekst)
+            else:
+                self.fragmenty[-1][0] = tekst[:-ilosc]
+                ilosc = 0
+
+    def podaj_tekst(self):
+        """Podaj tekst komunikatu (bez tagów)."""
+        return "".join(tekst for tekst, tagi in self.fragmenty)
+
+    def podaj_segmenty(self):
+        """Podaj fragmenty komunikatu jako naprzemienną listę tekstów i tagów (w formie przyjmowanej przez `insert()`)."""
+        return [element for fragment in self.fragmenty for element in fragment]
+
+    def zatwierdz(self, pole_tekstowe, indeks="end"):
+        """
+        Zapisz komunikat w polu tekstowym jednym wstawieniem, przewiń pole na koniec i wyczyść bufor. Pusty komunikat jest pomijany.
+        """
+        if self.fragmenty:
+            pole_tekstowe.ro_insert(indeks, *self.podaj_segmenty())
+            pole_tekstowe.see("end")
+        self.fragmenty = []
+
+
 class Komunikator:
-    """Obsługa pola tekstowego paska komunikatów."""
+    """
+    Obsługa pola tekstowego paska komunikatów. Komunikaty składane są w buforze i zapisywane w polu tekstowym w całości.
+    """
 
     LICZBA_MNOGA = {
         "kolumna": ["kolumna", "kolumny", "kolumn"],
@@ -39,6 +87,17 @@ class Komunikator:
 
     def __init__(self, pole_tekstowe):
         self.tekst = pole_tekstowe
+        self.bufor = BuforKomunikatu()
+
+    def zatwierdz(self, indeks="end"):
+        """Zapisz złożony komunikat w polu tekstowym."""
+        self.bufor.zatwierdz(self.tekst, indeks)
+
+    def czy_poczatek_linii(self):
+        """Czy kolejny fragment komunikatu rozpocznie nową linię w polu tekstowym?"""
+        if self.bufor.fragmenty:
+            return self.bufor.fragmenty[-1][0].endswith("\n")
+        return self.tekst.index("end-1c").split(".")[1] == "0"
 
     def o_rozpoczeciu_gry(self, plansza_gracza):
         """Wyświetl komunikat o rozpoczęciu gry."""
@@ -48,30 +107,28 @@ class Komunikator:
         ilosc_pol_statkow = plansza_gracza.podaj_ilosc_nietrafionych_pol()
         wg_rang = plansza_gracza.podaj_ilosc_niezatopionych_wg_rang()  # słownik
 
-        self.tekst.ro_insert("1.0", "Gra na planszy o rozmiarze: ")
-        self.tekst.ro_insert("end", str(kolumny), "pogrubione")
-        self.tekst.ro_insert(
-            "end",
-            " " + self.LICZBA_MNOGA["kolumna"][self.do_indeksu(kolumny)] + " x "
-        )
-        self.tekst.ro_insert("end", str(rzedy), "pogrubione")
+        self.bufor.dopisz("Gra na planszy o rozmiarze: ")
+        self.bufor.dopisz(str(kolumny), "pogrubione")
+        self.bufor.dopisz(" " + self.LICZBA_MNOGA["kolumna"][self.do_indeksu(kolumny)] + " x ")
+        self.bufor.dopisz(str(rzedy), "pogrubione")
         komunikat = " " + self.LICZBA_MNOGA["rząd"][self.do_indeksu(rzedy)]
         komunikat += " (" + str(rozmiar) + " " + self.LICZBA_MNOGA["pole"][self.do_indeksu(
             rozmiar)] + "). "
         komunikat += "Umieszczono "
-        self.tekst.ro_insert("end", komunikat)
-        self.tekst.ro_insert("end", str(ilosc_statkow), "pogrubione")
+        self.bufor.dopisz(komunikat)
+        self.bufor.dopisz(str(ilosc_statkow), "pogrubione")
         komunikat = " " + self.LICZBA_MNOGA["statek"][self.do_indeksu(ilosc_statkow)]
         komunikat += " zajmujących " + str(ilosc_pol_statkow) + " "
         komunikat += self.LICZBA_MNOGA["pole"][self.do_indeksu(ilosc_pol_statkow)] + ". W tym: "
-        self.tekst.ro_insert("end", komunikat)
+        self.bufor.dopisz(komunikat)
         for ranga in Statek.RANGI:
-            self.tekst.ro_insert("end", str(wg_rang[ranga.nazwa]), "pogrubione")
+            self.bufor.dopisz(str(wg_rang[ranga.nazwa]), "pogrubione")
             komunikat = " " + ranga.liczba_mnoga[self.do_indeksu(wg_rang[ranga.nazwa])]
             komunikat += " (" + ranga.symbol + "), "
-            self.tekst.ro_insert("end", komunikat)
-        self.tekst.ro_delete("end-3c", "end")
-        self.tekst.ro_insert("end", ". Zaczynamy!")
+            self.bufor.dopisz(komunikat)
+        self.bufor.usun_koniec(2)  # ", " po ostatniej randze
+        self.bufor.dopisz(". Zaczynamy!")
+        self.zatwierdz("1.0")
 
     def o_rundzie(self, gra):
         """Wyświetl komunikat o nowej rundzie."""
@@ -82,56 +139,53 @@ class Komunikator:
         komunikat = "  ".join(["  ", self.GWIAZDKA, komunikat, self.GWIAZDKA, "   "])
         komunikat = komunikat.center(dl_separatora, "-")
 
-        self.tekst.ro_insert("end", "\n\n")
-        self.tekst.ro_insert("end", komunikat, ("wyszarzone", "wyśrodkowane"))
-        self.tekst.ro_insert("end", "\n")
-        self.tekst.see("end")
+        self.bufor.dopisz("\n\n")
+        self.bufor.dopisz(komunikat, ("wyszarzone", "wyśrodkowane"))
+        self.bufor.dopisz("\n")
+        self.zatwierdz()
 
     def o_salwie(self, salwa, statek):
         """Wyświetl komunikat o oddanej salwie."""
-        self.tekst.ro_insert("end", "\n")
+        self.bufor.dopisz("\n")
         self.o_statku(statek)
         komunikat = "oddała" if statek.RANGA_BAZOWA in Statek.RANGI[2:4] else "oddał"
-        self.tekst.ro_insert("end", " " + komunikat + " salwę w ")
+        self.bufor.dopisz(" " + komunikat + " salwę w ")
         komunikat = "pole: " if len(salwa.pola) == 1 else "pola: "
-        self.tekst.ro_insert("end", komunikat)
+        self.bufor.dopisz(komunikat)
         for i in range(len(salwa.pola)):
             if salwa.trafienia[i]:
-                self.tekst.ro_insert(
-                    "end",
-                    salwa.pola[i].str_w_nawiasach(),
-                    ("pogrubione", "trafione")
-                )
+                self.bufor.dopisz(salwa.pola[i].str_w_nawiasach(), ("pogrubione", "trafione"))
             else:
-                self.tekst.ro_insert("end", salwa.pola[i].str_w_nawiasach(), "pogrubione")
+                self.bufor.dopisz(salwa.pola[i].str_w_nawiasach(), "pogrubione")
             if i == 0:
                 if len(salwa.pola) == 2:
-                    self.tekst.ro_insert("end", " i ")
+                    self.bufor.dopisz(" i ")
                 elif len(salwa.pola) == 3:
-                    self.tekst.ro_insert("end", ", ")
+                    self.bufor.dopisz(", ")
             if i == 1 and len(salwa.pola) == 3:
-                self.tekst.ro_insert("end", " i ")
-        self.tekst.see("end")
+                self.bufor.dopisz(" i ")
+        self.zatwierdz()
 
     def o_statku(self, statek, przypadek="mianownik"):
-        """Wyświetl komunikat o statku. W razie potrzeby dokonuje odmiany przez przypadki."""
+        """
+        Dopisz do składanego komunikatu fragment o statku. W razie potrzeby dokonuje odmiany przez przypadki.
+        """
         statek_info = str(statek).split('"')
-        indeks_znaku = self.tekst.index("end-1c").split(".")[1]
-        if indeks_znaku == "0":
-            self.tekst.ro_insert("end", statek_info[0].title() + '"')
+        if self.czy_poczatek_linii():
+            self.bufor.dopisz(statek_info[0].title() + '"')
         else:
             if przypadek == "biernik":
-                self.tekst.ro_insert("end", statek.RANGA_BAZOWA.biernik + ' "')
+                self.bufor.dopisz(statek.RANGA_BAZOWA.biernik + ' "')
             else:
-                self.tekst.ro_insert("end", statek_info[0] + '"')
-        self.tekst.ro_insert("end", statek_info[1], "pogrubione")
-        self.tekst.ro_insert("end", '"' + statek_info[2])
+                self.bufor.dopisz(statek_info[0] + '"')
+        self.bufor.dopisz(statek_info[1], "pogrubione")
+        self.bufor.dopisz('"' + statek_info[2])
 
     def o_zatopieniu(self, ofiara, napastnik):
         """Wyświetl komunikat o zatopieniu ofiary przez napastnika."""
-        self.tekst.ro_insert("end", "\n")
-        self.tekst.ro_insert("end", "Statek przeciwnika, ")
+        self.bufor.dopisz("\n")
+        self.bufor.dopisz("Statek przeciwnika, ")
         self.o_statku(ofiara)
-        self.tekst.ro_insert("end", ", został zatopiony przez ")
+        self.bufor.dopisz(", został zatopiony przez ")
         self.o_statku(napastnik, "biernik")
-        self.tekst.see("end")
+        self.zatwierdz()
@@ -7,10 +7,15 @@
 
 """
 
-from copy import deepcopy
-from random import choice
+import pickle
+from collections import namedtuple
+from collections.abc import Sequence
+from heapq import nlargest
+from operator import add
+from random import Random
+from time import perf_counter
 
-from statki.plansza import Plansza, Pole, Salwa
+from statki.plansza import Plansza, Pole, Salwa, Rozpoznanie
 
 # TODO: oczyścić docstringi z bieżących komentarzy i rozważań
 
@@ -26,11 +31,13 @@ class Gra:
     Reprezentacja przebiegu gry na danej planszy. Zapisuje kolejne tury.
     """
 
-    def __init__(self, plansza):
+    def __init__(self, plansza, ziarno=None):
         self.plansza = plansza
+        self.los = Random(ziarno)  # generator liczb losowych tej gry - dla danego ziarna decyzje gracza komputerowego są zawsze te same
         self.tura = Tura(self.plansza)
         self.tury = [self.tura]
         self.ofiary = []  # zatopione statki przeciwnika
+        self.rozgrywka = None  # silnik rozgrywki, w której bierze udział ta gra (ustawiany przez silnik)
 
     def dodaj_ture(self):
         """Stwórz nową turę i dodaj do listy tur."""
@@ -48,10 +55,38 @@ class Gra:
 
     def zrob_ruch(self):
         """
-        Wykonuje ruch dla przeciwnika. Implementacja w klasach potomnych.
+        Wykonuje ruch dla przeciwnika. Implementacja w klasach potomnych - tutaj (gracz bez własnej logiki ruchu) runda kończona jest bez oddawania salw.
+        """
+        self.zakoncz_runde()
+
+    def zapisz_ofiary(self, ofiary):
+        """
+        Zapisz statki przeciwnika zatopione salwą napastnika bieżącej rundy jako jego ofiary (każda daje mu premiową salwę, dostępną od razu) i jako ofiary gry.
+        """
+        for ofiara in ofiary:
+            self.tura.runda.napastnik.dodaj_ofiare(ofiara)
+            self.ofiary.append(ofiara)
+
+    def zapamietaj_salwe(self, salwa, zatopione):
+        """
+        Zapamiętaj wynik salwy rozstrzygniętej przez silnik rozgrywki. Implementacja w klasach potomnych - gracz bez własnej logiki ruchu widzi wynik salwy w interfejsie.
         """
         pass
 
+    def przygotuj_runde(self):
+        """
+        Przygotuj bieżącą rundę po ruchu przeciwnika: usuń z napastników tury statki zatopione przez przeciwnika. Jeśli nie został żaden napastnik - zacznij nową turę, jeśli zatopiony został napastnik bieżącej rundy - ustaw kolejnego.
+        """
+        self.tura.filtruj_zatopione()
+        if len(self.tura.napastnicy) == 0:
+            self.dodaj_ture()
+        elif self.tura.runda.napastnik not in self.tura.napastnicy:
+            self.tura.runda.ustaw_napastnika(self.tura.napastnicy[0])
+
+    def zakoncz_runde(self):
+        """Zakończ bieżącą rundę - dodaj kolejną rundę albo, jeśli zagrał ostatni napastnik tury, kolejną turę."""
+        self.dodaj_ture() if len(self.tura.napastnicy) == 1 else self.tura.dodaj_runde()
+
 
 class Tura:
     """
@@ -60,7 +95,7 @@ class Tura:
 
     def __init__(self, plansza):
         self.plansza = plansza
-        self.migawki_planszy = [deepcopy(self.plansza)]  # +1 na koniec każdej rundy
+        self.migawki_planszy = MigawkiPlanszy(self.plansza)  # +1 na koniec każdej rundy
         self.napastnicy = self.plansza.niezatopione[:]  # śledzona jest tylko ilość elementów nie ich zawartość, więc wystarczy płytka kopia
         self.runda = Runda(self.napastnicy[0])
         self.rundy = [self.runda]
@@ -68,7 +103,7 @@ class Tura:
     def dodaj_runde(self):
         """Stwórz nową rundę i dodaj do listy rund"""
         self.napastnicy.remove(self.runda.napastnik)
-        self.migawki_planszy.append(deepcopy(self.plansza))
+        self.migawki_planszy.dodaj()
         self.runda = Runda(self.napastnicy[0])
         self.rundy.append(self.runda)
 
@@ -79,6 +114,46 @@ class Tura:
         self.napastnicy = aktualni_napastnicy
 
 
+class MigawkiPlanszy(Sequence):
+    """
+    Migawki stanu planszy z początku kolejnych rund tury, dostępne jak lista (indeksowanie, wycinki, iteracja, `len()`). Zamiast pełnych kopii planszy dla każdej migawki zapamiętywana jest tylko długość dziennika zmian planszy i ilości ofiar jej statków, a co `CO_ILE` migawek - zserializowany punkt kontrolny (bez dziennika i ofiar). Migawka odtwarzana jest na żądanie z najbliższego wcześniejszego punktu kontrolnego, ofiar statków planszy i zmian zapisanych od tego czasu w dzienniku.
+    """
+
+    CO_ILE = 8  # odstęp (w migawkach) pomiędzy punktami kontrolnymi
+
+    def __init__(self, plansza):
+        self.plansza = plansza
+        self.dlugosci_dziennika = []  # długość dziennika planszy w chwili każdej migawki
+        self.ilosci_ofiar = []  # ilości ofiar kolejnych statków planszy w chwili każdej migawki
+        self.punkty_kontrolne = {}  # {numer migawki: zserializowana plansza}
+        self.dodaj()
+
+    def dodaj(self):
+        """Zrób migawkę aktualnego stanu planszy."""
+        numer = len(self.dlugosci_dziennika)
+        self.dlugosci_dziennika.append(len(self.plansza.dziennik))
+        self.ilosci_ofiar.append([len(statek.ofiary) for statek in self.plansza.statki])
+        if numer % self.CO_ILE == 0:
+            self.punkty_kontrolne[numer] = pickle.dumps(self.plansza, pickle.HIGHEST_PROTOCOL)
+
+    def __len__(self):
+        return len(self.dlugosci_dziennika)
+
+    def __getitem__(self, numer):
+        """Odtwórz migawkę planszy o wskazanym numerze (lub listę migawek dla wycinka)."""
+        if isinstance(numer, slice):
+            return [self[i] for i in range(*numer.indices(len(self)))]
+        numer = range(len(self))[numer]  # obsługa indeksów ujemnych i spoza zakresu (IndexError)
+        punkt_kontrolny = numer - numer % self.CO_ILE
+        migawka = pickle.loads(self.punkty_kontrolne[punkt_kontrolny])
+        for statek, oryginal, ilosc in zip(migawka.statki, self.plansza.statki, self.ilosci_ofiar[numer]):
+            statek.ustaw_ofiary(oryginal.ofiary[:ilosc])
+        migawka.odtworz_zmiany(
+            self.plansza.dziennik[self.dlugosci_dziennika[punkt_kontrolny]:self.dlugosci_dziennika[numer]]
+        )
+        return migawka
+
+
 class Runda:
     """
     Reprezentacja przebiegu rundy. Śledzi aktualnego napastnika i zapisuje salwy, które oddał oraz salwy otrzymane od przeciwnika. Startuje z pierwszym statkiem z listy napastników tury.
@@ -86,22 +161,142 @@ class Runda:
 
     def __init__(self, statek):
         self.napastnik = statek
-        self.sila_ognia = self.napastnik.sila_ognia[:]
         self.salwy_oddane = []
+        self.zuzyte_salwy = {}  # {wielkość salwy: ilość salw tej wielkości oddanych w rundzie}
         self.salwy_otrzymane = []  # lista salw przeciwnika otrzymywana i zapisywana na początku rundy
         # flagi
         self.mozna_zmienic_napastnika = True
         self.mozna_atakowac = True
 
+    @property
+    def sila_ognia(self):
+        """
+        Siła ognia pozostała napastnikowi w tej rundzie - jego bieżąca siła ognia (zależna od rangi rzeczywistej, a więc od otrzymanych trafień) bez salw już oddanych (pomijane są pierwsze salwy każdej wielkości wg licznika salw zużytych w rundzie).
+        """
+        if not self.zuzyte_salwy:
+            return self.napastnik.sila_ognia[:]
+        pominiete = {}
+        sila_ognia = []
+        for wielkosc in self.napastnik.sila_ognia:
+            if pominiete.get(wielkosc, 0) < self.zuzyte_salwy.get(wielkosc, 0):
+                pominiete[wielkosc] = pominiete.get(wielkosc, 0) + 1
+            else:
+                sila_ognia.append(wielkosc)
+        return sila_ognia
+
+    def podaj_ilosc_salw(self, wielkosc):
+        """Podaj ilość salw wskazanej wielkości pozostałych napastnikowi w tej rundzie."""
+        return self.napastnik.sila_ognia.count(wielkosc) - self.zuzyte_salwy.get(wielkosc, 0)
+
     def ustaw_napastnika(self, statek):
-        """Ustaw podany statek jako aktualnego napastnika i jego siłę ognia jako aktualną dla rundy."""
+        """Ustaw podany statek jako aktualnego napastnika (jego siła ognia staje się siłą ognia rundy)."""
         self.napastnik = statek
-        self.sila_ognia = self.napastnik.sila_ognia[:]
 
     def dodaj_salwe_oddana(self, salwa):
-        """Dodaj salwę, aktualizuj siłę ognia."""
+        """Dodaj salwę (pomniejsza pozostałą siłę ognia)."""
+        if self.podaj_ilosc_salw(len(salwa)) < 1:
+            tekst_bledu = "Błąd rozmiaru salwy. Pozostała siła ognia napastnika: {}. Otrzymany rozmiar: {}."
+            raise ValueError(tekst_bledu.format(self.sila_ognia, len(salwa)))
         self.salwy_oddane.append(salwa)
-        self.sila_ognia.remove(len(salwa))
+        self.zuzyte_salwy[len(salwa)] = self.zuzyte_salwy.get(len(salwa), 0) + 1
+
+
+class Rozgrywka:
+    """
+    Przebieg rozgrywki dwóch stron (obiektów klasy 'Gra' lub potomnych) bez interfejsu graficznego. Rozstrzyga salwy i zatopienia, przekazuje ruch między stronami po każdej rundzie (razem z salwami otrzymanymi przez broniącego się) i wykrywa koniec gry. Strona zaczynająca to gracz.
+
+    Strona sterowana z zewnątrz (np. z interfejsu) oddaje salwy przez 'oddaj_salwe()' i kończy rundę przez 'zakoncz_runde()'. Strona z własną logiką ruchu (AI) rozgrywa całą rundę w 'rozegraj_runde()', oddając każdą salwę również przez 'oddaj_salwe()' - wszystkie salwy rozstrzygane są więc w jednym miejscu.
+    """
+
+    def __init__(self, gracz, przeciwnik):
+        self.strony = (gracz, przeciwnik)
+        for strona in self.strony:
+            strona.rozgrywka = self
+        self.ruch = 0  # indeks strony wykonującej ruch
+        self.ilosc_rund = 0  # zakończone rundy obu stron
+        self.zwyciezca = None
+
+    def podaj_atakujacego(self):
+        """Podaj stronę wykonującą ruch."""
+        return self.strony[self.ruch]
+
+    def podaj_broniacego(self):
+        """Podaj stronę atakowaną w bieżącej rundzie."""
+        return self.strony[1 - self.ruch]
+
+    def czy_koniec(self):
+        """Sprawdź czy gra się skończyła (któraś ze stron straciła wszystkie statki)."""
+        return self.zwyciezca is not None
+
+    def sprawdz_koniec(self):
+        """Ustaw zwycięzcę, jeśli broniący się stracił wszystkie statki."""
+        if len(self.podaj_broniacego().plansza.niezatopione) == 0:
+            self.zwyciezca = self.podaj_atakujacego()
+
+    def oddaj_salwe(self, kolumna, rzad, orientacja):
+        """
+        Oddaj salwę napastnika bieżącej rundy atakującego w pola planszy broniącego się wg wskazanego celu i orientacji salwy. Odkryj pola, zatop statki, których wszystkie pola zostały trafione i zapisz salwę w rundzie. Przekaż atakującemu wynik salwy (razem z obwiedniami zatopionych statków, które odtąd są mu znane). Jeśli salwa kończy grę, zablokuj dalszy atak w rundzie. Zwróć salwę i listę statków zatopionych tą salwą.
+        """
+        atakujacy, broniacy = self.podaj_atakujacego(), self.podaj_broniacego()
+        plansza, runda = broniacy.plansza, atakujacy.tura.runda
+        wielkosc_salwy = len(AI.KIERUNKI_SALWY.get(orientacja, ())) + 1
+        if self.czy_koniec() or orientacja not in AI.KIERUNKI_SALWY or runda.podaj_ilosc_salw(wielkosc_salwy) < 1:
+            tekst_bledu = "Nie można oddać salwy o orientacji '{}'. "
+            tekst_bledu += "Pozostała siła ognia napastnika: {}. Gra zakończona: {}."
+            raise ValueError(tekst_bledu.format(orientacja, runda.sila_ognia, self.czy_koniec()))
+
+        ilosc_zatopionych = len(plansza.zatopione)
+        indeksy = PokryciaSalw.podaj_pokrycia(plansza.kolumny, plansza.rzedy).podaj_indeksy(
+            plansza.podaj_indeks(kolumna, rzad), orientacja)
+        pola = [None if indeks is None else plansza.magazyn.podaj_pole(indeks) for indeks in indeksy]
+        plansza.odkryj_pola([pole for pole in pola if pole is not None])
+        plansza.oznacz_zatopione()
+        salwa = Salwa(runda.napastnik.polozenie, pola)
+        runda.dodaj_salwe_oddana(salwa)
+        runda.mozna_zmienic_napastnika = False
+        zatopione = plansza.zatopione[ilosc_zatopionych:]
+        atakujacy.zapisz_ofiary(zatopione)
+        atakujacy.zapamietaj_salwe(salwa, zatopione)
+        self.sprawdz_koniec()
+        if self.czy_koniec():
+            runda.mozna_atakowac = False
+        return salwa, zatopione
+
+    def zakoncz_runde(self):
+        """Zakończ rundę strony sterowanej z zewnątrz i przekaż ruch przeciwnikowi. Zwróć salwy oddane w tej rundzie."""
+        atakujacy = self.podaj_atakujacego()
+        runda = atakujacy.tura.runda
+        atakujacy.zakoncz_runde()
+        return self.przekaz_ruch(runda)
+
+    def rozegraj_runde(self):
+        """
+        Rozegraj całą rundę strony wykonującej ruch jej własną logiką ruchu i przekaż ruch przeciwnikowi. Zwróć salwy oddane w tej rundzie.
+        """
+        atakujacy = self.podaj_atakujacego()
+        runda = atakujacy.tura.runda
+        atakujacy.zrob_ruch()
+        self.sprawdz_koniec()
+        return self.przekaz_ruch(runda)
+
+    def przekaz_ruch(self, runda):
+        """
+        Przekaż przeciwnikowi salwy oddane w zakończonej rundzie i ruch (o ile gra trwa). Zwróć te salwy - przygotowanie rundy przeciwnika może zacząć jego nową turę, więc jego bieżąca runda nie musi już ich zawierać.
+        """
+        self.ilosc_rund += 1
+        self.podaj_broniacego().tura.runda.salwy_otrzymane = runda.salwy_oddane
+        if not self.czy_koniec():
+            self.ruch = 1 - self.ruch
+            self.podaj_atakujacego().przygotuj_runde()
+        return runda.salwy_oddane
+
+    def rozegraj(self, limit_rund=None):
+        """
+        Rozgrywaj kolejne rundy obu stron ich własną logiką ruchu aż do końca gry (albo osiągnięcia limitu rund). Zwróć zwycięzcę ('None' jeśli gra nie została rozstrzygnięta).
+        """
+        while not self.czy_koniec() and (limit_rund is None or self.ilosc_rund < limit_rund):
+            self.rozegraj_runde()
+        return self.zwyciezca
 
 
 class AI(Gra):
@@ -133,16 +328,17 @@ class AI(Gra):
     }
     ODWIEDZONE = (Pole.ZNACZNIKI.pudlo, Pole.ZNACZNIKI.trafiony, Pole.ZNACZNIKI.zatopiony)
 
-    def __init__(self, plansza_wlasna, plansza_gracza):
-        super().__init__(plansza_wlasna)
-        self.druga_plansza = deepcopy(plansza_gracza)
+    def __init__(self, plansza_wlasna, plansza_gracza, ziarno=None):
+        super().__init__(plansza_wlasna, ziarno)
+        self.druga_plansza = Rozpoznanie(plansza_gracza)  # tylko to, co wiadomo o planszy gracza
+        self.pokrycia_salw = PokryciaSalw.podaj_pokrycia(plansza_gracza.kolumny, plansza_gracza.rzedy)
+        self.przyleganie = {}  # {skupisko trafień: {indeks pola: punkty przylegania do trafień skupiska}}
 
     def mysl(self):
         """
         Wybierz strategię ataku: polowanie (atak bez wcześniejszego trafienia) albo celowanie (atak po wcześniejszym trafieniu).
         """
-        znaczniki = [pole.znacznik for rzad in self.druga_plansza.pola for pole in rzad]
-        if Pole.ZNACZNIKI.trafiony in znaczniki:
+        if self.druga_plansza.czy_sa_trafione_pola():
             self.celuj()
         else:
             self.poluj()
@@ -152,17 +348,21 @@ class AI(Gra):
         Atakuj, gdy nie wiesz, gdzie jest ofiara. Losuj 'na ślepo' potencjalny cel z wszystkich nieodwiedzonych jeszcze pól i wybierz do niego najlepszą konfigurację.
         """
         # TODO: mocniejsze AI mogłoby najpierw sprawdzić, które spośród wszystkich nieodwiedzonych jeszcze pól dają najlepszą konfigurację i wylosować cel tylko spośród nich
-        wielkosc_salwy = self.tura.runda.napastnik.sila_ognia[0]
-        pola = [pole for rzad in self.druga_plansza.pola for pole in rzad]
-        nieodwiedzone = [pole for pole in pola if pole.znacznik not in self.ODWIEDZONE]
-        cel = choice(nieodwiedzone)
-        konfiguracja_pol = self.wybierz_konfiguracje_pol(cel)
-        self.druga_plansza.odkryj_pola([pole for pole in konfiguracja_pol if pole is not None])
-        self.druga_plansza.oznacz_zatopione()
-        self.tura.runda.dodaj_salwe_oddana(Salwa(
-            self.tura.runda.napastnik.polozenie,
-            konfiguracja_pol
-        ))
+        cel = self.druga_plansza.losuj_nieodwiedzone_pole(self.los)
+        self.oddaj_salwe(self.wybierz_konfiguracje_pol(cel))
+
+    def oddaj_salwe(self, konfiguracja_pol):
+        """
+        Oddaj salwę w pola wskazanej konfiguracji przez silnik rozgrywki, który ją rozstrzyga, zapisuje w bieżącej rundzie (razem z zatopionymi nią statkami) i przekazuje jej wynik do rozpoznania planszy gracza.
+        """
+        plansza = self.druga_plansza
+        indeksy = [None if pole is None else plansza.podaj_indeks(pole.kolumna, pole.rzad) for pole in konfiguracja_pol]
+        cel = konfiguracja_pol[0]
+        self.rozgrywka.oddaj_salwe(cel.kolumna, cel.rzad, self.pokrycia_salw.podaj_orientacje(indeksy))
+
+    def zapamietaj_salwe(self, salwa, zatopione):
+        """Zapamiętaj w rozpoznaniu planszy gracza pola odkryte salwą oraz pola i obwiednie zatopionych nią statków."""
+        self.druga_plansza.zapamietaj_salwe(salwa, zatopione)
 
     def celuj(self):
         """
@@ -179,30 +379,66 @@ class AI(Gra):
 
         """
         # Mocniejsze AI weźmie pod uwagę trzecią kategorię wyboru - wagę danego pola (ustalaną na podstawie symulacji możliwych ustawień statków na planszy)
-        pass
+        plansza = self.druga_plansza
+        skupiska = plansza.podaj_skupiska_trafien()
+        self.przyleganie = {skupisko: self.przyleganie.get(skupisko) or self.podaj_przyleganie(skupisko)
+                            for skupisko in skupiska}  # skupiska nietknięte ostatnimi salwami zachowują swoje punkty
+        ofiara = max(skupiska, key=len)
+        przyleganie = self.przyleganie[ofiara]
+        cele = sorted({sasiad for indeks in ofiara for sasiad in plansza.sasiedztwo.ortogonalne[indeks]
+                       if plansza.pozycje[sasiad] is not None})
+
+        def ocen(indeksy):
+            nieodwiedzone = [indeks for indeks in indeksy if indeks is not None and plansza.pozycje[indeks] is not None]
+            return len(nieodwiedzone), sum(przyleganie.get(indeks, 0) for indeks in nieodwiedzone)
+
+        wielkosc_salwy = self.tura.runda.sila_ognia[0]
+        najlepsze = max(
+            (self.pokrycia_salw.podaj_indeksy(cel, orientacja)
+             for cel in cele
+             for orientacja in PokryciaSalw.ORIENTACJE_WG_WIELKOSCI[wielkosc_salwy]),
+            key=ocen
+        )
+        self.oddaj_salwe(self.podaj_konfiguracje_salwy(najlepsze))
+
+    def podaj_przyleganie(self, skupisko):
+        """
+        Podaj punkty przylegania pól do trafień wskazanego skupiska: po 2 punkty za każde trafione pole stykające się z danym polem bezpośrednio i po 1 punkcie za każde stykające się na ukos.
+        """
+        przyleganie = {}
+        for indeks in skupisko:
+            for numer, sasiad in enumerate(self.druga_plansza.sasiedztwo.kierunkowe[indeks]):
+                if sasiad is not None:
+                    przyleganie[sasiad] = przyleganie.get(sasiad, 0) + (2 if numer < 4 else 1)  # najpierw kierunki ortogonalne
+        return przyleganie
 
     def wybierz_konfiguracje_pol(self, cel):
         """
         Wybierz najlepszą konfiguracje pól salwy dla wskazanego celu. Przy ocenie weź pod uwagę tylko ilość rażonych (nieodwiedzonych) pól.
         """
-        konfiguracje_pol = []
-        wielkosc_salwy = self.tura.runda.napastnik.sila_ognia[0]
-        if wielkosc_salwy == 1:
-            konfiguracje_pol.append([cel])
-        elif wielkosc_salwy == 2:
-            for orientacja in Salwa.ORIENTACJE[1:5]:
-                konfiguracje_pol.append(self.podaj_konfiguracje_pol(
-                    cel,
-                    self.KIERUNKI_SALWY[orientacja]
-                ))
-        elif wielkosc_salwy == 3:
-            for orientacja in Salwa.ORIENTACJE[5:]:
-                konfiguracje_pol.append(self.podaj_konfiguracje_pol(
-                    cel,
-                    self.KIERUNKI_SALWY[orientacja]
-                ))
-        srt = [True for pole in kp if pole is not None and pole.znacznik not in self.ODWIEDZONE]
-        return sorted(konfiguracje_pol, key=lambda kp: len(srt), reverse=True)[0]
+        pozycje = self.druga_plansza.pozycje
+        return self.wybierz_salwe_dla_celu(cel, lambda indeks: pozycje[indeks] is not None)
+
+    def wybierz_salwe_dla_celu(self, cel, waga):
+        """
+        Wybierz konfigurację pól kolejnej salwy bieżącej rundy wycelowanej we wskazane pole - o największej sumie wag rażonych pól (wg podanej funkcji wagi indeksu pola). Oceniane są tylko orientacje salwy w ten cel, więc koszt nie zależy od wielkości planszy.
+        """
+        indeks = self.druga_plansza.podaj_indeks(cel.kolumna, cel.rzad)
+        salwa = self.pokrycia_salw.wybierz_najlepsza_dla_celu(waga, indeks, self.tura.runda.sila_ognia[0])
+        return self.podaj_konfiguracje_salwy(salwa.indeksy)
+
+    def wybierz_salwy(self, wagi, k=1, cele=None):
+        """
+        Wybierz `k` najlepszych konfiguracji pól kolejnej salwy bieżącej rundy wg sumy wag rażonych pól (wszystkich albo tylko wskazanych jako cele - te wybierane są spośród pól nieodwiedzonych). Zwróć listę konfiguracji pól, od najlepszej.
+        """
+        plansza = self.druga_plansza
+        indeksy_celow = plansza.nieodwiedzone if cele is None else plansza.podaj_indeksy(cele)
+        salwy = self.pokrycia_salw.wybierz_najlepsze(wagi, self.tura.runda.sila_ognia[0], k, indeksy_celow)
+        return [self.podaj_konfiguracje_salwy(salwa.indeksy) for salwa in salwy]
+
+    def podaj_konfiguracje_salwy(self, indeksy):
+        """Podaj konfigurację pól salwy odpowiadającą wskazanym indeksom pól ('None' poza planszą)."""
+        return [None if indeks is None else self.druga_plansza.magazyn.podaj_pole(indeks) for indeks in indeksy]
 
     def podaj_konfiguracje_pol(self, cel, kierunki):
         """
@@ -210,17 +446,19 @@ class AI(Gra):
         """
 
         # termin 'orientacja salwy' zarezerwowany jest dla stałej klasy 'statki.plansza.Salwa'. 'Konfiguracja pól' natomiast to pola planszy odpowiadające danej orientacji, z których jeszcze nie został utworzony obiekt klasy 'statki.plansza.Salwa'
+        plansza = self.druga_plansza
+        sasiedzi = plansza.sasiedztwo.kierunkowe[plansza.podaj_indeks(cel.kolumna, cel.rzad)]
         konfiguracja_pol = [cel]
         for kierunek in kierunki:
-            sasiad = self.druga_plansza.podaj_sasiednie_pole(cel, kierunek)  # None jeśli poza planszą!
-            konfiguracja_pol.append(sasiad)
+            sasiad = sasiedzi[plansza.NUMERY_KIERUNKOW[kierunek]]
+            konfiguracja_pol.append(None if sasiad is None else plansza.magazyn.podaj_pole(sasiad))  # None jeśli poza planszą!
         return konfiguracja_pol
 
     def wybierz_napastnika(self):
         """
-        Wybierz napastnika. Wybierany jest statek posiadający największą siłę ognia w danej rundzie.
+        Wybierz napastnika. Wybierany jest statek posiadający największą siłę ognia w danej rundzie (z premiowymi salwami za ofiary), a spośród równych - oddający najwięcej salw.
         """
-        napastnik = sorted(self.tura.napastnicy, key=lambda s: sum(s.sila_ognia), reverse=True)[0]
+        napastnik = max(self.tura.napastnicy, key=lambda s: (sum(s.sila_ognia), len(s.sila_ognia)))
         self.tura.runda.ustaw_napastnika(napastnik)
 
     def zrob_ruch(self):
@@ -228,9 +466,9 @@ class AI(Gra):
         Wykonaj ruch (wybierz napastnika, wymyśl i oddaj salwę/-y, dodaj kolejną rundę/turę).
         """
         self.wybierz_napastnika()
-        while len(self.tura.runda.sila_ognia) > 0:
+        while len(self.tura.runda.sila_ognia) > 0 and len(self.druga_plansza.plansza.niezatopione) > 0:
             self.mysl()
-        self.dodaj_ture() if len(self.tura.napastnicy) == 1 else self.tura.dodaj_runde()
+        self.zakoncz_runde()
 
 
 class MocneAI(AI):
@@ -239,15 +477,292 @@ class MocneAI(AI):
     """
 
     # inspiracja algorytmu pochodzi z tego artykułu dotyczącego zwyczajnych Statków (w wersji amerykańskiej - statki tylko 2-5 pól, ortogonalnie, możliwość stykania się): http://www.datagenetics.com/blog/december32011/index.html
-    def __init__(self, plansza_wlasna, plansza_gracza):
-        super().__init__(plansza_wlasna)
-        self.druga_plansza = deepcopy(plansza_gracza)
+    def __init__(self, plansza_wlasna, plansza_gracza, ziarno=None):
+        super().__init__(plansza_wlasna, plansza_gracza, ziarno)
+        self.mapa_gestosci = MapaGestosci(self.druga_plansza, self.los)
+
+    ILOSC_KANDYDATOW = 8  # ilość najlepszych salw, spośród których losowana jest jedna z równorzędnych
+
+    def mysl(self):
+        """
+        Atakuj pola, na których statystycznie najczęściej występują statki. Polowanie i celowanie nie wymagają osobnej obsługi - próbki mapy gęstości zawsze pokrywają trafione pola niezatopionych statków. Jeśli w budżecie prób nie udało się wylosować żadnej próbki, wybierz strategię jak zwykłe AI.
+        """
+        self.mapa_gestosci.aktualizuj()
+        if self.mapa_gestosci.probki:
+            self.oddaj_salwe(self.wybierz_najlepsza_salwe())
+        else:
+            super().mysl()
+
+    def podaj_wagi(self):
+        """Podaj aktualne wagi pól - gęstości statków na polach nieodwiedzonych, 0 na pozostałych."""
+        return list(map(int.__mul__, self.mapa_gestosci.gestosci, self.druga_plansza.podaj_mape_nieodwiedzonych()))
+
+    def wybierz_najlepsza_salwe(self):
+        """
+        Wybierz spośród wszystkich par (nieodwiedzony cel, orientacja) konfigurację pól salwy o największej sumarycznej gęstości rażonych pól (spośród równorzędnych - losowo).
+        """
+        wagi = self.podaj_wagi()
+        salwy = self.pokrycia_salw.wybierz_najlepsze(wagi, self.tura.runda.sila_ognia[0], self.ILOSC_KANDYDATOW,
+                                                     self.druga_plansza.nieodwiedzone)
+        najlepsze = [salwa for salwa in salwy if salwa.ocena == salwy[0].ocena]
+        return self.podaj_konfiguracje_salwy(self.los.choice(najlepsze).indeksy)
 
     def wybierz_konfiguracje_pol(self, cel):
         """
-        Wybiera najlepszą orientację salwy dla wskazanego celu. Przy ocenie bierze pod uwagę tylko ilość rażonych pól.
+        Wybierz najlepszą konfigurację pól salwy dla wskazanego celu - o największej sumarycznej gęstości rażonych (nieodwiedzonych) pól (bez próbek w mapie gęstości - jak zwykłe AI).
+        """
+        self.mapa_gestosci.aktualizuj()
+        if not self.mapa_gestosci.probki:
+            return super().wybierz_konfiguracje_pol(cel)
+        gestosci, pozycje = self.mapa_gestosci.gestosci, self.druga_plansza.pozycje
+        return self.wybierz_salwe_dla_celu(cel, lambda indeks: 0 if pozycje[indeks] is None else gestosci[indeks])
+
+
+class MapaGestosci:
+    """
+    Mapa gęstości statków na planszy przeciwnika, szacowana metodą Monte Carlo na podstawie rozpoznania: dla każdego pola - w ilu wylosowanych, zgodnych z rozpoznaniem rozmieszczeniach floty pole to występuje.
+
+    Próbka to cała niezatopiona flota przeciwnika (rangi niezatopionych statków są jawne, rozmiary losowane są z zakresów rang). Statki próbki to polimina rozrastające się w przypadkowych kierunkach tylko po polach nieodwiedzonych i trafionych polach niezatopionych statków (froncie), nie stykające się ze sobą nawet na ukos. Najpierw umieszczane są statki przechodzące przez skupiska trafień frontu (każde skupisko należy do jednego statku), potem pozostałe - z losowych pól nieodwiedzonych poza obwiedniami już umieszczonych.
+
+    Próbki przechowywane są jako maski bitowe pól, więc między salwami mapa aktualizowana jest przyrostowo: odrzucane są tylko próbki sprzeczne z nowo poznanymi polami (lub nie pokrywające całego frontu), a w ich miejsce losowane są nowe - w granicach limitu próbek i stałego budżetu prób na aktualizację, dzięki czemu przebieg gry zależy tylko od ziarna. Limit czasu jest opcjonalny.
+    """
+
+    LIMIT_PROBEK = 100  # docelowa ilość przechowywanych próbek
+    BUDZET_PROB = 50  # maksymalna ilość prób wylosowania floty przy jednej aktualizacji
+    LIMIT_CZASU = None  # opcjonalny maksymalny czas losowania przy jednej aktualizacji (w sekundach) - przebieg zależy wtedy od szybkości maszyny
+    PROBY_STARTU = 20  # ilość prób wylosowania wolnego pola startowego statku
+
+    def __init__(self, rozpoznanie, los):
+        self.rozpoznanie = rozpoznanie
+        self.los = los
+        self.gestosci = [0] * rozpoznanie.rozmiar  # ilość próbek zawierających dane pole
+        self.otoczki = [(indeks, *sasiedzi) for indeks, sasiedzi in enumerate(rozpoznanie.sasiedztwo.wszystkie)]  # pole razem z sąsiadami
+        self.probki = []  # [(maska, indeksy pól)]
+        self.zakazane = 0  # maska pól znanych jako wolne od niezatopionych statków
+        self.przetworzone_zmiany = None  # ilość zmian rozpoznania uwzględnionych w masce zakazanych pól ('None' przed pierwszą aktualizacją)
+
+    def aktualizuj(self):
+        """
+        Uwzględnij w mapie nowo poznane pola - odrzuć sprzeczne z nimi próbki i uzupełnij próbki. Jeśli od ostatniej aktualizacji rozpoznanie się nie zmieniło, nic nie rób.
+        """
+        if self.przetworzone_zmiany == len(self.rozpoznanie.zmiany):
+            return
+        zmiany = self.rozpoznanie.zmiany[self.przetworzone_zmiany or 0:]
+        self.przetworzone_zmiany = len(self.rozpoznanie.zmiany)
+        for indeks in zmiany:
+            if indeks not in self.rozpoznanie.front:
+                self.zakazane |= 1 << indeks
+
+        front = 0
+        for indeks in self.rozpoznanie.front:
+            front |= 1 << indeks
+
+        zgodne = []
+        for probka in self.probki:
+            maska, indeksy = probka
+            if maska & self.zakazane or maska & front != front:
+                for indeks in indeksy:
+                    self.gestosci[indeks] -= 1
+            else:
+                zgodne.append(probka)
+        self.probki = zgodne
+        self.uzupelnij_probki()
+
+    def uzupelnij_probki(self):
+        """Losuj nowe próbki aż do osiągnięcia limitu próbek albo wyczerpania budżetu prób (lub opcjonalnego limitu czasu)."""
+        zakresy = [statek.RANGA_BAZOWA.zakres for statek in self.rozpoznanie.plansza.niezatopione]
+        if not zakresy or not self.rozpoznanie.nieodwiedzone:
+            return
+
+        skupiska = self.rozpoznanie.podaj_skupiska_trafien()
+        koniec = None if self.LIMIT_CZASU is None else perf_counter() + self.LIMIT_CZASU
+        proby = 0
+        while len(self.probki) < self.LIMIT_PROBEK and proby < self.BUDZET_PROB:
+            proby += 1
+            indeksy = self.losuj_flote(zakresy, skupiska)
+            if indeksy is not None:
+                maska = 0
+                for indeks in indeksy:
+                    maska |= 1 << indeks
+                    self.gestosci[indeks] += 1
+                self.probki.append((maska, indeksy))
+            if koniec is not None and perf_counter() > koniec:
+                break
+
+    def czy_dozwolone(self, indeks):
+        """Sprawdź czy na wskazanym polu może leżeć niezatopiony statek (pole nieodwiedzone albo z frontu)."""
+        return self.rozpoznanie.pozycje[indeks] is not None or indeks in self.rozpoznanie.front
+
+    def losuj_flote(self, zakresy, skupiska):
+        """
+        Losuj rozmieszczenie całej niezatopionej floty: statków o rozmiarach wylosowanych ze wskazanych zakresów rang, przechodzących przez wszystkie skupiska trafień frontu i nie stykających się ze sobą. Zwróć krotkę indeksów pól wszystkich statków albo 'None', jeśli flota się nie zmieściła.
+        """
+        otoczki = self.otoczki
+        rozmiary = sorted((self.los.choice(zakres) for zakres in zakresy), reverse=True)
+
+        # otoczenie skupisk: pole przylegające do skupiska (lub do niego należące) może należeć tylko do statku tego skupiska
+        otoczenie = {}
+        for numer, skupisko in enumerate(skupiska):
+            for indeks in skupisko:
+                for pole in otoczki[indeks]:
+                    otoczenie[pole] = numer if otoczenie.get(pole, numer) == numer else -1
+        zablokowane = set()  # pola statków już umieszczonych i ich obwiednie
+
+        flota = []
+        for numer, skupisko in sorted(enumerate(skupiska), key=lambda para: -len(para[1])):
+            pasujace = [rozmiar for rozmiar in rozmiary if rozmiar >= len(skupisko)]
+            if not pasujace:
+                return None
+            rozmiar = self.los.choice(pasujace)
+            rozmiary.remove(rozmiar)
+            obce = {pole for pole, wlasciciel in otoczenie.items() if wlasciciel != numer}
+            statek = self.losuj_statek(sorted(skupisko), rozmiar, zablokowane | obce)
+            if statek is None:
+                return None
+            flota.extend(statek)
+            for indeks in statek:
+                zablokowane.update(otoczki[indeks])
+
+        zablokowane.update(otoczenie)  # otoczenia skupisk pokrywają już obwiednie ich statków
+        nieodwiedzone = self.rozpoznanie.nieodwiedzone
+        for rozmiar in rozmiary:
+            for _ in range(self.PROBY_STARTU):
+                start = self.los.choice(nieodwiedzone)
+                if start not in zablokowane:
+                    break
+            else:
+                return None
+            statek = self.losuj_statek([start], rozmiar, zablokowane)
+            if statek is None:
+                return None
+            flota.extend(statek)
+            for indeks in statek:
+                zablokowane.update(otoczki[indeks])
+
+        return tuple(flota)
+
+    def losuj_statek(self, poczatek, rozmiar, zablokowane):
+        """
+        Losuj położenie statku o podanym rozmiarze, rozrastającego się ze wskazanych pól początkowych (posortowanych) po polach nieodwiedzonych spoza zbioru pól zablokowanych. Zwróć krotkę indeksów pól statku albo 'None', jeśli statek się nie zmieścił lub jego pola nie są połączone ortogonalnie.
+        """
+        ortogonalne = self.rozpoznanie.sasiedztwo.ortogonalne
+        pozycje = self.rozpoznanie.pozycje
+        indeksy = list(poczatek)
+        zajete = set(poczatek)
+        indeks = indeksy[-1]
+
+        while len(indeksy) < rozmiar:
+            sasiedzi = [sasiad for sasiad in ortogonalne[indeks]
+                        if pozycje[sasiad] is not None and sasiad not in zajete and sasiad not in zablokowane]
+            if not sasiedzi:  # cofanie - rozrastanie od dowolnego pola dotychczasowego kadłuba
+                sasiedzi = [sasiad for indeks_statku in indeksy for sasiad in ortogonalne[indeks_statku]
+                            if pozycje[sasiad] is not None and sasiad not in zajete and sasiad not in zablokowane]
+                if not sasiedzi:
+                    return None
+            indeks = self.los.choice(sasiedzi)
+            indeksy.append(indeks)
+            zajete.add(indeks)
+
+        if len(poczatek) > 1:  # skupisko trafień może stykać się tylko na ukos - kadłub musi je połączyć
+            polaczone, do_sprawdzenia = {indeksy[0]}, [indeksy[0]]
+            while do_sprawdzenia:
+                for sasiad in ortogonalne[do_sprawdzenia.pop()]:
+                    if sasiad in zajete and sasiad not in polaczone:
+                        polaczone.add(sasiad)
+                        do_sprawdzenia.append(sasiad)
+            if len(polaczone) < len(indeksy):
+                return None
+
+        return tuple(indeksy)
+
+
+class PokryciaSalw:
+    """
+    Tablice pokrycia salw dla planszy danej wielkości: dla każdej orientacji salwy (w kolejności 'Salwa.ORIENTACJE') i każdego indeksu pola - indeksy pól rażonych salwą wycelowaną w to pole. Pierwszy jest indeks celu, pola poza planszą oznaczone są indeksem wartownika (równym rozmiarowi planszy), który przy ocenie ma zawsze wagę 0.
+
+    Tablice przechowywane są kolumnami (jedna kolumna na każde rażone pole salwy), dzięki czemu ocena wszystkich par (cel, orientacja) to kilka przebiegów 'map()' po całej planszy zamiast składania konfiguracji pól cel po celu.
+    """
+
+    OcenaSalwy = namedtuple("OcenaSalwy", "ocena indeksy orientacja")
+    ORIENTACJE_WG_WIELKOSCI = {
+        1: Salwa.ORIENTACJE[:1],
+        2: Salwa.ORIENTACJE[1:5],
+        3: Salwa.ORIENTACJE[5:]
+    }
+    POKRYCIA = {}  # {(kolumny, rzedy): PokryciaSalw}
+
+    def __init__(self, kolumny, rzedy):
+        sasiedztwo = Plansza.podaj_sasiedztwo(kolumny, rzedy)
+        self.rozmiar = kolumny * rzedy
+        self.kolumny_pokrycia = {}  # {orientacja: (kolumna indeksów celów, kolumna indeksów 1. sąsiada, ...)}
+        for orientacja in Salwa.ORIENTACJE:
+            kolumny_pokrycia = [tuple(range(self.rozmiar))]
+            for kierunek in AI.KIERUNKI_SALWY[orientacja]:
+                numer = Plansza.NUMERY_KIERUNKOW[kierunek]
+                kolumny_pokrycia.append(tuple(
+                    self.rozmiar if sasiedzi[numer] is None else sasiedzi[numer]
+                    for sasiedzi in sasiedztwo.kierunkowe
+                ))
+            self.kolumny_pokrycia[orientacja] = tuple(kolumny_pokrycia)
+
+    @classmethod
+    def podaj_pokrycia(cls, kolumny, rzedy):
+        """Podaj tablice pokrycia salw dla planszy o wskazanych wymiarach (tworzone raz i współdzielone)."""
+        wymiary = (kolumny, rzedy)
+        if wymiary not in cls.POKRYCIA:
+            cls.POKRYCIA[wymiary] = cls(kolumny, rzedy)
+        return cls.POKRYCIA[wymiary]
+
+    def ocen(self, wagi, orientacja):
+        """Podaj oceny (sumy wag rażonych pól) salw o wskazanej orientacji dla wszystkich celów na planszy."""
+        wagi = list(wagi) + [0]  # waga wartownika
+        kolumny_pokrycia = self.kolumny_pokrycia[orientacja]
+        oceny = list(map(wagi.__getitem__, kolumny_pokrycia[0]))
+        for kolumna in kolumny_pokrycia[1:]:
+            oceny = list(map(add, oceny, map(wagi.__getitem__, kolumna)))
+        return oceny
+
+    def podaj_indeksy(self, indeks, orientacja):
+        """Podaj indeksy pól rażonych salwą o wskazanej orientacji wycelowaną we wskazane pole ('None' poza planszą)."""
+        return [None if kolumna[indeks] == self.rozmiar else kolumna[indeks]
+                for kolumna in self.kolumny_pokrycia[orientacja]]
+
+    def podaj_orientacje(self, indeksy):
+        """
+        Podaj orientację salwy rażącej pola o wskazanych indeksach (pierwszy to indeks celu, 'None' poza planszą). Jeśli kilka orientacji razi te same pola (przy krawędzi planszy), podaj pierwszą z nich.
+        """
+        for orientacja in self.ORIENTACJE_WG_WIELKOSCI.get(len(indeksy), ()):
+            if self.podaj_indeksy(indeksy[0], orientacja) == indeksy:
+                return orientacja
+        raise ValueError("Błąd konfiguracji pól salwy. Otrzymane indeksy pól: {}.".format(indeksy))
+
+    def wybierz_najlepsza_dla_celu(self, waga, indeks, wielkosc_salwy):
+        """
+        Oceń salwy o wskazanej wielkości wycelowane we wskazane pole (we wszystkich orientacjach) wg sumy wag rażonych pól, podanych funkcją wagi indeksu pola (pola poza planszą mają wagę 0). Podaj najlepszą salwę (przy równych ocenach - pierwszą w kolejności orientacji).
+        """
+        najlepsza = None
+        for orientacja in self.ORIENTACJE_WG_WIELKOSCI[wielkosc_salwy]:
+            ocena = 0
+            for kolumna in self.kolumny_pokrycia[orientacja]:
+                if kolumna[indeks] != self.rozmiar:
+                    ocena += waga(kolumna[indeks])
+            if najlepsza is None or ocena > najlepsza[0]:
+                najlepsza = (ocena, orientacja)
+        ocena, orientacja = najlepsza
+        return self.OcenaSalwy(ocena, self.podaj_indeksy(indeks, orientacja), orientacja)
+
+    def wybierz_najlepsze(self, wagi, wielkosc_salwy, k=1, cele=None):
+        """
+        Oceń wszystkie pary (cel, orientacja) dla salwy o wskazanej wielkości i podaj `k` najlepszych salw (od najlepszej; przy równych ocenach w kolejności celów i orientacji). Cele można zawęzić do wskazanych indeksów pól.
         """
-        pass  # TODO: przeładowanie metody rodzica
+        cele = range(self.rozmiar) if cele is None else cele
+        kandydaci = []
+        for orientacja in self.ORIENTACJE_WG_WIELKOSCI[wielkosc_salwy]:
+            oceny = self.ocen(wagi, orientacja)
+            kandydaci.extend((oceny[indeks], indeks, orientacja) for indeks in cele)
+        najlepsi = nlargest(k, kandydaci, key=lambda kandydat: kandydat[0])
+        return [self.OcenaSalwy(ocena, self.podaj_indeksy(indeks, orientacja), orientacja)
+                for ocena, indeks, orientacja in najlepsi]
 
 
 class GraSieciowa(Gra):  # TODO
@@ -255,9 +770,9 @@ class GraSieciowa(Gra):  # TODO
     Przebieg gry na danej planszy w wykonaniu drugiego gracza połączonego przez sieć.
     """
 
-    def __init__(self, plansza_wlasna, plansza_gracza):
-        super().__init__(plansza_wlasna)
-        self.druga_plansza = deepcopy(plansza_gracza)
+    def __init__(self, plansza_wlasna, plansza_gracza, ziarno=None):
+        super().__init__(plansza_wlasna, ziarno)
+        self.druga_plansza = Rozpoznanie(plansza_gracza)  # tylko to, co wiadomo o planszy gracza
 
     def zrob_ruch(self):
         """
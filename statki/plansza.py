@@ -12,7 +12,7 @@
 # inna (prostsza) metoda na implementację protokołu Iterable (jeśli klasa bazuje na jakiejś gotowym obiekcie iterable (np. liście)) to zaimplementowanie metody '__iter__' jako zwracającej 'iter(iterable)' (wtedy korzysta się z gotowego iteratora obiektu iterable) albo jako zwracającej generator (metoda '__iter__' staje się wtedy tzw. generator function) np. 'for element in sekwencja: yield element'
 
 
-from random import randint, choice, gauss
+from random import Random
 from decimal import Decimal as D
 from collections import namedtuple
 
@@ -30,6 +30,7 @@ class Plansza:
         30: "AD", 31: "AE", 32: "AF", 33: "AG", 34: "AH", 35: "AI", 36: "AJ", 37: "AK", 38: "AL",
         39: "AM", 40: "AN"
     }
+    ODWR_ALFABET = {litera: liczba for liczba, litera in ALFABET.items()}
     MIN_KOLUMNY, MAX_KOLUMNY = Parser.podaj_minmax_kolumny()
     MIN_RZEDY, MAX_RZEDY = Parser.podaj_minmax_rzedy()
     MIN_ROZMIAR_STATKU, MAX_ROZMIAR_STATKU = Parser.podaj_minmax_rozmiar_statku()
@@ -37,21 +38,69 @@ class Plansza:
 
     Kierunki = namedtuple("Kierunki", "E S W N NE SE SW NW")
     KIERUNKI = Kierunki._make(Kierunki._fields)
-
-    def __init__(self, kolumny, rzedy):
+    PRZESUNIECIA = Kierunki(E=(1, 0), S=(0, 1), W=(-1, 0), N=(0, -1), NE=(1, -1), SE=(1, 1), SW=(-1, 1), NW=(-1, -1))
+    NUMERY_KIERUNKOW = {kierunek: numer for numer, kierunek in enumerate(KIERUNKI)}
+
+    # tablice sąsiedztwa pól wspólne dla wszystkich plansz o tych samych wymiarach
+    Sasiedztwo = namedtuple("Sasiedztwo", "kierunkowe ortogonalne wszystkie")
+    SASIEDZTWA = {}  # {(kolumny, rzedy): Sasiedztwo}
+
+    def __init__(self, kolumny, rzedy, magazyn="pola", rozmieszczenie="obszary",
+                 zapelnienie=None, odch_st=None, prz_mediany=None, ziarno=None):
+        # parametry wypełniania nie podane wprost brane są z danych gry
+        zapelnienie = self.ZAPELNIENIE if zapelnienie is None else zapelnienie
+        odch_st = self.ODCH_ST if odch_st is None else odch_st
+        prz_mediany = self.PRZ_MEDIANY if prz_mediany is None else prz_mediany
         self.sprawdz_wymiary(kolumny, rzedy)
+        self.los = Random(ziarno)  # generator liczb losowych tej planszy - dla danego ziarna plansza jest zawsze ta sama
+        self.pule_nazw = Statek.podaj_pule_nazw()  # własne pule nazw statków - nazwy (i kolejność statków) zależą tylko od ziarna
         self.kolumny, self.rzedy, self.rozmiar = kolumny, rzedy, rzedy * kolumny
-        self.pola = self.stworz_pola()  # matryca pól (krotka krotek (rzędów))
+        self.magazyn = self.stworz_magazyn(magazyn)  # przechowuje znaczniki wszystkich pól
+        self.matryca_pol = None  # matryca pól tworzona przy pierwszym odwołaniu do `pola`
+        self.sasiedztwo = self.podaj_sasiedztwo(kolumny, rzedy)
         self.statki = []
-        self.wypelnij_statkami(self.ZAPELNIENIE, self.ODCH_ST, self.PRZ_MEDIANY)
+        self.statki_wg_wspolrzednych = {}  # {(kolumna, rzad): statek} dla każdego pola statku
+        self.dziennik = []  # zmiany znaczników pól w trakcie gry w formacie: (indeks, nowy znacznik)
+        self.niedobor = 0  # sumaryczny rozmiar statków, których nie udało się umieścić na planszy
+        self.wypelnij_statkami(zapelnienie, odch_st, prz_mediany, rozmieszczenie)
         self.sprawdz_statki()
         # self.o_statkach()  # test
         # self.drukuj()  # test
         self.ilosc_pol_statkow = sum([statek.rozmiar for statek in self.statki])
+        self.ilosc_trafionych_pol = 0  # trafione i zatopione pola statków tej planszy
         # TODO: zamienić na generatory
         self.zatopione = []  # statki zatopione tej planszy
         self.niezatopione = self.statki[:]  # statki niezatopione tej planszy
 
+    def __getstate__(self):
+        """
+        Zwróć stan planszy do kopiowania i serializacji (bez indeksu statków odtwarzanego z listy statków, bez wspólnych tablic sąsiedztwa, bez matrycy pól tworzonej na żądanie, bez generatora liczb losowych, potrzebnego tylko przy wypełnianiu planszy, i bez dziennika zmian - kopia zaczyna własny dziennik).
+        """
+        stan = self.__dict__.copy()
+        del stan["dziennik"]
+        del stan["statki_wg_wspolrzednych"]
+        del stan["sasiedztwo"]
+        del stan["matryca_pol"]
+        del stan["los"]
+        return stan
+
+    def __setstate__(self, stan):
+        """Odtwórz planszę ze stanu zwróconego przez `__getstate__`."""
+        self.__dict__.update(stan)
+        self.dziennik = []
+        self.matryca_pol = None
+        self.los = Random()
+        self.sasiedztwo = self.podaj_sasiedztwo(self.kolumny, self.rzedy)
+        self.statki_wg_wspolrzednych = {}
+        for statek in self.statki:
+            self.zarejestruj_statek(statek)
+
+    def odnow_id(self):
+        """
+        Przypisz planszy i jej polom identyfikator na podstawie bieżącego obiektu planszy. Potrzebne dla planszy odtworzonej z serializacji, której pola noszą identyfikator (być może już ponownie przydzielony) planszy oryginalnej.
+        """
+        self.magazyn.zmien_id_planszy(id(self))
+
     def __repr__(self):
         """
         Zwróć reprezentację tekstową planszy w formacie: Plansza(kolumny=12, rzedy=15)
@@ -72,13 +121,43 @@ class Plansza:
                 str(kolumny), str(rzedy)
             ))
 
+    def stworz_magazyn(self, rodzaj):
+        """
+        Stwórz magazyn znaczników pól planszy wskazanego rodzaju:
+
+        - 'pola' - znaczniki przechowywane są w obiektach klasy `Pole` (domyślnie)
+        - 'bity' - znaczniki przechowywane są w maskach bitowych (po jednej na każdy znacznik)
+        - 'bajty' - znaczniki przechowywane są w jednej tablicy bajtów (po bajcie na pole)
+
+        W przypadku 'bitów' i 'bajtów' obiekty klasy `Pole` są tylko widokami magazynu tworzonymi dopiero przy pierwszym odwołaniu.
+        """
+        if rodzaj == "pola":
+            return MagazynPol(id(self), self.kolumny, self.rzedy)
+        elif rodzaj == "bity":
+            return MagazynBitowy(id(self), self.kolumny, self.rzedy)
+        elif rodzaj == "bajty":
+            return MagazynBajtowy(id(self), self.kolumny, self.rzedy)
+        else:
+            tekst_bledu = "Błąd rodzaju magazynu planszy. "
+            tekst_bledu += "Dostępne rodzaje: 'pola', 'bity' i 'bajty'. Otrzymany rodzaj: {}."
+            raise ValueError(tekst_bledu.format(rodzaj))
+
+    @property
+    def pola(self):
+        """
+        Matryca pól (krotka krotek (rzędów)), tworzona przy pierwszym odwołaniu i zapamiętywana - pola magazynu (również zapamiętywane przez magazyn widoki) są te same przez cały czas życia planszy. W przypadku magazynów z widokami pól pierwsze odwołanie tworzy widoki wszystkich pól, dlatego wewnątrz planszy lepiej korzystać z metod magazynu.
+        """
+        if self.matryca_pol is None:
+            self.matryca_pol = self.stworz_pola()
+        return self.matryca_pol
+
     def stworz_pola(self):
-        """Stwórz pola planszy."""
+        """Stwórz matrycę pól planszy."""
         pola = []
         for y in range(1, self.rzedy + 1):
             rzad = []
             for x in range(1, self.kolumny + 1):
-                rzad.append(Pole(id(self), x, y))
+                rzad.append(self.magazyn.podaj_pole(self.podaj_indeks(x, y)))
             pola.append(rzad)
         return tuple(tuple(rzad) for rzad in pola)
 
@@ -105,10 +184,18 @@ class Plansza:
         Podaj pole wg wskazanych współrzędnych. Jeśli podane współrzędne wykraczają poza zakres planszy zwróć 'None'.
         """
         if self.czy_w_planszy(kolumna, rzad):
-            return self.pola[rzad - 1][kolumna - 1]
+            return self.magazyn.podaj_pole(self.podaj_indeks(kolumna, rzad))
         else:
             return None
 
+    def podaj_indeks(self, kolumna, rzad):
+        """Podaj indeks pola o wskazanych współrzędnych w magazynie planszy."""
+        return (rzad - 1) * self.kolumny + (kolumna - 1)
+
+    def podaj_indeksy(self, pola):
+        """Podaj indeksy wskazanych pól w magazynie planszy."""
+        return [self.podaj_indeks(pole.kolumna, pole.rzad) for pole in pola]
+
     def czy_w_planszy(self, kolumna, rzad):
         """Sprawdź czy wskazane wspolrzedne są w obrębie planszy."""
         if rzad < 1 or rzad > self.rzedy or kolumna < 1 or kolumna > self.kolumny:
@@ -116,114 +203,135 @@ class Plansza:
         else:
             return True
 
+    @classmethod
+    def podaj_sasiedztwo(cls, kolumny, rzedy):
+        """
+        Podaj tablice sąsiedztwa dla planszy o wskazanych wymiarach (tworzone raz i współdzielone przez wszystkie plansze tej wielkości).
+        """
+        wymiary = (kolumny, rzedy)
+        if wymiary not in cls.SASIEDZTWA:
+            cls.SASIEDZTWA[wymiary] = cls.stworz_sasiedztwo(kolumny, rzedy)
+        return cls.SASIEDZTWA[wymiary]
+
+    @classmethod
+    def stworz_sasiedztwo(cls, kolumny, rzedy):
+        """
+        Stwórz tablice sąsiedztwa dla planszy o wskazanych wymiarach. Dla każdego indeksu pola tablica 'kierunkowe' zawiera indeksy sąsiadów we wszystkich kierunkach (w kolejności 'KIERUNKI', 'None' poza planszą), a tablice 'ortogonalne' i 'wszystkie' - tylko indeksy sąsiadów istniejących.
+        """
+        kierunkowe = []
+        for rzad in range(rzedy):
+            for kolumna in range(kolumny):
+                sasiedzi = []
+                for przesuniecie_kolumny, przesuniecie_rzedu in cls.PRZESUNIECIA:
+                    k, r = kolumna + przesuniecie_kolumny, rzad + przesuniecie_rzedu
+                    if 0 <= k < kolumny and 0 <= r < rzedy:
+                        sasiedzi.append(r * kolumny + k)
+                    else:
+                        sasiedzi.append(None)
+                kierunkowe.append(tuple(sasiedzi))
+
+        ortogonalne = [tuple(i for i in sasiedzi[:4] if i is not None) for sasiedzi in kierunkowe]
+        wszystkie = [tuple(i for i in sasiedzi if i is not None) for sasiedzi in kierunkowe]
+        return cls.Sasiedztwo(tuple(kierunkowe), tuple(ortogonalne), tuple(wszystkie))
+
     def podaj_sasiednie_pole(self, pole, kierunek):
         """Podaj pole sąsiednie dla wskazanego pola wg podanego kierunku."""
-        kolumna, rzad = pole.podaj_wspolrzedne()
-        if kierunek == self.KIERUNKI.E:
-            kolumna += 1
-        elif kierunek == self.KIERUNKI.S:
-            rzad += 1
-        elif kierunek == self.KIERUNKI.W:
-            kolumna -= 1
-        elif kierunek == self.KIERUNKI.N:
-            rzad -= 1
-        elif kierunek == self.KIERUNKI.NE:
-            kolumna += 1
-            rzad -= 1
-        elif kierunek == self.KIERUNKI.SE:
-            kolumna += 1
-            rzad += 1
-        elif kierunek == self.KIERUNKI.SW:
-            kolumna -= 1
-            rzad += 1
-        elif kierunek == self.KIERUNKI.NW:
-            kolumna -= 1
-            rzad -= 1
-
-        return self.podaj_pole(kolumna, rzad)  # None jeśli poza planszą!
+        indeks = self.podaj_indeks(pole.kolumna, pole.rzad)
+        sasiad = self.sasiedztwo.kierunkowe[indeks][self.NUMERY_KIERUNKOW[kierunek]]
+        if sasiad is None:  # poza planszą
+            return None
+        return self.magazyn.podaj_pole(sasiad)
 
     def umiesc_statek(self, kolumna, rzad, rozmiar):
         """
         Spróbuj umieścić statek o podanym rozmiarze na planszy. Statek rozrasta się w przypadkowych kierunkach ze wskazanego pola początkowego. W razie sukcesu zwróć umieszczony statek, w razie porażki zwróć 'None' (czyszcząc oznaczone wcześniej pola).
         """
         licznik_iteracji = 0
-        pola_statku = []
-        pole = self.podaj_pole(kolumna, rzad)  # pole początkowe
+        indeksy_statku = []
+        sasiedzi = self.sasiedztwo.kierunkowe
+        pusty, statek = Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.statek
+        # pole początkowe
+        indeks = self.podaj_indeks(kolumna, rzad) if self.czy_w_planszy(kolumna, rzad) else None
 
-        def dodaj_pole_statku(pole):
-            pole.znacznik = Pole.ZNACZNIKI.statek
-            pola_statku.append(pole)
+        def dodaj_pole_statku(indeks):
+            self.magazyn.ustaw(indeks, statek)
+            indeksy_statku.append(indeks)
 
-        while len(pola_statku) < rozmiar:
+        def wyczysc_pola_statku():
+            self.magazyn.zamien(indeksy_statku, (statek,), pusty)
+
+        while len(indeksy_statku) < rozmiar:
             if licznik_iteracji > rozmiar * 10:  # za dużo iteracji - NIEUDANE UMIESZCZENIE
+                wyczysc_pola_statku()
                 return None
 
             if licznik_iteracji == 0:  # pole początkowe
-                if pole is not None and pole.znacznik == Pole.ZNACZNIKI.pusty:
-                    dodaj_pole_statku(pole)
+                if indeks is not None and self.magazyn.podaj(indeks) == pusty:
+                    dodaj_pole_statku(indeks)
                 else:
                     return None  # NIEUDANE UMIESZCZENIE
             else:
-                pula_kierunkow = list(self.KIERUNKI[:4])
+                pula_kierunkow = [0, 1, 2, 3]  # numery kierunków ortogonalnych
 
                 while True:
                     if not pula_kierunkow:  # powrót po wyczerpaniu kierunków
-                        indeks = pola_statku.index(pole)
-                        if indeks:
-                            pole = pola_statku[indeks - 1]
+                        pozycja = indeksy_statku.index(indeks)
+                        if pozycja:
+                            indeks = indeksy_statku[pozycja - 1]
                             break
                         else:  # powrót do pola początkowego - NIEUDANE UMIESZCZENIE
-                            for pole in pola_statku:  # czyszczenie nieudanego umieszczenia
-                                pole.znacznik = Pole.ZNACZNIKI.pusty
+                            wyczysc_pola_statku()
                             return None
 
                     # próba dodania w losowym kierunku spośród ciągle obecnych w puli
-                    kierunek = choice(pula_kierunkow)
-                    sasiad = self.podaj_sasiednie_pole(pole, kierunek)
-                    if sasiad is not None and sasiad.znacznik == Pole.ZNACZNIKI.pusty:
-                        pole = sasiad
-                        dodaj_pole_statku(pole)
+                    kierunek = self.los.choice(pula_kierunkow)
+                    sasiad = sasiedzi[indeks][kierunek]
+                    if sasiad is not None and self.magazyn.podaj(sasiad) == pusty:
+                        indeks = sasiad
+                        dodaj_pole_statku(indeks)
                         break
                     else:
                         pula_kierunkow.remove(kierunek)
 
             licznik_iteracji += 1
 
-        return Statek.fabryka(pola_statku)
+        umieszczony_statek = Statek.fabryka([self.magazyn.podaj_pole(indeks) for indeks in indeksy_statku], self.los, self.pule_nazw)
+        self.zarejestruj_statek(umieszczony_statek)
+        return umieszczony_statek
+
+    def zarejestruj_statek(self, statek):
+        """Zapisz wskazany statek pod współrzędnymi wszystkich jego pól."""
+        for pole in statek.pola:
+            self.statki_wg_wspolrzednych[pole.podaj_wspolrzedne()] = statek
 
     def umiesc_obwiednie_statku(self, statek):
         """Umieść na planszy i w statku obwiednię wskazanego statku."""
-        for pole in statek.pola:
-            for kierunek in self.KIERUNKI:
-                sasiad = self.podaj_sasiednie_pole(pole, kierunek)
-                if sasiad is not None:
-                    if sasiad.znacznik == Pole.ZNACZNIKI.pusty:
-                        sasiad.znacznik = Pole.ZNACZNIKI.obwiednia
-                        statek.obwiednia.append(sasiad)
-                    elif sasiad.znacznik == Pole.ZNACZNIKI.obwiednia:
-                        if sasiad not in statek.obwiednia:
-                            statek.obwiednia.append(sasiad)
+        pusty, obwiednia = Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.obwiednia
+        indeksy_obwiedni = set(self.podaj_indeksy(statek.obwiednia))
+        for indeks in self.podaj_indeksy(statek.pola):
+            for sasiad in self.sasiedztwo.wszystkie[indeks]:
+                znacznik = self.magazyn.podaj(sasiad)
+                if znacznik == pusty:
+                    self.magazyn.ustaw(sasiad, obwiednia)
+                elif znacznik != obwiednia or sasiad in indeksy_obwiedni:
+                    continue
+                indeksy_obwiedni.add(sasiad)
+                statek.obwiednia.append(self.magazyn.podaj_pole(sasiad))
 
     def podaj_statek(self, pole, tryb="pole"):
         """Podaj statek zajmujący wskazane pole (które może mieć postać stringa)."""
         if tryb == "str":
-            odwr_alfabet = {v: k for k, v in self.ALFABET.items()}
-            litera, cyfra = "", ""
-            for znak in pole:
-                if znak.isalpha():
-                    litera += znak
-                else:
-                    cyfra += znak
-            kolumna, rzad = odwr_alfabet[litera], int(cyfra)
-            pole = self.podaj_pole(kolumna, rzad)
-
-        for statek in self.statki:
-            if pole in statek.pola:
-                return statek
+            wspolrzedne = self.podaj_wspolrzedne_z_tekstu(pole)
+        else:
+            wspolrzedne = pole.podaj_wspolrzedne()
+        return self.statki_wg_wspolrzednych.get(wspolrzedne)  # None jeśli pole nie należy do statku
 
-        return None
+    def podaj_wspolrzedne_z_tekstu(self, tekst):
+        """Zamień tekstową reprezentację pola (np. B7) na jego współrzędne."""
+        cyfry = tekst.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        return self.ODWR_ALFABET[tekst[:len(tekst) - len(cyfry)]], int(cyfry)
 
-    def wypelnij_statkami(self, zapelnienie=20, odch_st=9.5, prz_mediany=-12):
+    def wypelnij_statkami(self, zapelnienie=20, odch_st=9.5, prz_mediany=-12, rozmieszczenie="obszary"):
         """
         Wypełnij planszę statkami. Każdy kolejny statek ma losowy rozmiar w określonym przez planszę zakresie i jest umieszczany w losowym miejscu. O ilości i rozmiarach statków decydują parametry.
 
@@ -238,6 +346,10 @@ class Plansza:
         prz_mediany
         ~~~~~~~~~~~
         to przesunięcie mediany w rozkładzie Gaussa, z którego losowany jest rozmiar statku. Wartość ujemna spowoduje losowanie większej ilości małych statków. Wartość dodatnia spowoduje losowanie większej ilości dużych statków. Zero (brak przesunięcia) powoduje losowanie wg standardowego rozkładu normalnego, gdzie mediana jest średnią arytmetyczną przedziału losowania.
+
+        rozmieszczenie
+        ~~~~~~~~~~~~~~
+        to strategia umieszczania statków na planszy: 'obszary' (domyślna) - statki umieszczane są tylko w wolnych obszarach planszy zdolnych je pomieścić, więc każda próba kończy się sukcesem; 'losowe' - statki rozrastają się z losowych pól początkowych aż do skutku lub wyczerpania limitu iteracji.
         """
 
         # wartości domyślne parametrów zostały ustalone po testach (przy (50/9.5/-12) nie da się umieścić
@@ -247,33 +359,43 @@ class Plansza:
         # dużych statków) powinień sprowadzać się do manipulacji tylko jednym parametrem: PRZESUNIĘCIEM
         # MEDIANY
 
-        def podaj_rozmiar_z_rozkladu_Gaussa(mediana, odch_st, minimum, maximum, prz_mediany=0):
-            """
-            Podaj rozmiar statku jako losową liczbę całkowitą wg rozkładu Gaussa we wskazanym przedziale oraz ze wskazanym przesunięciem mediany. Liczby losowane spoza żądanego przedziału są ignorowane.
-            """
-            while True:
-                i = int(round(gauss(mediana + prz_mediany, odch_st)))
-                if i in range(minimum, maximum + 1):
-                    return i
+        if rozmieszczenie == "obszary":
+            self.rozmiesc_statki_wg_obszarow(zapelnienie, odch_st, prz_mediany)
+        elif rozmieszczenie == "losowe":
+            self.rozmiesc_statki_losowo(zapelnienie, odch_st, prz_mediany)
+        else:
+            tekst_bledu = "Nieznana strategia rozmieszczenia statków: '{}'. "
+            tekst_bledu += "Dostępne strategie: 'obszary', 'losowe'."
+            raise ValueError(tekst_bledu.format(rozmieszczenie))
 
-        mediana = (self.MIN_ROZMIAR_STATKU + self.MAX_ROZMIAR_STATKU) / 2.0  # 10.5
+        self.statki.sort(key=lambda s: s.rozmiar, reverse=True)  # od największego do najmniejszego
 
+    def losuj_rozmiar_statku(self, odch_st, prz_mediany, maksimum=None):
+        """
+        Podaj rozmiar statku jako losową liczbę całkowitą wg rozkładu Gaussa z przedziału rozmiarów statków (ograniczonego opcjonalnie podanym maksimum) oraz ze wskazanym przesunięciem mediany. Liczby losowane spoza żądanego przedziału są ignorowane.
+        """
+        mediana = (self.MIN_ROZMIAR_STATKU + self.MAX_ROZMIAR_STATKU) / 2.0  # 10.5
+        minimum = self.MIN_ROZMIAR_STATKU
+        maksimum = self.MAX_ROZMIAR_STATKU if maksimum is None else min(maksimum, self.MAX_ROZMIAR_STATKU)
+        while True:
+            i = int(round(self.los.gauss(mediana + prz_mediany, odch_st)))
+            if i in range(minimum, maksimum + 1):
+                return i
+
+    def rozmiesc_statki_losowo(self, zapelnienie, odch_st, prz_mediany):
+        """
+        Rozmieść statki, próbując je umieszczać w losowych miejscach planszy aż do skutku (ograniczonego limitem iteracji).
+        """
         licznik_iteracji = 0
         sum_rozmiar_statkow = int(self.rozmiar * zapelnienie / 100)
         akt_rozmiar_statkow = sum_rozmiar_statkow
 
         while akt_rozmiar_statkow > 0:
-            rozmiar_statku = podaj_rozmiar_z_rozkladu_Gaussa(
-                mediana,
-                odch_st,
-                self.MIN_ROZMIAR_STATKU,
-                self.MAX_ROZMIAR_STATKU,
-                prz_mediany
-            )
+            rozmiar_statku = self.losuj_rozmiar_statku(odch_st, prz_mediany)
             if rozmiar_statku > akt_rozmiar_statkow:
                 continue
-            pole_startowe_x = randint(1, self.kolumny)
-            pole_startowe_y = randint(1, self.rzedy)
+            pole_startowe_x = self.los.randint(1, self.kolumny)
+            pole_startowe_y = self.los.randint(1, self.rzedy)
 
             umieszczony_statek = self.umiesc_statek(
                 pole_startowe_x,
@@ -288,17 +410,86 @@ class Plansza:
 
             # obsługa wyjścia
             if licznik_iteracji > sum_rozmiar_statkow * 50:  # wielkość do przetestowania
-                print(  # test
-                    "Ilość iteracji pętli zapełniającej planszę statkami"
-                    "większa od oczekiwanej ({})".format(sum_rozmiar_statkow * 50),
-                    "Nastąpiło przedwczesne przerwanie petli."
-                    " Umieszczono mniej statków ({})".format(len(self.statki))
-                )
+                self.niedobor = akt_rozmiar_statkow  # przedwczesne przerwanie pętli - umieszczono mniej statków
                 break
 
             licznik_iteracji += 1
 
-        self.statki.sort(key=lambda s: s.rozmiar, reverse=True)  # od największego do najmniejszego
+    def rozmiesc_statki_wg_obszarow(self, zapelnienie, odch_st, prz_mediany):
+        """
+        Rozmieść statki w wolnych (nie zajętych przez statki i ich obwiednie) obszarach planszy. Pole początkowe statku losowane jest tylko spośród pól, których obszar może jeszcze pomieścić statek wylosowanego rozmiaru. Obszar sprawdzany jest przeszukiwaniem wszerz przerywanym po znalezieniu tylu pól ile liczy statek, a pojemność zbyt małych obszarów jest zapamiętywana (obszary mogą się tylko zmniejszać), więc każde pole odrzucane jest co najwyżej raz dla danego rozmiaru, a każde udane sprawdzenie kończy się umieszczeniem statku.
+        """
+        akt_rozmiar_statkow = int(self.rozmiar * zapelnienie / 100)
+        wolne = set(self.magazyn.podaj_indeksy(Pole.ZNACZNIKI.pusty))
+        pojemnosci = {}  # {indeks: maksymalna ilość pól obszaru, do którego należy pole}
+        maks_rozmiar_statku = self.MAX_ROZMIAR_STATKU
+
+        while akt_rozmiar_statkow > 0 and maks_rozmiar_statku >= self.MIN_ROZMIAR_STATKU:
+            rozmiar_statku = self.losuj_rozmiar_statku(
+                odch_st,
+                prz_mediany,
+                min(akt_rozmiar_statkow, maks_rozmiar_statku)
+            )
+            kandydaci = [indeks for indeks in wolne if pojemnosci.get(indeks, rozmiar_statku) >= rozmiar_statku]
+
+            while kandydaci:
+                indeks = kandydaci.pop(self.los.randrange(len(kandydaci)))
+                obszar = self.przeszukaj_obszar(indeks, wolne, rozmiar_statku)
+                if len(obszar) == rozmiar_statku:
+                    break
+                for indeks_obszaru in obszar:  # obszar przeszukany w całości - za mały
+                    pojemnosci[indeks_obszaru] = len(obszar)
+                odrzucone = set(obszar)
+                kandydaci = [kandydat for kandydat in kandydaci if kandydat not in odrzucone]
+            else:  # żaden obszar nie mieści statku tego rozmiaru - ograniczenie kolejnych losowań
+                maks_rozmiar_statku = max([pojemnosci[indeks] for indeks in wolne], default=0)
+                continue
+
+            umieszczony_statek = self.umiesc_statek_w_wolnych_polach(indeks, rozmiar_statku, wolne)
+            self.umiesc_obwiednie_statku(umieszczony_statek)
+            wolne.difference_update(self.podaj_indeksy(umieszczony_statek.obwiednia))
+            self.statki.append(umieszczony_statek)
+            akt_rozmiar_statkow -= rozmiar_statku
+
+        self.niedobor = akt_rozmiar_statkow  # brak wolnego miejsca na planszy - umieszczono mniej statków
+
+    def przeszukaj_obszar(self, indeks, wolne, limit):
+        """
+        Przeszukaj wszerz obszar wolnych pól (połączonych ze sobą ortogonalnie) zawierający wskazane pole. Zwróć indeksy znalezionych pól - przeszukiwanie przerywane jest po znalezieniu ich tyle ile wynosi limit.
+        """
+        obszar = [indeks]
+        znalezione = {indeks}
+        for indeks in obszar:  # lista rośnie w trakcie iteracji
+            for sasiad in self.sasiedztwo.ortogonalne[indeks]:
+                if sasiad in wolne and sasiad not in znalezione:
+                    if len(obszar) == limit:
+                        return obszar
+                    znalezione.add(sasiad)
+                    obszar.append(sasiad)
+        return obszar
+
+    def umiesc_statek_w_wolnych_polach(self, indeks, rozmiar, wolne):
+        """
+        Umieść statek o podanym rozmiarze na wolnych polach, zaczynając od wskazanego pola (którego obszar musi mieścić statek). Statek rozrasta się w przypadkowych kierunkach, a gdy ostatnio dodane pole nie ma już wolnych sąsiadów - od losowego pola dotychczasowego kadłuba. Pola statku usuwane są ze zbioru wolnych pól. Zwróć umieszczony statek.
+        """
+        indeksy_statku = []
+
+        while True:
+            wolne.remove(indeks)
+            indeksy_statku.append(indeks)
+            self.magazyn.ustaw(indeks, Pole.ZNACZNIKI.statek)
+            if len(indeksy_statku) == rozmiar:
+                break
+
+            sasiedzi = [sasiad for sasiad in self.sasiedztwo.ortogonalne[indeks] if sasiad in wolne]
+            if not sasiedzi:  # cofanie - obszar mieści statek, więc któreś pole kadłuba ma wolnego sąsiada
+                sasiedzi = [sasiad for indeks_statku in indeksy_statku
+                            for sasiad in self.sasiedztwo.ortogonalne[indeks_statku] if sasiad in wolne]
+            indeks = self.los.choice(sasiedzi)
+
+        statek = Statek.fabryka([self.magazyn.podaj_pole(indeks) for indeks in indeksy_statku], self.los, self.pule_nazw)
+        self.zarejestruj_statek(statek)
+        return statek
 
     def sprawdz_pola_statku(self, statek):
         """Zweryfikuj poprawność pól wskazanego statku."""
@@ -316,15 +507,10 @@ class Plansza:
         # ortogonalne sąsiedztwo pól
         def czy_nastepne_pole_sasiadem(pole, nastepne_pole):
             """Sprawdza czy następne pole jest sąsiadem"""
-            pula_kierunkow = list(Plansza.KIERUNKI[:4])
-            while pula_kierunkow:
-                kierunek = pula_kierunkow[0]
-                sasiad = self.podaj_sasiednie_pole(pole, kierunek)
-                if sasiad == nastepne_pole:
-                    return True
-                else:
-                    pula_kierunkow.remove(kierunek)
-            return False
+            if not self.czy_w_planszy(*nastepne_pole.podaj_wspolrzedne()):
+                return False
+            indeks, nastepny_indeks = self.podaj_indeksy((pole, nastepne_pole))
+            return nastepny_indeks in self.sasiedztwo.ortogonalne[indeks]
 
         pola_do_sprawdzenia = statek.pola[:]
         pola_sprawdzone = []
@@ -370,20 +556,74 @@ class Plansza:
 
     def odkryj_pola(self, pola):
         """Odkryj wskazane pola."""
-        for pole in pola:
-            if pole.znacznik in (Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.obwiednia):
-                pole.znacznik = Pole.ZNACZNIKI.pudlo
-            elif pole.znacznik == Pole.ZNACZNIKI.statek:
-                pole.znacznik = Pole.ZNACZNIKI.trafiony
+        indeksy = self.podaj_indeksy(pola)
+        self.zmien_znaczniki(
+            indeksy,
+            (Pole.ZNACZNIKI.pusty, Pole.ZNACZNIKI.obwiednia),
+            Pole.ZNACZNIKI.pudlo
+        )
+        trafione = self.zmien_znaczniki(indeksy, (Pole.ZNACZNIKI.statek,), Pole.ZNACZNIKI.trafiony)
+        self.zarejestruj_trafienia(trafione)
+
+    def zmien_znaczniki(self, indeksy, znaczniki, nowy_znacznik):
+        """
+        Zamień na nowy znacznik te spośród wskazanych pól, które mają jeden z podanych znaczników, i zapisz zmiany w dzienniku planszy. Zwróć indeksy zamienionych pól.
+        """
+        zamienione = self.magazyn.zamien(indeksy, znaczniki, nowy_znacznik)
+        self.dziennik.extend((indeks, nowy_znacznik) for indeks in zamienione)
+        return zamienione
+
+    def odtworz_zmiany(self, zmiany):
+        """
+        Odtwórz na planszy zmiany znaczników pól zapisane w dzienniku (tej samej planszy w późniejszym stanie), aktualizując liczniki trafień i listy zatopionych/niezatopionych statków.
+        """
+        for indeks, znacznik in zmiany:
+            self.magazyn.ustaw(indeks, znacznik)
+            self.dziennik.append((indeks, znacznik))
+            if znacznik == Pole.ZNACZNIKI.trafiony:
+                self.zarejestruj_trafienia([indeks])
+            elif znacznik == Pole.ZNACZNIKI.zatopiony:
+                statek = self.statki_wg_wspolrzednych[self.magazyn.podaj_wspolrzedne(indeks)]
+                if statek in self.niezatopione:
+                    self.niezatopione.remove(statek)
+                    self.zatopione.append(statek)
+
+    def zarejestruj_trafienia(self, indeksy):
+        """Zwiększ liczniki trafień planszy i trafionych statków o wskazane, świeżo trafione pola."""
+        self.ilosc_trafionych_pol += len(indeksy)
+        for indeks in indeksy:
+            statek = self.statki_wg_wspolrzednych.get(self.magazyn.podaj_wspolrzedne(indeks))
+            if statek is not None:
+                statek.zarejestruj_trafienie()  # obniża też rangę rzeczywistą statku
 
     def oznacz_zatopione(self):
         """Oznacz statki posiadające wszystkie pola trafione jako zatopione."""
         for statek in self.niezatopione[:]:
-            if not statek.czy_zatopiony():
-                if all(True for pole in statek.pola if pole.znacznik == Pole.ZNACZNIKI.trafiony):
-                    statek.zatop()
-                    self.niezatopione.remove(statek)
-                    self.zatopione.append(statek)
+            if statek.czy_zatopiony():
+                self.zatop_statek(statek)
+
+    def zatop_statek(self, statek):
+        """
+        Zatop wskazany statek - oznacz jego pola jako zatopione (doliczając trafienia pól jeszcze nietrafionych) i przenieś go do zatopionych.
+        """
+        indeksy = self.podaj_indeksy(statek.pola)
+        self.zarejestruj_trafienia(self.zmien_znaczniki(indeksy, (Pole.ZNACZNIKI.statek,), Pole.ZNACZNIKI.trafiony))
+        self.zmien_znaczniki(indeksy, (Pole.ZNACZNIKI.trafiony,), Pole.ZNACZNIKI.zatopiony)
+        self.niezatopione.remove(statek)
+        self.zatopione.append(statek)
+
+    def czy_sa_trafione_pola(self):
+        """Sprawdź czy na planszy są trafione pola jeszcze niezatopionych statków."""
+        return self.magazyn.czy_jest(Pole.ZNACZNIKI.trafiony)
+
+    def podaj_nieodwiedzone_pola(self):
+        """Podaj wszystkie pola, które nie zostały jeszcze odkryte."""
+        indeksy = self.magazyn.podaj_indeksy(
+            Pole.ZNACZNIKI.pusty,
+            Pole.ZNACZNIKI.obwiednia,
+            Pole.ZNACZNIKI.statek
+        )
+        return [self.magazyn.podaj_pole(indeks) for indeks in indeksy]
 
     def o_statkach(self):  # do testów
         """Drukuj informację o umieszczonych statkach"""
@@ -420,12 +660,7 @@ class Plansza:
 
     def podaj_ilosc_nietrafionych_pol(self):
         """Podaj ilość nietrafionych pól statków. Pola zatopione traktowane są jak trafione."""
-        licznik = 0
-        for statek in self.statki:
-            for pole in statek.pola:
-                if pole.znacznik in (Pole.ZNACZNIKI.trafiony, Pole.ZNACZNIKI.zatopiony):
-                    licznik += 1
-        return self.ilosc_pol_statkow - licznik  # int
+        return self.ilosc_pol_statkow - self.ilosc_trafionych_pol  # int
 
     def podaj_info_o_nietrafionych(self):
         """
@@ -437,6 +672,160 @@ class Plansza:
         return str(nietrafione), str(procent) + "%"
 
 
+class Rozpoznanie:
+    """
+    Stan planszy przeciwnika znany atakującemu ("mgła wojny"). Przechowuje tylko to, czego atakujący legalnie się dowiedział: pudła, trafienia, zatopienia i odkryte obwiednie zatopionych statków - pola nieodwiedzone mają znacznik pustego pola, a odkryte obwiednie znacznik obwiedni. Rozmieszczenie statków odczytywane jest z rzeczywistej planszy tylko przy rozstrzyganiu strzałów, które oddawane są na tę planszę.
+
+    Znaczniki trzymane są w magazynie bajtowym, a tablice sąsiedztwa współdzielone z planszą, więc rozpoznanie jest tanie w tworzeniu i kopiowaniu (np. na potrzeby przeszukiwania ruchów naprzód). Na bieżąco (przy rozstrzyganiu strzałów) aktualizowane są też: pula pól nieodwiedzonych (losowanie i usuwanie pola w czasie stałym) i front trafień (trafione pola niezatopionych statków), więc wybór pomiędzy polowaniem i celowaniem nie wymaga przeglądania całej planszy.
+    """
+
+    NUMERY_KIERUNKOW = Plansza.NUMERY_KIERUNKOW
+
+    def __init__(self, plansza):
+        self.plansza = plansza  # rzeczywista plansza przeciwnika
+        self.kolumny, self.rzedy, self.rozmiar = plansza.kolumny, plansza.rzedy, plansza.rozmiar
+        self.sasiedztwo = plansza.sasiedztwo
+        self.magazyn = MagazynBajtowy(id(self), self.kolumny, self.rzedy)  # na początku wszystkie pola nieodwiedzone
+        self.zatopione = []  # statki, o których zatopieniu atakujący wie
+        self.nieodwiedzone = list(range(self.rozmiar))  # indeksy pól, o których atakujący nic nie wie
+        self.pozycje = list(range(self.rozmiar))  # pozycja indeksu pola w puli nieodwiedzonych ('None' poza pulą)
+        self.front = set()  # indeksy trafionych pól niezatopionych statków
+        self.zmiany = []  # indeksy pól, których znane znaczniki się zmieniły (w kolejności zmian)
+
+    def __repr__(self):
+        """
+        Zwróć reprezentację tekstową rozpoznania w formacie: Rozpoznanie(kolumny=12, rzedy=15)
+        """
+        tresc = "kolumny=" + str(self.kolumny) + ", rzedy=" + str(self.rzedy)
+        return type(self).__name__ + "(" + tresc + ")"
+
+    def kopiuj(self):
+        """Podaj kopię rozpoznania (z własnymi znacznikami, ale tą samą rzeczywistą planszą przeciwnika)."""
+        kopia = Rozpoznanie(self.plansza)
+        kopia.magazyn.bajty[:] = self.magazyn.bajty
+        kopia.zatopione = self.zatopione[:]
+        kopia.nieodwiedzone, kopia.pozycje = self.nieodwiedzone[:], self.pozycje[:]
+        kopia.front = set(self.front)
+        kopia.zmiany = self.zmiany[:]
+        return kopia
+
+    def podaj_indeks(self, kolumna, rzad):
+        """Podaj indeks pola o wskazanych współrzędnych."""
+        return (rzad - 1) * self.kolumny + (kolumna - 1)
+
+    def podaj_indeksy(self, pola):
+        """Podaj indeksy wskazanych pól."""
+        return [self.podaj_indeks(pole.kolumna, pole.rzad) for pole in pola]
+
+    def podaj_pole(self, kolumna, rzad):
+        """
+        Podaj pole (o znaczniku znanym atakującemu) wg wskazanych współrzędnych. Jeśli podane współrzędne wykraczają poza zakres planszy zwróć 'None'.
+        """
+        if self.plansza.czy_w_planszy(kolumna, rzad):
+            return self.magazyn.podaj_pole(self.podaj_indeks(kolumna, rzad))
+        else:
+            return None
+
+    def odkryj_pola(self, pola):
+        """Odkryj wskazane pola - oddaj na nie strzał na rzeczywistej planszy i zapamiętaj jego wynik."""
+        indeksy = self.podaj_indeksy(pola)
+        self.plansza.odkryj_pola([self.plansza.magazyn.podaj_pole(indeks) for indeks in indeksy])
+        self.zapamietaj_pola(indeksy)
+
+    def oznacz_zatopione(self):
+        """
+        Oznacz na rzeczywistej planszy statki posiadające wszystkie pola trafione jako zatopione i zapamiętaj pola oraz obwiednie nowo zatopionych statków.
+        """
+        self.plansza.oznacz_zatopione()
+        self.zapamietaj_zatopione(self.plansza.zatopione[len(self.zatopione):])
+
+    def zapamietaj_salwe(self, salwa, zatopione):
+        """
+        Zapamiętaj wynik salwy rozstrzygniętej już na rzeczywistej planszy (przez silnik rozgrywki): znaczniki rażonych pól oraz pola i obwiednie zatopionych nią statków.
+        """
+        self.zapamietaj_pola(self.podaj_indeksy([pole for pole in salwa.pola if pole is not None]))
+        self.zapamietaj_zatopione(zatopione)
+
+    def zapamietaj_pola(self, indeksy):
+        """Zapamiętaj aktualne znaczniki wskazanych pól rzeczywistej planszy (tylko te, które się zmieniły)."""
+        for indeks in indeksy:
+            znacznik = self.plansza.magazyn.podaj(indeks)
+            if self.magazyn.podaj(indeks) != znacznik:
+                self.zapamietaj(indeks, znacznik)
+
+    def zapamietaj_zatopione(self, statki):
+        """Zapamiętaj pola i odkryte obwiednie wskazanych, nowo zatopionych statków."""
+        for statek in statki:
+            for indeks in self.podaj_indeksy(statek.pola):
+                if self.magazyn.podaj(indeks) != Pole.ZNACZNIKI.zatopiony:
+                    self.zapamietaj(indeks, Pole.ZNACZNIKI.zatopiony)
+            for indeks in self.podaj_indeksy(statek.obwiednia):
+                if self.magazyn.podaj(indeks) == Pole.ZNACZNIKI.pusty:
+                    self.zapamietaj(indeks, Pole.ZNACZNIKI.obwiednia)
+            self.zatopione.append(statek)
+
+    def zapamietaj(self, indeks, znacznik):
+        """Zapamiętaj znacznik wskazanego pola, aktualizując pulę pól nieodwiedzonych, front trafień i listę zmian."""
+        self.magazyn.ustaw(indeks, znacznik)
+        self.zmiany.append(indeks)
+        self.usun_z_nieodwiedzonych(indeks)
+        if znacznik == Pole.ZNACZNIKI.trafiony:
+            self.front.add(indeks)
+        else:
+            self.front.discard(indeks)
+
+    def usun_z_nieodwiedzonych(self, indeks):
+        """Usuń wskazane pole z puli nieodwiedzonych (zastępując je ostatnim polem puli)."""
+        pozycja = self.pozycje[indeks]
+        if pozycja is None:
+            return
+        ostatni = self.nieodwiedzone.pop()
+        if ostatni != indeks:
+            self.nieodwiedzone[pozycja] = ostatni
+            self.pozycje[ostatni] = pozycja
+        self.pozycje[indeks] = None
+
+    def czy_sa_trafione_pola(self):
+        """Sprawdź czy są znane trafione pola jeszcze niezatopionych statków."""
+        return bool(self.front)
+
+    def podaj_nieodwiedzone_pola(self):
+        """Podaj wszystkie pola, o których atakujący jeszcze nic nie wie."""
+        return [self.magazyn.podaj_pole(indeks) for indeks in self.nieodwiedzone]
+
+    def podaj_mape_nieodwiedzonych(self):
+        """Podaj mapę pól nieodwiedzonych: dla każdego indeksu pola 1 jeśli atakujący nic o nim nie wie, w przeciwnym wypadku 0."""
+        return [0 if pozycja is None else 1 for pozycja in self.pozycje]
+
+    def losuj_nieodwiedzone_pole(self, los):
+        """Losuj wskazanym generatorem liczb losowych jedno z pól, o których atakujący jeszcze nic nie wie."""
+        return self.magazyn.podaj_pole(los.choice(self.nieodwiedzone))
+
+    def podaj_front(self):
+        """Podaj trafione pola niezatopionych statków."""
+        return [self.magazyn.podaj_pole(indeks) for indeks in sorted(self.front)]
+
+    def podaj_skupiska_trafien(self):
+        """
+        Podaj skupiska trafionych pól niezatopionych statków (jako zbiory indeksów, w kolejności najmniejszych indeksów). Statki nie stykają się nawet na ukos, więc każde skupisko pól sąsiadujących ze sobą w dowolnym kierunku należy do jednego statku.
+        """
+        skupiska = []
+        pozostale = set(self.front)
+        for indeks in sorted(self.front):
+            if indeks not in pozostale:
+                continue
+            pozostale.remove(indeks)
+            skupisko, do_sprawdzenia = [indeks], [indeks]
+            while do_sprawdzenia:
+                for sasiad in self.sasiedztwo.wszystkie[do_sprawdzenia.pop()]:
+                    if sasiad in pozostale:
+                        pozostale.remove(sasiad)
+                        skupisko.append(sasiad)
+                        do_sprawdzenia.append(sasiad)
+            skupiska.append(frozenset(skupisko))
+        return skupiska
+
+
 class Pole:
     """
     Pole planszy. Posiada 6 podstawowych stanów oznaczonych znacznikami. Trzy pierwsze są używane przy inicjalizacji planszy (pola zakryte), podczas gry trzy pozostałe pojawiają się tylko jako efekt działań graczy (pola odkryte).
@@ -452,11 +841,36 @@ class Pole:
         trafiony="T",
         zatopiony="Z"
     )
+    __slots__ = ("id_planszy", "kolumna", "rzad", "magazyn", "indeks", "_znacznik")
 
-    def __init__(self, id_planszy, kolumna, rzad, znacznik=None):
+    def __init__(self, id_planszy, kolumna, rzad, znacznik=None, magazyn=None, indeks=None):
         self.id_planszy = id_planszy
         self.kolumna, self.rzad = kolumna, rzad
-        self.znacznik = znacznik if znacznik is not None else self.ZNACZNIKI.pusty
+        self.magazyn, self.indeks = magazyn, indeks  # jeśli podano magazyn, pole jest tylko jego widokiem
+        if self.magazyn is None:
+            self.znacznik = znacznik if znacznik is not None else self.ZNACZNIKI.pusty
+
+    def __reduce__(self):
+        """
+        Zwróć przepis na odtworzenie pola przy kopiowaniu i serializacji. Widok magazynu odtwarzany jest przez (skopiowany) magazyn, tak że wszystkie odniesienia do tego samego pola wskazują znowu na ten sam widok.
+        """
+        if self.magazyn is None:
+            return Pole, (self.id_planszy, self.kolumna, self.rzad, self.znacznik)
+        return MagazynWidokow.podaj_pole, (self.magazyn, self.indeks)
+
+    @property
+    def znacznik(self):
+        """Znacznik pola - przechowywany w polu albo w magazynie planszy."""
+        if self.magazyn is None:
+            return self._znacznik
+        return self.magazyn.podaj(self.indeks)
+
+    @znacznik.setter
+    def znacznik(self, znacznik):
+        if self.magazyn is None:
+            self._znacznik = znacznik
+        else:
+            self.magazyn.ustaw(self.indeks, znacznik)
 
     def __str__(self):
         """Zwróć informację o polu w formacie: litera kolumny+cyfra rzędu np. B9"""
@@ -473,17 +887,22 @@ class Pole:
 
     def __eq__(self, other):
         """
-        Przeładowanie operatora "==" (na podstawie: https://stackoverflow.com/questions/390250/elegant-ways-to-support-equivalence-equality-in-python-classes). Pola są równe jeśli: 1) należą do tej samej planszy, 2) ich współrzędne są równe i 3) ich znaczniki są równe.
+        Przeładowanie operatora "==" (na podstawie: https://stackoverflow.com/questions/390250/elegant-ways-to-support-equivalence-equality-in-python-classes). Pola są równe jeśli: 1) należą do tej samej planszy i 2) ich współrzędne są równe. Znacznik nie jest brany pod uwagę (porównanie uwzględniające znacznik - patrz: `czy_identyczne`).
         """
         if isinstance(self, other.__class__):
-            return self.__dict__ == other.__dict__
+            return (self.id_planszy, self.kolumna, self.rzad) == (
+                other.id_planszy, other.kolumna, other.rzad)
         return NotImplemented
 
     def __hash__(self):
         """
-        Zwróć hash pola. Potrzebne również dla pełnego przeładowania operatora "==" (dla porównań przy poprawnej obsłudze wyjątkowości w zbiorach).
+        Zwróć hash pola. Potrzebne również dla pełnego przeładowania operatora "==" (dla porównań przy poprawnej obsłudze wyjątkowości w zbiorach). Hash nie zależy od (zmiennego) znacznika, więc nie zmienia się po odkryciu pola.
         """
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash((self.id_planszy, self.kolumna, self.rzad))
+
+    def czy_identyczne(self, other):
+        """Sprawdź czy pola są równe i mają ten sam znacznik."""
+        return self == other and self.znacznik == other.znacznik
 
     def podaj_wspolrzedne(self):
         """Podaj współrzędne pola."""
@@ -494,6 +913,269 @@ class Pole:
         return "(" + str(self) + ")"
 
 
+class Magazyn:
+    """
+    Magazyn znaczników pól planszy indeksowany wg wzoru: (rzad - 1) * kolumny + (kolumna - 1). Klasa abstrakcyjna - inicjalizowane są tylko obiekty klas potomnych.
+    """
+
+    def __init__(self, id_planszy, kolumny, rzedy):
+        self.id_planszy = id_planszy
+        self.kolumny, self.rzedy, self.rozmiar = kolumny, rzedy, kolumny * rzedy
+
+    def podaj_wspolrzedne(self, indeks):
+        """Podaj współrzędne pola o wskazanym indeksie."""
+        rzad, kolumna = divmod(indeks, self.kolumny)
+        return kolumna + 1, rzad + 1
+
+    def podaj_pole(self, indeks):
+        """Podaj pole o wskazanym indeksie."""
+        raise NotImplementedError
+
+    def podaj(self, indeks):
+        """Podaj znacznik pola o wskazanym indeksie."""
+        raise NotImplementedError
+
+    def ustaw(self, indeks, znacznik):
+        """Ustaw znacznik pola o wskazanym indeksie."""
+        raise NotImplementedError
+
+    def zamien(self, indeksy, znaczniki, nowy_znacznik):
+        """
+        Zamień na nowy znacznik te spośród wskazanych pól, które mają jeden z podanych znaczników. Zwróć indeksy zamienionych pól.
+        """
+        raise NotImplementedError
+
+    def czy_wszystkie(self, indeksy, znacznik):
+        """Sprawdź czy wszystkie wskazane pola mają podany znacznik."""
+        raise NotImplementedError
+
+    def czy_jest(self, znacznik):
+        """Sprawdź czy jakiekolwiek pole ma podany znacznik."""
+        raise NotImplementedError
+
+    def policz(self, znacznik):
+        """Podaj ilość pól z podanym znacznikiem."""
+        raise NotImplementedError
+
+    def podaj_indeksy(self, *znaczniki):
+        """Podaj rosnąco indeksy pól z jednym z podanych znaczników."""
+        raise NotImplementedError
+
+    def zmien_id_planszy(self, id_planszy):
+        """Zmień identyfikator planszy w magazynie i we wszystkich utworzonych dotąd polach."""
+        raise NotImplementedError
+
+
+class MagazynPol(Magazyn):
+    """Magazyn, w którym znaczniki przechowywane są w samych obiektach klasy `Pole`."""
+
+    def __init__(self, id_planszy, kolumny, rzedy):
+        super().__init__(id_planszy, kolumny, rzedy)
+        self.pola = [Pole(id_planszy, *self.podaj_wspolrzedne(indeks))
+                     for indeks in range(self.rozmiar)]
+
+    def podaj_pole(self, indeks):
+        """Podaj pole o wskazanym indeksie."""
+        return self.pola[indeks]
+
+    def podaj(self, indeks):
+        """Podaj znacznik pola o wskazanym indeksie."""
+        return self.pola[indeks].znacznik
+
+    def ustaw(self, indeks, znacznik):
+        """Ustaw znacznik pola o wskazanym indeksie."""
+        self.pola[indeks].znacznik = znacznik
+
+    def zamien(self, indeksy, znaczniki, nowy_znacznik):
+        """
+        Zamień na nowy znacznik te spośród wskazanych pól, które mają jeden z podanych znaczników. Zwróć indeksy zamienionych pól.
+        """
+        zamienione = []
+        for indeks in indeksy:
+            pole = self.pola[indeks]
+            if pole.znacznik in znaczniki:
+                pole.znacznik = nowy_znacznik
+                zamienione.append(indeks)
+        return zamienione
+
+    def czy_wszystkie(self, indeksy, znacznik):
+        """Sprawdź czy wszystkie wskazane pola mają podany znacznik."""
+        return all(self.pola[indeks].znacznik == znacznik for indeks in indeksy)
+
+    def czy_jest(self, znacznik):
+        """Sprawdź czy jakiekolwiek pole ma podany znacznik."""
+        return any(pole.znacznik == znacznik for pole in self.pola)
+
+    def policz(self, znacznik):
+        """Podaj ilość pól z podanym znacznikiem."""
+        return sum(1 for pole in self.pola if pole.znacznik == znacznik)
+
+    def podaj_indeksy(self, *znaczniki):
+        """Podaj rosnąco indeksy pól z jednym z podanych znaczników."""
+        return [indeks for indeks, pole in enumerate(self.pola) if pole.znacznik in znaczniki]
+
+    def zmien_id_planszy(self, id_planszy):
+        """Zmień identyfikator planszy w magazynie i we wszystkich utworzonych dotąd polach."""
+        self.id_planszy = id_planszy
+        for pole in self.pola:
+            pole.id_planszy = id_planszy
+
+
+class MagazynWidokow(Magazyn):
+    """
+    Magazyn, którego pola są tylko widokami (obiektami klasy `Pole` bez własnego znacznika). Widoki tworzone są dopiero przy pierwszym odwołaniu i zapamiętywane. Przy kopiowaniu i serializacji pomijane są zapamiętane widoki - przenoszone są tylko same znaczniki. Klasa abstrakcyjna.
+    """
+
+    def __init__(self, id_planszy, kolumny, rzedy):
+        super().__init__(id_planszy, kolumny, rzedy)
+        self.widoki = {}  # {indeks: pole}
+
+    def __getstate__(self):
+        """Zwróć stan magazynu do kopiowania i serializacji (bez zapamiętanych widoków)."""
+        stan = self.__dict__.copy()
+        stan["widoki"] = {}
+        return stan
+
+    def podaj_pole(self, indeks):
+        """Podaj pole (widok) o wskazanym indeksie. Przy pierwszym odwołaniu stwórz je."""
+        pole = self.widoki.get(indeks)
+        if pole is None:
+            kolumna, rzad = self.podaj_wspolrzedne(indeks)
+            pole = Pole(self.id_planszy, kolumna, rzad, magazyn=self, indeks=indeks)
+            self.widoki[indeks] = pole
+        return pole
+
+    def zmien_id_planszy(self, id_planszy):
+        """Zmień identyfikator planszy w magazynie i we wszystkich utworzonych dotąd polach."""
+        self.id_planszy = id_planszy
+        for pole in self.widoki.values():
+            pole.id_planszy = id_planszy
+
+
+class MagazynBitowy(MagazynWidokow):
+    """
+    Magazyn przechowujący dla każdego znacznika maskę bitową (liczbę całkowitą), w której bit o numerze równym indeksowi pola jest ustawiony, jeśli pole ma ten znacznik. Odkrywanie, zatapianie i zliczanie pól sprowadzają się do operacji na maskach.
+    """
+
+    def __init__(self, id_planszy, kolumny, rzedy):
+        super().__init__(id_planszy, kolumny, rzedy)
+        self.maski = dict.fromkeys(Pole.ZNACZNIKI, 0)
+        self.maski[Pole.ZNACZNIKI.pusty] = (1 << self.rozmiar) - 1
+
+    @staticmethod
+    def podaj_maske(indeksy):
+        """Podaj maskę bitową wskazanych pól."""
+        maska = 0
+        for indeks in indeksy:
+            maska |= 1 << indeks
+        return maska
+
+    def podaj(self, indeks):
+        """Podaj znacznik pola o wskazanym indeksie."""
+        bit = 1 << indeks
+        for znacznik, maska in self.maski.items():
+            if maska & bit:
+                return znacznik
+
+    def ustaw(self, indeks, znacznik):
+        """Ustaw znacznik pola o wskazanym indeksie."""
+        bit = 1 << indeks
+        for stary_znacznik in self.maski:
+            self.maski[stary_znacznik] &= ~bit
+        self.maski[znacznik] |= bit
+
+    def zamien(self, indeksy, znaczniki, nowy_znacznik):
+        """
+        Zamień na nowy znacznik te spośród wskazanych pól, które mają jeden z podanych znaczników. Zwróć indeksy zamienionych pól.
+        """
+        maska = self.podaj_maske(indeksy)
+        zamienione = 0
+        for znacznik in znaczniki:
+            zamienione |= self.maski[znacznik] & maska
+            self.maski[znacznik] &= ~maska
+        self.maski[nowy_znacznik] |= zamienione
+        return self.podaj_indeksy_z_maski(zamienione)
+
+    def czy_wszystkie(self, indeksy, znacznik):
+        """Sprawdź czy wszystkie wskazane pola mają podany znacznik."""
+        maska = self.podaj_maske(indeksy)
+        return self.maski[znacznik] & maska == maska
+
+    def czy_jest(self, znacznik):
+        """Sprawdź czy jakiekolwiek pole ma podany znacznik."""
+        return self.maski[znacznik] != 0
+
+    def policz(self, znacznik):
+        """Podaj ilość pól z podanym znacznikiem."""
+        return bin(self.maski[znacznik]).count("1")
+
+    def podaj_indeksy(self, *znaczniki):
+        """Podaj rosnąco indeksy pól z jednym z podanych znaczników."""
+        maska = 0
+        for znacznik in znaczniki:
+            maska |= self.maski[znacznik]
+        return self.podaj_indeksy_z_maski(maska)
+
+    @staticmethod
+    def podaj_indeksy_z_maski(maska):
+        """Podaj rosnąco indeksy ustawionych bitów wskazanej maski."""
+        indeksy = []
+        while maska:
+            najnizszy_bit = maska & -maska
+            indeksy.append(najnizszy_bit.bit_length() - 1)
+            maska ^= najnizszy_bit
+        return indeksy
+
+
+class MagazynBajtowy(MagazynWidokow):
+    """
+    Magazyn przechowujący znaczniki wszystkich pól w jednej tablicy bajtów (bajt pola to pozycja jego znacznika w `Pole.ZNACZNIKI`). Tworzenie, kopiowanie i serializacja magazynu to operacje na jednym buforze.
+    """
+    KODY = {znacznik: kod for kod, znacznik in enumerate(Pole.ZNACZNIKI)}
+
+    def __init__(self, id_planszy, kolumny, rzedy):
+        super().__init__(id_planszy, kolumny, rzedy)
+        self.bajty = bytearray(self.rozmiar)  # same zera, czyli pola puste
+
+    def podaj(self, indeks):
+        """Podaj znacznik pola o wskazanym indeksie."""
+        return Pole.ZNACZNIKI[self.bajty[indeks]]
+
+    def ustaw(self, indeks, znacznik):
+        """Ustaw znacznik pola o wskazanym indeksie."""
+        self.bajty[indeks] = self.KODY[znacznik]
+
+    def zamien(self, indeksy, znaczniki, nowy_znacznik):
+        """
+        Zamień na nowy znacznik te spośród wskazanych pól, które mają jeden z podanych znaczników. Zwróć indeksy zamienionych pól.
+        """
+        kody, nowy_kod = [self.KODY[znacznik] for znacznik in znaczniki], self.KODY[nowy_znacznik]
+        zamienione = []
+        for indeks in indeksy:
+            if self.bajty[indeks] in kody:
+                self.bajty[indeks] = nowy_kod
+                zamienione.append(indeks)
+        return zamienione
+
+    def czy_wszystkie(self, indeksy, znacznik):
+        """Sprawdź czy wszystkie wskazane pola mają podany znacznik."""
+        kod = self.KODY[znacznik]
+        return all(self.bajty[indeks] == kod for indeks in indeksy)
+
+    def czy_jest(self, znacznik):
+        """Sprawdź czy jakiekolwiek pole ma podany znacznik."""
+        return self.KODY[znacznik] in self.bajty
+
+    def policz(self, znacznik):
+        """Podaj ilość pól z podanym znacznikiem."""
+        return self.bajty.count(self.KODY[znacznik])
+
+    def podaj_indeksy(self, *znaczniki):
+        """Podaj rosnąco indeksy pól z jednym z podanych znaczników."""
+        kody = [self.KODY[znacznik] for znacznik in znaczniki]
+        return [indeks for indeks, kod in enumerate(self.bajty) if kod in kody]
+
+
 class Salwa:
     """Kolekcja pól planszy, w które strzela napastnik wraz ze źródłem (jego położeniem)."""
     # UWAGA - nie są to pola planszy napastnika
@@ -599,32 +1281,45 @@ class Statek:
     """Statek. Klasa abstrakcyjna - inicjalizowane są tylko obiekty klas potomnych."""
 
     RANGI = Parser.podaj_rangi()  # namedtuple
+    RANGI_WG_NAZW = {ranga.nazwa: ranga for ranga in RANGI}
+    RANGI_WG_ROZMIARU = {rozmiar: ranga for ranga in RANGI for rozmiar in ranga.zakres}  # {rozmiar (lub ilość nietrafionych pól): ranga}
+    SILA_OGNIA_WG_RANG = {ranga.nazwa: tuple(ranga.sila_ognia) for ranga in RANGI}
+    KLASY_WG_RANG = {}  # {nazwa rangi bazowej: klasa potomna}, wypełniane przy definiowaniu klas potomnych
+    SALWA_ZA_OFIARE = Salwa.MIN_ROZMIAR  # premiowa salwa (w 1 pole) za każdy zatopiony statek przeciwnika
     ORDER = "★"  # TODO
 
+    def __init_subclass__(cls, **kwargs):
+        """Zarejestruj klasę potomną jako klasę statków swojej rangi bazowej."""
+        super().__init_subclass__(**kwargs)
+        Statek.KLASY_WG_RANG[cls.RANGA_BAZOWA.nazwa] = cls
+
+    @classmethod
+    def przywroc_pule_nazw(cls):
+        """Przywróć początkowe wspólne pule nazw statków wszystkich rang (używane przez statki tworzone poza planszą)."""
+        for ranga in cls.RANGI:
+            ranga.przywroc_pule_nazw()
+
     @classmethod
-    def fabryka(cls, pola_statku):
-        """Twórz z podanych pól statek odpowiedniej rangi."""
-        rozmiar = len(pola_statku)
-        if rozmiar in cls.RANGI.kuter.zakres:
-            return Kuter(pola_statku)
-        elif rozmiar in cls.RANGI.patrolowiec.zakres:
-            return Patrolowiec(pola_statku)
-        elif rozmiar in cls.RANGI.korweta.zakres:
-            return Korweta(pola_statku)
-        elif rozmiar in cls.RANGI.fregata.zakres:
-            return Fregata(pola_statku)
-        elif rozmiar in cls.RANGI.niszczyciel.zakres:
-            return Niszczyciel(pola_statku)
-        elif rozmiar in cls.RANGI.krazownik.zakres:
-            return Krazownik(pola_statku)
-        elif rozmiar in cls.RANGI.pancernik.zakres:
-            return Pancernik(pola_statku)
+    def podaj_pule_nazw(cls):
+        """Podaj nowe, pełne pule nazw statków wszystkich rang w formacie: {nazwa rangi: pula nazw}."""
+        return {ranga.nazwa: ranga.podaj_pule_nazw() for ranga in cls.RANGI}
+
+    @classmethod
+    def fabryka(cls, pola_statku, los=None, pule_nazw=None):
+        """
+        Twórz z podanych pól statek odpowiedniej rangi. Nazwę statku losuj wskazanym generatorem liczb losowych (domyślnie globalnym) z podanych pul nazw (domyślnie wspólnych pul rang).
+        """
+        ranga = cls.RANGI_WG_ROZMIARU.get(len(pola_statku))
+        if ranga is not None:
+            pula_nazw = None if pule_nazw is None else pule_nazw[ranga.nazwa]
+            return cls.KLASY_WG_RANG[ranga.nazwa](pola_statku, los, pula_nazw)
 
     def __init__(self, pola):
         self.pola = pola
         self.polozenie = sorted(pola, key=lambda p: p.kolumna + p.rzad)[0]
         self.obwiednia = []  # lista pól obwiedni wokół statku
         self.rozmiar = len(pola)
+        self.trafienia = 0  # licznik trafionych (i zatopionych) pól, aktualizowany przez planszę
         self.ofiary = []  # statki przeciwnika zatopione przez ten statek
 
     def __eq__(self, other):
@@ -644,6 +1339,21 @@ class Statek:
             return False
         return NotImplemented
 
+    def __getstate__(self):
+        """
+        Zwróć stan statku do kopiowania i serializacji. Ranga (wspólna dla wszystkich statków, razem z pulą nazw) zastępowana jest swoją nazwą, a ofiary (statki przeciwnika, które pociągnęłyby za sobą jego planszę) są pomijane - siła ognia zachowuje premiowe salwy.
+        """
+        stan = self.__dict__.copy()
+        stan["ranga"] = self.ranga.nazwa
+        del stan["ofiary"]
+        return stan
+
+    def __setstate__(self, stan):
+        """Odtwórz statek ze stanu zwróconego przez `__getstate__`."""
+        self.__dict__.update(stan)
+        self.ranga = self.RANGI_WG_NAZW[self.ranga]
+        self.ofiary = []
+
     def __str__(self):
         """
         Zwróć informację o statku w formacie:
@@ -655,16 +1365,14 @@ class Statek:
         - [10/17] to pola nietrafione/wszystkie pola
         - ** - tyle gwiazdek ile dodatkowych salw za zatopienie przeciwnika
         """
-        info = '{} "{}" ({}) [{}] '.format(
+        info = '{} "{}" ({}) [{}]'.format(
             self.RANGA_BAZOWA.nazwa,
             self.nazwa,
             str(self.polozenie),
             self.podaj_nietrafione_na_rozmiar()
         )
-        for gwiazdka in [self.ORDER for ofiara in self.ofiary]:
-            info += gwiazdka
-        else:
-            info = info[:-1]
+        if self.ofiary:
+            info += " " + "".join([self.ORDER for ofiara in self.ofiary])
 
         return info
 
@@ -679,23 +1387,11 @@ class Statek:
 
     def ile_otrzymanych_trafien(self):
         """Podaj ilość otrzymanych trafień."""
-        licznik_trafien = 0
-        for pole in self.pola:
-            if pole.znacznik in (Pole.ZNACZNIKI.trafiony, Pole.ZNACZNIKI.zatopiony):
-                licznik_trafien += 1
-        return licznik_trafien
+        return self.trafienia
 
     def czy_zatopiony(self):
         """Sprawdź czy statek jest zatopiony."""
-        if self.ile_otrzymanych_trafien() == self.rozmiar:
-            return True
-        else:
-            return False
-
-    def zatop(self):
-        """Zatop ten statek."""
-        for pole in self.pola:
-            pole.znacznik = Pole.ZNACZNIKI.zatopiony
+        return self.trafienia == self.rozmiar
 
     def o_zatopieniu(self):
         """Zwróć komunikat o swoim zatopieniu."""
@@ -704,18 +1400,35 @@ class Statek:
         else:
             return "{} zatopiony!".format(str(self))
 
-    def obniz_range(self):
-        """Obniż rangę statku (na skutek otrzymanych trafień)."""
-        indeks = self.RANGI.index(self.ranga) - 1
-        if indeks >= 0:  # obniżać można tylko powyżej kutra
-            self.ranga = self.RANGI[indeks]
-            self.sila_ognia = self.ranga.sila_ognia[:]
+    def zarejestruj_trafienie(self):
+        """Zwiększ licznik trafień statku i zaktualizuj jego rangę rzeczywistą."""
+        self.trafienia += 1
+        self.aktualizuj_range()
+
+    def aktualizuj_range(self):
+        """
+        Obniż rangę rzeczywistą statku (razem z siłą ognia) do rangi odpowiadającej ilości jego nietrafionych pól. Zatopiony statek zachowuje ostatnią rangę.
+        """
+        ranga = self.RANGI_WG_ROZMIARU.get(self.rozmiar - self.trafienia)
+        if ranga is not None and ranga is not self.ranga:
+            self.ranga = ranga
+            self.sila_ognia = list(self.SILA_OGNIA_WG_RANG[ranga.nazwa]) + [self.SALWA_ZA_OFIARE] * len(self.ofiary)
+
+    def dodaj_ofiare(self, statek):
+        """Zapisz statek przeciwnika zatopiony przez ten statek i dodaj do siły ognia premiową salwę."""
+        self.ofiary.append(statek)
+        self.sila_ognia.append(self.SALWA_ZA_OFIARE)
+
+    def ustaw_ofiary(self, ofiary):
+        """Zastąp listę ofiar statku wskazaną i przelicz siłę ognia (wg rangi rzeczywistej i premiowych salw za ofiary)."""
+        self.ofiary = list(ofiary)
+        self.sila_ognia = list(self.SILA_OGNIA_WG_RANG[self.ranga.nazwa]) + [self.SALWA_ZA_OFIARE] * len(self.ofiary)
 
     def podaj_nietrafione_na_rozmiar(self):
         """
         Podaj informację o stosunku pól nietrafionych do wszystkich pól jako string w formacie: 16/20.
         """
-        nietrafione = self.rozmiar - self.ile_otrzymanych_trafien()
+        nietrafione = self.rozmiar - self.trafienia
         return str(nietrafione) + "/" + str(self.rozmiar)
 
 
@@ -724,9 +1437,9 @@ class Kuter(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.kuter  # explicit is better than implicit
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # ranga rzeczywista - zależna od ilości trafień
         self.sila_ognia = self.ranga.sila_ognia[:]  # sila_ognia rzeczywista - zależna od aktualnej rangi rzeczywistej
 
@@ -736,9 +1449,9 @@ class Patrolowiec(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.patrolowiec
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
 
@@ -748,9 +1461,9 @@ class Korweta(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.korweta
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
 
@@ -760,9 +1473,9 @@ class Fregata(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.fregata
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
 
@@ -772,9 +1485,9 @@ class Niszczyciel(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.niszczyciel
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
 
@@ -784,9 +1497,9 @@ class Krazownik(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.krazownik
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
 
@@ -796,8 +1509,8 @@ class Pancernik(Statek):
 
     RANGA_BAZOWA = Statek.RANGI.pancernik
 
-    def __init__(self, pola):
+    def __init__(self, pola, los=None, pula_nazw=None):
         super().__init__(pola)
-        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku()
+        self.nazwa = self.RANGA_BAZOWA.losuj_nazwe_statku(los, pula_nazw)
         self.ranga = self.RANGA_BAZOWA  # jw.
         self.sila_ognia = self.ranga.sila_ognia[:]  # jw.
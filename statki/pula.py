@@ -0,0 +1,142 @@
+"""
+
+    statki.pula
+    ~~~~~~~~~~~
+
+    Pula plansz generowanych zawczasu w tle oraz masowe generowanie plansz w wielu procesach.
+
+"""
+
+import pickle
+import threading
+from collections import deque
+from multiprocessing import Pool, cpu_count
+
+from statki.plansza import Plansza
+
+
+class PulaPlansz:
+    """
+    Pula zserializowanych plansz wygenerowanych zawczasu, pogrupowanych wg parametrów generowania: (kolumny, rzedy, zapelnienie, odch_st, prz_mediany). Pulę należy wypełnić zawczasu (`wypelnij()`), np. przed zbudowaniem okna gry. Wydanie planszy z puli może uruchomić jej uzupełnianie w wątku w tle. Jeśli dla danych parametrów pula jest pusta, plansza generowana jest na bieżąco (bez uzupełniania puli).
+    """
+
+    def __init__(self, wielkosc=2):
+        self.wielkosc = wielkosc  # ilość plansz przechowywanych dla każdego zestawu parametrów
+        self.plansze = {}  # {klucz: kolejka zserializowanych plansz}
+        self.watki = {}  # {klucz: wątek uzupełniający}
+        self.blokada = threading.Lock()
+
+    @staticmethod
+    def podaj_klucz(kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None):
+        """Podaj klucz puli dla wskazanych parametrów (brakujące parametry wypełniania brane są z danych gry)."""
+        return (
+            kolumny,
+            rzedy,
+            Plansza.ZAPELNIENIE if zapelnienie is None else zapelnienie,
+            Plansza.ODCH_ST if odch_st is None else odch_st,
+            Plansza.PRZ_MEDIANY if prz_mediany is None else prz_mediany
+        )
+
+    @staticmethod
+    def generuj_plansze(klucz):
+        """Wygeneruj nową planszę wg parametrów zawartych w kluczu."""
+        kolumny, rzedy, zapelnienie, odch_st, prz_mediany = klucz
+        return Plansza(kolumny, rzedy, zapelnienie=zapelnienie, odch_st=odch_st, prz_mediany=prz_mediany)
+
+    def wypelnij(self, kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None):
+        """
+        Wypełnij pulę plansz o wskazanych parametrach do jej wielkości, generując plansze w bieżącym wątku. Podaj ilość dodanych plansz.
+        """
+        klucz = self.podaj_klucz(kolumny, rzedy, zapelnienie, odch_st, prz_mediany)
+        with self.blokada:
+            brakujace = self.wielkosc - len(self.plansze.setdefault(klucz, deque()))
+        for _ in range(brakujace):
+            zserializowana = pickle.dumps(self.generuj_plansze(klucz), pickle.HIGHEST_PROTOCOL)
+            with self.blokada:
+                self.plansze[klucz].append(zserializowana)
+        return max(brakujace, 0)
+
+    def podaj_plansze(self, kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None, uzupelniaj=True):
+        """
+        Podaj planszę o wskazanych parametrach - z puli, a jeśli ta jest pusta, wygenerowaną na bieżąco. Po wydaniu planszy z puli uruchom uzupełnianie puli w tle (chyba że `uzupelniaj` jest fałszywe - wtedy uzupełnianie można uruchomić później przez `uzupelnij()`).
+        """
+        klucz = self.podaj_klucz(kolumny, rzedy, zapelnienie, odch_st, prz_mediany)
+        with self.blokada:
+            kolejka = self.plansze.get(klucz)
+            zserializowana = kolejka.popleft() if kolejka else None
+
+        if zserializowana is None:
+            return self.generuj_plansze(klucz)
+        if uzupelniaj:
+            self.uzupelnij(*klucz)
+        plansza = pickle.loads(zserializowana)
+        plansza.odnow_id()
+        return plansza
+
+    def uzupelnij(self, kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None):
+        """
+        Uruchom w tle uzupełnianie puli plansz o wskazanych parametrach (jeśli nie jest już uzupełniana). Zwróć wątek uzupełniający.
+        """
+        klucz = self.podaj_klucz(kolumny, rzedy, zapelnienie, odch_st, prz_mediany)
+        with self.blokada:
+            watek = self.watki.get(klucz)  # wątek wyrejestrowuje się sam, pod blokadą, kończąc pracę
+            if watek is None:
+                self.plansze.setdefault(klucz, deque())
+                watek = threading.Thread(target=self.uzupelniaj, args=(klucz,), daemon=True)
+                self.watki[klucz] = watek
+                watek.start()
+        return watek
+
+    def uzupelniaj(self, klucz):
+        """Generuj plansze wg parametrów zawartych w kluczu, dopóki pula nie osiągnie swojej wielkości."""
+        while True:
+            with self.blokada:
+                if len(self.plansze[klucz]) >= self.wielkosc:
+                    del self.watki[klucz]
+                    return
+            try:
+                zserializowana = pickle.dumps(self.generuj_plansze(klucz), pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                with self.blokada:
+                    del self.watki[klucz]
+                raise
+            with self.blokada:
+                self.plansze[klucz].append(zserializowana)
+
+    def podaj_ilosc_plansz(self, kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None):
+        """Podaj ilość gotowych plansz o wskazanych parametrach."""
+        klucz = self.podaj_klucz(kolumny, rzedy, zapelnienie, odch_st, prz_mediany)
+        with self.blokada:
+            return len(self.plansze.get(klucz, ()))
+
+
+PULA = PulaPlansz()  # pula wspólna dla całej gry
+
+
+def generuj_zserializowana_plansze(zadanie):
+    """
+    Wygeneruj i zserializuj planszę wg parametrów zadania: (ziarno, kolumny, rzedy, zapelnienie, odch_st, prz_mediany, magazyn). Plansza ma własne pule nazw statków, więc wynik zależy tylko od zadania. Funkcja wykonywana w procesach potomnych.
+    """
+    ziarno, kolumny, rzedy, zapelnienie, odch_st, prz_mediany, magazyn = zadanie
+    plansza = Plansza(kolumny, rzedy, magazyn, zapelnienie=zapelnienie, odch_st=odch_st, prz_mediany=prz_mediany,
+                      ziarno=ziarno)
+    return pickle.dumps(plansza, pickle.HIGHEST_PROTOCOL)
+
+
+def generuj_plansze(n, kolumny, rzedy, zapelnienie=None, odch_st=None, prz_mediany=None, ziarno=0,
+                    procesy=None, magazyn="bajty", porcja=16):
+    """
+    Generuj `n` plansz o wskazanych parametrach w puli procesów i podawaj je kolejno (jako generator) w postaci zserializowanej - do odtworzenia przez `pickle.loads()` i `Plansza.odnow_id()`.
+
+    Plansza o numerze `i` generowana jest zawsze z ziarnem `ziarno + i`, niezależnie od ilości procesów, więc ta sama seria parametrów daje zawsze te same plansze. Zadania zlecane są oknami po kilka porcji na proces, dzięki czemu w pamięci nie czeka nigdy więcej niż jedno okno gotowych plansz, bez względu na wielkość `n`.
+    """
+    kolumny, rzedy, zapelnienie, odch_st, prz_mediany = PulaPlansz.podaj_klucz(
+        kolumny, rzedy, zapelnienie, odch_st, prz_mediany)
+    procesy = procesy or cpu_count()
+    okno = procesy * porcja * 4
+
+    with Pool(procesy) as pula:
+        for poczatek in range(0, n, okno):
+            zadania = [(ziarno + i, kolumny, rzedy, zapelnienie, odch_st, prz_mediany, magazyn)
+                       for i in range(poczatek, min(poczatek + okno, n))]
+            yield from pula.imap(generuj_zserializowana_plansze, zadania, porcja)
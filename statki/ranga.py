@@ -13,6 +13,36 @@ from random import choice
 Rangi = namedtuple("Rangi", "kuter patrolowiec korweta fregata niszczyciel krazownik pancernik")
 
 
+class PulaNazw:
+    """
+    Pula nazw statków jednej rangi: kopia nazw rangi, z której nazwy losowane są bez powtórzeń. Po wyczerpaniu nazw pula odnawia się, dodając do każdej nazwy kolejny liczebnik rzymski.
+    """
+
+    def __init__(self, nazwy_statkow, liczebniki):
+        self.nazwy_statkow = nazwy_statkow
+        self.nazwy = nazwy_statkow[:]  # nazwy aktualnie dostępne
+        self.liczebniki = liczebniki[:]  # liczebniki jeszcze niewykorzystane
+        self.max_ilosc_nazw = len(nazwy_statkow) * len(liczebniki)
+
+    def odnow(self):
+        """Odnów wyczerpaną pulę, dodając do każdej nazwy kolejny liczebnik rzymski."""
+        # przy rozmiarach planszy dyktowanych przez GUI prawdopodobieństwo konieczności użycia chociaż raz tej metody jest nikłe, nie mówiąc o wyczerpaniu całej puli
+        if not self.liczebniki:
+            raise ValueError("Wyczerpano liczbę możliwych nazw dla statków ({})".format(self.max_ilosc_nazw))
+        liczebnik = self.liczebniki.pop(0)
+        self.nazwy = [" ".join([nazwa, liczebnik]) for nazwa in self.nazwy_statkow]
+
+    def losuj(self, los=None):
+        """
+        Losuj nazwę z puli i usuń ją z puli. Do losowania użyj wskazanego generatora liczb losowych (obiektu `random.Random`), a jeśli go nie podano - globalnego generatora modułu `random`.
+        """
+        if not self.nazwy:
+            self.odnow()
+        nazwa = choice(self.nazwy) if los is None else los.choice(self.nazwy)
+        self.nazwy.remove(nazwa)
+        return nazwa
+
+
 class Ranga:
     """
     Ranga statku. Dane dla obiektów tej klasy są parsowane przez 'statek.pamiec.Parser'.
@@ -25,8 +55,8 @@ class Ranga:
         self.zakres = zakres  # zakres rozmiarów statku
         self.sila_ognia = sila_ognia
         self.nazwy_statkow = nazwy_statkow
-        self.pula_nazw = self.nazwy_statkow[:]  # pula aktualnie dostępnych nazw statków dla tej rangi
-        self.liczebniki = liczebniki  # liczebniki rzymskie dodawane do nazw statków po wyczerpaniu puli (potrzebne bardziej do testów - przy założonych ograniczeniach rozmiarów planszy (i w efekcie możliwej ilości statków) konieczność użycia tej zmiennej jest zbliżona do zera)
+        self.liczebniki = liczebniki[:]  # liczebniki rzymskie dodawane do nazw statków po wyczerpaniu puli (potrzebne bardziej do testów - przy założonych ograniczeniach rozmiarów planszy (i w efekcie możliwej ilości statków) konieczność użycia tej zmiennej jest zbliżona do zera)
+        self.pula_nazw = self.podaj_pule_nazw()  # pula wspólna dla statków tworzonych poza planszą (plansze mają własne pule)
         self.liczba_mnoga = liczba_mnoga
         self.biernik = biernik
 
@@ -51,22 +81,20 @@ class Ranga:
 
     def resetuj_pule_nazw(self):
         """
-        Resetuj wyczerpaną pulę nazw statków, dodając do każdej nazwy kolejny liczebnik rzymski.
+        Resetuj wyczerpaną wspólną pulę nazw statków, dodając do każdej nazwy kolejny liczebnik rzymski.
         """
-        # przy rozmiarach planszy dyktowanych przez GUI prawdopodobieństwo konieczności użycia chociaż raz tej metody jest nikłe, nie mówiąc o wyczerpaniu całej puli
-        if not self.liczebniki:
-            raise ValueError("Wyczerpano liczbę możliwych nazw dla statków ({})".format(
-                self.max_ilosc_nazw))
+        self.pula_nazw.odnow()
 
-        liczebnik = self.liczebniki.pop(0)
-        self.pula_nazw = [" ".join([nazwa, liczebnik]) for nazwa in self.nazwy_statkow]
+    def podaj_pule_nazw(self):
+        """Podaj nową, pełną pulę nazw statków tej rangi."""
+        return PulaNazw(self.nazwy_statkow, self.liczebniki)
 
-    def losuj_nazwe_statku(self):
+    def przywroc_pule_nazw(self):
+        """Przywróć początkową wspólną pulę nazw statków (razem ze wszystkimi liczebnikami)."""
+        self.pula_nazw = self.podaj_pule_nazw()
+
+    def losuj_nazwe_statku(self, los=None, pula_nazw=None):
         """
-        Losuj nazwę dla statku z dostępnej puli nazw. By zapewnić unikalność statku, po użyciu usuń nazwę z puli.
+        Losuj nazwę dla statku ze wskazanej puli nazw (domyślnie wspólnej puli rangi). By zapewnić unikalność statku, po użyciu nazwa usuwana jest z puli. Do losowania użyj wskazanego generatora liczb losowych (obiektu `random.Random`), a jeśli go nie podano - globalnego generatora modułu `random`.
         """
-        if not self.pula_nazw:
-            self.resetuj_pule_nazw()
-        nazwa = choice(self.pula_nazw)
-        self.pula_nazw.remove(nazwa)
-        return nazwa
+        return (self.pula_nazw if pula_nazw is None else pula_nazw).losuj(los)
@@ -0,0 +1,207 @@
+"""
+
+    statki.turniej
+    ~~~~~~~~~~~~~~
+
+    Turniej strategii gracza komputerowego: partie rozgrywane bez interfejsu graficznego w puli procesów i zbiorcze statystyki wyników.
+
+    Uruchamianie: `python -m statki.turniej --help`
+
+"""
+
+import argparse
+import math
+from collections import namedtuple
+from itertools import permutations
+from multiprocessing import Pool, cpu_count
+from random import Random
+
+from statki.plansza import Plansza
+from statki.mechanika import AI, MocneAI, Rozgrywka
+
+STRATEGIE = {
+    "AI": AI,
+    "MocneAI": MocneAI
+}  # kolejne strategie wystarczy dopisać tutaj
+
+Zadanie = namedtuple("Zadanie", "strategie kolumny rzedy zapelnienie ziarno limit_rund")
+Wynik = namedtuple("Wynik", "strategie kolumny rzedy zapelnienie zwyciezca strzaly tury")
+
+
+def rozegraj_partie(zadanie):
+    """
+    Rozegraj partię wg zadania i podaj jej wynik. Plansze (razem z nazwami statków) i decyzje stron zależą tylko od ziarna zadania, z którego wyprowadzane są osobne ziarna dla każdej planszy i każdej strategii - strategie losują własnymi generatorami, a mapa gęstości 'MocneAI' losuje próbki w stałym budżecie prób (o ile nie włączono jej opcjonalnego limitu czasu) - więc wynik nie zależy od procesu, w którym partia została rozegrana. Funkcja wykonywana w procesach potomnych.
+
+    Zwycięzca to indeks strony w zadaniu ('None' jeśli partia nie została rozstrzygnięta w limicie rund). Strzały to ilość pól ostrzelanych przez zwycięzcę (bez niewypałów - strzałów poza planszę), a tury - ilość tur zwycięzcy (z zapisów jego gry).
+    """
+    los = Random(zadanie.ziarno)
+    ziarna_plansz, ziarna_stron = [los.getrandbits(64) for _ in range(2)], [los.getrandbits(64) for _ in range(2)]
+    plansze = [Plansza(zadanie.kolumny, zadanie.rzedy, "bajty", zapelnienie=zadanie.zapelnienie,
+                       ziarno=ziarna_plansz[i]) for i in range(2)]
+    strony = [STRATEGIE[strategia](plansze[i], plansze[1 - i], ziarno=ziarna_stron[i])
+              for i, strategia in enumerate(zadanie.strategie)]
+    zwyciezca = Rozgrywka(*strony).rozegraj(zadanie.limit_rund)
+
+    strzaly = tury = None
+    if zwyciezca is not None:
+        strzaly = sum(len(salwa.pola) for tura in zwyciezca.tury for runda in tura.rundy for salwa in runda.salwy_oddane)
+        tury = len(zwyciezca.tury)
+        zwyciezca = strony.index(zwyciezca)
+    return Wynik(zadanie.strategie, zadanie.kolumny, zadanie.rzedy, zadanie.zapelnienie, zwyciezca, strzaly, tury)
+
+
+def podaj_zadania(strategie, wymiary, zapelnienia, partie, ziarno=0, limit_rund=None):
+    """
+    Podaj (jako generator) zadania turnieju: po `partie` partii dla każdej uporządkowanej pary różnych strategii (każda strategia zaczyna tyle samo razy), każdych wymiarów planszy (krotki: kolumny, rzędy) i każdego zapełnienia. Kolejne partie dostają kolejne ziarna.
+    """
+    for kolumny, rzedy in wymiary:
+        for zapelnienie in zapelnienia:
+            for para in permutations(strategie, 2):
+                for _ in range(partie):
+                    yield Zadanie(para, kolumny, rzedy, zapelnienie, ziarno, limit_rund)
+                    ziarno += 1
+
+
+def rozegraj_turniej(zadania, procesy=None, porcja=8):
+    """
+    Rozgrywaj partie wg zadań w puli procesów i podawaj (jako generator) ich wyniki w kolejności ukończenia. Partie są od siebie niezależne, więc czas turnieju maleje liniowo z ilością procesów.
+    """
+    with Pool(procesy or cpu_count()) as pula:
+        yield from pula.imap_unordered(rozegraj_partie, zadania, porcja)
+
+
+class Srednia:
+    """Średnia krocząca (algorytm Welforda) z przedziałem ufności rozkładu normalnego."""
+
+    def __init__(self):
+        self.n = 0
+        self.srednia = 0.0
+        self.suma_kwadratow = 0.0  # suma kwadratów odchyleń od średniej
+
+    def dodaj(self, wartosc):
+        """Uwzględnij kolejną wartość."""
+        self.n += 1
+        roznica = wartosc - self.srednia
+        self.srednia += roznica / self.n
+        self.suma_kwadratow += roznica * (wartosc - self.srednia)
+
+    def podaj_margines(self, z=1.96):
+        """Podaj połowę szerokości przedziału ufności średniej (domyślnie 95%)."""
+        if self.n < 2:
+            return float("nan")
+        return z * math.sqrt(self.suma_kwadratow / (self.n - 1) / self.n)
+
+    def podaj_opis(self):
+        """Podaj średnią z marginesem przedziału ufności jako tekst (bez marginesu dla jednej wartości, '–' bez wartości)."""
+        if self.n == 0:
+            return "–"
+        if self.n == 1:
+            return "{:.1f}".format(self.srednia)
+        return "{:.1f} ± {:.1f}".format(self.srednia, self.podaj_margines())
+
+
+def podaj_przedzial_wilsona(sukcesy, n, z=1.96):
+    """Podaj przedział ufności (Wilsona) proporcji sukcesów (domyślnie 95%)."""
+    if n == 0:
+        return float("nan"), float("nan")
+    p = sukcesy / n
+    srodek = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margines = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return srodek - margines, srodek + margines
+
+
+class Statystyki:
+    """
+    Zbiorcze statystyki turnieju aktualizowane wynik po wyniku: dla każdej strategii, przeciwnika i parametrów plansz - ilość partii i wygranych oraz średnie ilości strzałów i tur potrzebnych do wygranej.
+    """
+
+    Wiersz = namedtuple("Wiersz", "strategia przeciwnik plansza partie wygrane strzaly tury")
+
+    def __init__(self):
+        self.wiersze = {}  # {(strategia, przeciwnik, plansza): Wiersz}
+        self.ilosc_partii = 0
+
+    def dodaj(self, wynik):
+        """Uwzględnij wynik partii w statystykach obu stron."""
+        self.ilosc_partii += 1
+        plansza = "{}x{} ({}%)".format(wynik.kolumny, wynik.rzedy, wynik.zapelnienie)
+        for strona in range(2):
+            klucz = (wynik.strategie[strona], wynik.strategie[1 - strona], plansza)
+            if klucz not in self.wiersze:
+                self.wiersze[klucz] = self.Wiersz(*klucz, [0], [0], Srednia(), Srednia())
+            wiersz = self.wiersze[klucz]
+            wiersz.partie[0] += 1
+            if wynik.zwyciezca == strona:
+                wiersz.wygrane[0] += 1
+                wiersz.strzaly.dodaj(wynik.strzaly)
+                wiersz.tury.dodaj(wynik.tury)
+
+    def podaj_tabele(self):
+        """Podaj tabelę statystyk jako tekst (wiersze posortowane wg strategii, przeciwnika i planszy)."""
+        naglowek = ("strategia", "przeciwnik", "plansza", "partie", "wygrane % (95% CI)", "strzały do wygranej",
+                    "tury do wygranej")
+        tabela = [naglowek]
+        for klucz in sorted(self.wiersze):
+            wiersz = self.wiersze[klucz]
+            partie, wygrane = wiersz.partie[0], wiersz.wygrane[0]
+            dolna, gorna = podaj_przedzial_wilsona(wygrane, partie)
+            tabela.append((
+                wiersz.strategia,
+                wiersz.przeciwnik,
+                wiersz.plansza,
+                str(partie),
+                "{:.1f} ({:.1f}-{:.1f})".format(100 * wygrane / partie, 100 * dolna, 100 * gorna),
+                wiersz.strzaly.podaj_opis(),
+                wiersz.tury.podaj_opis()
+            ))
+        szerokosci = [max(len(wiersz[i]) for wiersz in tabela) for i in range(len(naglowek))]
+        return "\n".join("  ".join(pole.ljust(szerokosc) for pole, szerokosc in zip(wiersz, szerokosci))
+                         for wiersz in tabela)
+
+
+def podaj_wymiary(tekst):
+    """Przetwórz wymiary planszy podane w formacie `[kolumny]x[rzędy]`."""
+    try:
+        kolumny, rzedy = (int(liczba) for liczba in tekst.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Wymiary planszy podaje się w formacie '[kolumny]x[rzędy]', np. 12x10.")
+    if kolumny not in range(Plansza.MIN_KOLUMNY, Plansza.MAX_KOLUMNY + 1) or rzedy not in range(
+            Plansza.MIN_RZEDY, Plansza.MAX_RZEDY + 1):
+        tekst_bledu = "Prawidłowe wymiary planszy to: {}-{} kolumn x {}-{} rzędów. Otrzymane wymiary: {} x {}."
+        raise argparse.ArgumentTypeError(tekst_bledu.format(
+            Plansza.MIN_KOLUMNY, Plansza.MAX_KOLUMNY, Plansza.MIN_RZEDY, Plansza.MAX_RZEDY, kolumny, rzedy))
+    return kolumny, rzedy
+
+
+def main(argumenty=None):
+    """Uruchom turniej wg argumentów wiersza poleceń i wypisz tabelę statystyk."""
+    parser = argparse.ArgumentParser(prog="python -m statki.turniej", description=__doc__.split("\n\n")[2].strip())
+    parser.add_argument("-s", "--strategie", nargs="+", choices=sorted(STRATEGIE), default=sorted(STRATEGIE),
+                        help="strategie biorące udział w turnieju (domyślnie wszystkie)")
+    parser.add_argument("-w", "--wymiary", nargs="+", type=podaj_wymiary, default=[(12, 10)],
+                        help="wymiary plansz w formacie [kolumny]x[rzędy] (domyślnie 12x10)")
+    parser.add_argument("-z", "--zapelnienie", nargs="+", type=int, default=[Plansza.ZAPELNIENIE],
+                        help="zapełnienie plansz statkami w procentach (domyślnie z danych gry)")
+    parser.add_argument("-n", "--partie", type=int, default=20,
+                        help="ilość partii dla każdej uporządkowanej pary strategii i parametrów plansz")
+    parser.add_argument("-p", "--procesy", type=int, default=None, help="ilość procesów (domyślnie ilość rdzeni)")
+    parser.add_argument("--ziarno", type=int, default=0, help="ziarno pierwszej partii")
+    parser.add_argument("--limit-rund", type=int, default=None, help="limit rund partii (łącznie obu stron)")
+    parser.add_argument("--co-ile", type=int, default=0,
+                        help="wypisuj tabelę pośrednią co wskazaną ilość partii (domyślnie tylko na koniec)")
+    argumenty = parser.parse_args(argumenty)
+    if len(argumenty.strategie) < 2:
+        parser.error("Turniej wymaga co najmniej dwóch strategii.")
+
+    zadania = podaj_zadania(argumenty.strategie, argumenty.wymiary, argumenty.zapelnienie, argumenty.partie,
+                            argumenty.ziarno, argumenty.limit_rund)
+    statystyki = Statystyki()
+    for wynik in rozegraj_turniej(zadania, argumenty.procesy):
+        statystyki.dodaj(wynik)
+        if argumenty.co_ile and statystyki.ilosc_partii % argumenty.co_ile == 0:
+            print("Rozegrane partie: {}\n{}\n".format(statystyki.ilosc_partii, statystyki.podaj_tabele()), flush=True)
+    print(statystyki.podaj_tabele())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+
+    testy.test_komunikaty
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Testy jednostkowe modułu 'statki.komunikaty'.
+
+"""
+
+import unittest
+
+from statki.komunikaty import BuforKomunikatu, Komunikator
+from statki.plansza import Plansza, Salwa
+
+
+class AtrapaPolaTekstowego:
+    """Atrapa pola tekstowego paska komunikatów - zapisuje wywołania metod edycji zamiast widżetu Tkintera."""
+
+    def __init__(self):
+        self.tekst = ""
+        self.wstawienia = []
+        self.przewiniecia = 0
+
+    def ro_insert(self, indeks, *segmenty):
+        self.wstawienia.append(segmenty)
+        tekst = "".join(segmenty[::2])
+        self.tekst = tekst + self.tekst if indeks == "1.0" else self.tekst + tekst
+
+    def see(self, indeks):
+        self.przewiniecia += 1
+
+    def index(self, indeks):
+        return "{}.{}".format(self.tekst.count("\n") + 1, len(self.tekst.split("\n")[-1]))
+
+
+class TestyBuforaKomunikatu(unittest.TestCase):
+    """Testy klasy 'statki.komunikaty.BuforKomunikatu'."""
+
+    def testuj_bufor__skladanie(self):
+        """Czy sąsiednie fragmenty o tych samych tagach są łączone, a usuwanie końca obejmuje kilka fragmentów?"""
+        bufor = BuforKomunikatu()
+        bufor.dopisz("Salwa ")
+        bufor.dopisz("w pola: ")
+        bufor.dopisz("(A1)", "pogrubione")
+        bufor.dopisz("")
+        bufor.dopisz(", ")
+        self.assertEqual(bufor.podaj_segmenty(), ["Salwa w pola: ", (), "(A1)", "pogrubione", ", ", ()])
+        bufor.usun_koniec(3)
+        self.assertEqual(bufor.podaj_segmenty(), ["Salwa w pola: ", (), "(A1", "pogrubione"])
+        self.assertEqual(bufor.podaj_tekst(), "Salwa w pola: (A1")
+
+    def testuj_bufor__zatwierdzanie(self):
+        """Czy zatwierdzenie zapisuje komunikat jednym wstawieniem i opróżnia bufor (pomijając pusty komunikat)?"""
+        bufor, pole_tekstowe = BuforKomunikatu(), AtrapaPolaTekstowego()
+        bufor.zatwierdz(pole_tekstowe)
+        self.assertEqual(pole_tekstowe.wstawienia, [])
+        bufor.dopisz("Zaczynamy", "pogrubione")
+        bufor.dopisz("!")
+        bufor.zatwierdz(pole_tekstowe)
+        self.assertEqual(pole_tekstowe.wstawienia, [("Zaczynamy", "pogrubione", "!", ())])
+        self.assertEqual(pole_tekstowe.przewiniecia, 1)
+        self.assertEqual(bufor.fragmenty, [])
+
+
+class TestyKomunikatora(unittest.TestCase):
+    """Testy klasy 'statki.komunikaty.Komunikator'."""
+
+    def setUp(self):
+        self.plansza = Plansza(10, 8, ziarno=3)
+        self.pole_tekstowe = AtrapaPolaTekstowego()
+        self.komunikator = Komunikator(self.pole_tekstowe)
+
+    def testuj_komunikator__jedno_wstawienie_na_komunikat(self):
+        """Czy każdy komunikat trafia do pola tekstowego jednym wstawieniem i jednym przewinięciem?"""
+        self.komunikator.o_rozpoczeciu_gry(self.plansza)
+        self.assertTrue(self.pole_tekstowe.tekst.startswith("Gra na planszy o rozmiarze: 10 kolumn x 8 rzędów"))
+        self.assertTrue(self.pole_tekstowe.tekst.endswith("). Zaczynamy!"))
+
+        napastnik, ofiara = self.plansza.statki[0], self.plansza.statki[-1]
+        kolumna, rzad = ofiara.polozenie.podaj_wspolrzedne()
+        sasiednie = self.plansza.podaj_pole(kolumna + 1 if kolumna < self.plansza.kolumny else kolumna - 1, rzad)
+        salwa = Salwa(napastnik.polozenie, sorted([ofiara.polozenie, sasiednie], key=lambda pole: pole.kolumna))
+        self.komunikator.o_salwie(salwa, napastnik)
+        self.komunikator.o_zatopieniu(ofiara, napastnik)
+        self.assertEqual(len(self.pole_tekstowe.wstawienia), 3)
+        self.assertEqual(self.pole_tekstowe.przewiniecia, 3)
+        linie = self.pole_tekstowe.tekst.split("\n")
+        self.assertTrue(linie[1].endswith("salwę w pola: {} i {}".format(*[pole.str_w_nawiasach() for pole in salwa.pola])))
+        self.assertTrue(linie[2].startswith("Statek przeciwnika, " + str(ofiara).split('"')[0] + '"'))
+        self.assertIn(", został zatopiony przez " + napastnik.RANGA_BAZOWA.biernik, linie[2])
@@ -0,0 +1,340 @@
+"""
+
+    testy.test_mechanika
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Testy jednostkowe modułu 'statki.mechanika'.
+
+"""
+
+import pickle
+import unittest
+from copy import deepcopy
+from random import Random
+
+from statki.plansza import Plansza, Salwa
+from statki.mechanika import Gra, MigawkiPlanszy, AI, MocneAI, PokryciaSalw, Rozgrywka
+
+
+def podaj_stan_planszy(plansza):
+    """Podaj stan planszy: znaczniki wszystkich pól, zatopione statki, ilość nietrafionych pól i siłę ognia statków."""
+    znaczniki = "".join(pole.znacznik for rzad in plansza.pola for pole in rzad)
+    zatopione = [str(statek) for statek in plansza.zatopione]
+    sila_ognia = [statek.sila_ognia for statek in plansza.statki]
+    return znaczniki, zatopione, plansza.podaj_ilosc_nietrafionych_pol(), sila_ognia
+
+
+def podaj_kopie_planszy(plansza):
+    """Podaj pełną kopię planszy - razem z ofiarami statków, pomijanymi przy kopiowaniu."""
+    kopia = deepcopy(plansza)
+    for statek_kopii, statek in zip(kopia.statki, plansza.statki):
+        statek_kopii.ofiary = statek.ofiary[:]
+    return kopia
+
+
+class TestyMigawekPlanszy(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.MigawkiPlanszy'."""
+
+    def testuj_migawki__odtwarzanie(self):
+        """
+        Czy migawki odtworzone z punktów kontrolnych (bez dziennika i ofiar), dziennika zmian i ilości ofiar odpowiadają pełnym kopiom planszy zrobionym w tym samym czasie?
+        """
+        przeciwnik = Plansza(12, 10, ziarno=6)
+        for magazyn in ["pola", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = Plansza(12, 10, magazyn, ziarno=5)
+                migawki = MigawkiPlanszy(plansza)
+                kopie = [podaj_kopie_planszy(plansza)]
+                ofiary = [[0] * len(plansza.statki)]
+                pola = [pole for rzad in plansza.pola for pole in rzad]
+                for runda in range(20):
+                    plansza.odkryj_pola(pola[runda * 6:(runda + 1) * 6])
+                    plansza.oznacz_zatopione()
+                    if runda % 3 == 0:
+                        plansza.statki[-1].dodaj_ofiare(przeciwnik.statki[runda % len(przeciwnik.statki)])
+                    migawki.dodaj()
+                    kopie.append(podaj_kopie_planszy(plansza))
+                    ofiary.append([len(statek.ofiary) for statek in plansza.statki])
+
+                self.assertEqual(len(migawki), len(kopie))
+                for numer, kopia in enumerate(kopie):
+                    migawka = migawki[numer]
+                    self.assertEqual(podaj_stan_planszy(migawka), podaj_stan_planszy(kopia))
+                    self.assertEqual([len(statek.ofiary) for statek in migawka.statki], ofiary[numer])
+                for zserializowana in migawki.punkty_kontrolne.values():
+                    punkt_kontrolny = pickle.loads(zserializowana)
+                    self.assertEqual(punkt_kontrolny.dziennik, [])
+                    self.assertTrue(all(statek.ofiary == [] for statek in punkt_kontrolny.statki))
+                self.assertEqual(podaj_stan_planszy(migawki[-1]), podaj_stan_planszy(plansza))
+                self.assertEqual(len(migawki[3:12]), 9)
+                with self.assertRaises(IndexError):
+                    migawki[len(kopie)]
+
+
+class TestyMocnegoAI(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.MocneAI' i jej mapy gęstości."""
+
+    def testuj_mocne_ai__mapa_gestosci(self):
+        """
+        Czy mapa gęstości odpowiada przechowywanym próbkom i czy próbki to całe floty zgodne z rozpoznaniem (pokrywające front, ze statkami nie stykającymi się ze sobą)?
+        """
+        plansza_gracza = Plansza(12, 10, ziarno=2)
+        ai = MocneAI(Plansza(12, 10, ziarno=1), plansza_gracza, ziarno=3)
+        Rozgrywka(ai, Gra(plansza_gracza))  # AI zaczyna, a ruch nie jest przekazywany - gracz się nie broni
+        mapa, rozpoznanie = ai.mapa_gestosci, ai.druga_plansza
+        for ruch in range(6):
+            ai.zrob_ruch()
+            mapa.aktualizuj()
+            with self.subTest(ruch=ruch):
+                self.assertTrue(0 < len(mapa.probki) <= mapa.LIMIT_PROBEK)
+                gestosci = [0] * rozpoznanie.rozmiar
+                for _, indeksy in mapa.probki:
+                    self.assertTrue(rozpoznanie.front <= set(indeksy))
+                    for indeks in indeksy:
+                        gestosci[indeks] += 1
+                        self.assertTrue(mapa.czy_dozwolone(indeks))
+                    # statki nie stykają się nawet na ukos, więc każdy statek próbki to osobne skupisko pól
+                    pozostale, skupiska = set(indeksy), 0
+                    while pozostale:
+                        skupiska += 1
+                        do_sprawdzenia = [pozostale.pop()]
+                        while do_sprawdzenia:
+                            for sasiad in rozpoznanie.sasiedztwo.wszystkie[do_sprawdzenia.pop()]:
+                                if sasiad in pozostale:
+                                    pozostale.remove(sasiad)
+                                    do_sprawdzenia.append(sasiad)
+                    self.assertEqual(skupiska, len(rozpoznanie.plansza.niezatopione))
+                self.assertEqual(mapa.gestosci, gestosci)
+
+    def testuj_mocne_ai__zatopienie_floty(self):
+        """Czy mocne AI zatapia całą flotę gracza, a przy tym samym ziarnie rozgrywa partię identycznie?"""
+        przebiegi = []
+        for _ in range(2):
+            plansza_gracza = Plansza(12, 10, ziarno=2)
+            ai = MocneAI(Plansza(12, 10, ziarno=1), plansza_gracza, ziarno=3)
+            Rozgrywka(ai, Gra(plansza_gracza))
+            ruchy = 0
+            while plansza_gracza.niezatopione and ruchy < 120:
+                ai.zrob_ruch()
+                ruchy += 1
+            self.assertEqual(plansza_gracza.niezatopione, [])
+            przebiegi.append([[(pole.kolumna, pole.rzad) for pole in salwa.pola] for tura in ai.tury for runda in tura.rundy for salwa in runda.salwy_oddane])
+        self.assertEqual(*przebiegi)
+
+
+class TestyPokryciaSalw(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.PokryciaSalw'."""
+
+    def testuj_pokrycia__zgodnosc_z_konfiguracjami_pol(self):
+        """
+        Czy pokrycia i oceny salw dla wszystkich par (cel, orientacja) zgadzają się z konfiguracjami pól składanymi cel po celu?
+        """
+        ai = AI(Plansza(9, 8, ziarno=1), Plansza(9, 8, ziarno=2), ziarno=3)
+        pokrycia = PokryciaSalw.podaj_pokrycia(9, 8)
+        self.assertIs(pokrycia, PokryciaSalw.podaj_pokrycia(9, 8))
+        los = Random(4)
+        wagi = [los.randint(0, 9) for _ in range(9 * 8)]
+        for orientacja in Salwa.ORIENTACJE:
+            oceny = pokrycia.ocen(wagi, orientacja)
+            for indeks, pole in enumerate(ai.druga_plansza.magazyn.podaj_pole(i) for i in range(9 * 8)):
+                with self.subTest(orientacja=orientacja, indeks=indeks):
+                    konfiguracja_pol = ai.podaj_konfiguracje_pol(pole, ai.KIERUNKI_SALWY[orientacja])
+                    indeksy = [None if p is None else ai.druga_plansza.podaj_indeks(p.kolumna, p.rzad)
+                               for p in konfiguracja_pol]
+                    self.assertEqual(pokrycia.podaj_indeksy(indeks, orientacja), indeksy)
+                    self.assertEqual(oceny[indeks], sum(wagi[i] for i in indeksy if i is not None))
+
+    def testuj_pokrycia__wybor_najlepszych(self):
+        """Czy wybrane salwy są najlepsze, uporządkowane od najlepszej i ograniczone do wskazanych celów?"""
+        pokrycia = PokryciaSalw.podaj_pokrycia(9, 8)
+        wagi = [0] * (9 * 8)
+        wagi[10], wagi[11], wagi[12] = 5, 4, 1
+        najlepsze = pokrycia.wybierz_najlepsze(wagi, 3, k=3)
+        self.assertEqual(najlepsze[0].ocena, 10)
+        self.assertEqual(sorted(najlepsze[0].indeksy), [10, 11, 12])
+        self.assertEqual([salwa.ocena for salwa in najlepsze], sorted((salwa.ocena for salwa in najlepsze), reverse=True))
+        cel = pokrycia.wybierz_najlepsze(wagi, 1, cele=[12])[0]
+        self.assertEqual((cel.ocena, cel.indeksy, cel.orientacja), (1, [12], Salwa.ORIENTACJE.C))
+
+    def testuj_pokrycia__wybor_dla_celu(self):
+        """Czy salwa wybrana dla jednego celu jest tą samą, którą wybiera ocena wszystkich celów planszy?"""
+        pokrycia = PokryciaSalw.podaj_pokrycia(9, 8)
+        los = Random(5)
+        wagi = [los.randint(0, 3) for _ in range(9 * 8)]
+        for wielkosc_salwy in range(1, 4):
+            for indeks in range(9 * 8):
+                with self.subTest(wielkosc_salwy=wielkosc_salwy, indeks=indeks):
+                    self.assertEqual(pokrycia.wybierz_najlepsza_dla_celu(wagi.__getitem__, indeks, wielkosc_salwy),
+                                     pokrycia.wybierz_najlepsze(wagi, wielkosc_salwy, cele=[indeks])[0])
+
+
+class TestyAI(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.AI'."""
+
+    def testuj_ai__celowanie(self):
+        """
+        Czy AI zatapia całą flotę gracza, a punkty przylegania skupisk trafień są liczone od nowa tylko dla skupisk zmienionych ostatnimi salwami?
+        """
+        plansza_gracza = Plansza(12, 10, ziarno=2)
+        ai = AI(Plansza(12, 10, ziarno=1), plansza_gracza, ziarno=3)
+        Rozgrywka(ai, Gra(plansza_gracza))  # AI zaczyna, a ruch nie jest przekazywany - gracz się nie broni
+        celuj = ai.celuj
+        ponownie_uzyte = []
+
+        def sledz_celowanie():
+            poprzednie = dict(ai.przyleganie)
+            celuj()
+            for skupisko, przyleganie in ai.przyleganie.items():
+                self.assertEqual(przyleganie, ai.podaj_przyleganie(skupisko))
+                if skupisko in poprzednie:
+                    self.assertIs(przyleganie, poprzednie[skupisko])
+                    ponownie_uzyte.append(skupisko)
+
+        ai.celuj = sledz_celowanie
+        ruchy = 0
+        while plansza_gracza.niezatopione and ruchy < 200:
+            ai.zrob_ruch()
+            ruchy += 1
+        self.assertEqual(plansza_gracza.niezatopione, [])
+        self.assertTrue(ponownie_uzyte)
+
+
+class TestyRozgrywki(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.Rozgrywka'."""
+
+    def testuj_rozgrywke__ai_przeciwko_ai(self):
+        """Czy rozgrywka dwóch AI kończy się zatopieniem całej floty przegranego, przy zachowaniu kolejności ruchów?"""
+        plansze = Plansza(12, 10, ziarno=1), Plansza(12, 10, ziarno=2)
+        rozgrywka = Rozgrywka(AI(plansze[0], plansze[1], ziarno=3), MocneAI(plansze[1], plansze[0], ziarno=4))
+        zwyciezca = rozgrywka.rozegraj()
+        przegrany = rozgrywka.strony[1 - rozgrywka.strony.index(zwyciezca)]
+        self.assertEqual(przegrany.plansza.niezatopione, [])
+        self.assertNotEqual(zwyciezca.plansza.niezatopione, [])
+        self.assertIs(rozgrywka.podaj_atakujacego(), zwyciezca)
+        rundy = [[runda for tura in gra.tury for runda in tura.rundy if runda.salwy_oddane] for gra in rozgrywka.strony]
+        self.assertEqual(len(rundy[0]) + len(rundy[1]), rozgrywka.ilosc_rund)
+        self.assertIn(len(rundy[0]) - len(rundy[1]), (0, 1))
+        self.assertIs(rozgrywka.strony[1].tury[0].rundy[0].salwy_otrzymane,
+                      rozgrywka.strony[0].tury[0].rundy[0].salwy_oddane)
+        for gra in rozgrywka.strony:
+            with self.subTest(gra=type(gra).__name__):
+                ofiary = [ofiara for statek in gra.plansza.statki for ofiara in statek.ofiary]
+                self.assertEqual(len(ofiary), len(gra.ofiary))
+                self.assertEqual(sorted(map(id, ofiary)), sorted(map(id, gra.druga_plansza.zatopione)))
+
+    def testuj_rozgrywke__salwy_przekazane_po_rundzie(self):
+        """
+        Czy rozegranie rundy zwraca jej salwy - również wtedy, gdy zatopienie ostatniego napastnika tury broniącego się zaczyna jego nową turę?
+        """
+        plansze = Plansza(12, 10, ziarno=11), Plansza(12, 10, ziarno=111)
+        rozgrywka = Rozgrywka(AI(plansze[0], plansze[1], ziarno=3), AI(plansze[1], plansze[0], ziarno=4))
+        przekazane = ([], [])
+        nowe_tury = 0
+        while not rozgrywka.czy_koniec():
+            ruch, broniacy = rozgrywka.ruch, rozgrywka.podaj_broniacego()
+            tura = broniacy.tura
+            salwy = rozgrywka.rozegraj_runde()
+            self.assertTrue(salwy)
+            if broniacy.tura is not tura:  # nowa runda broniącego się nie zawiera salw otrzymanych w poprzedniej
+                self.assertEqual(broniacy.tura.runda.salwy_otrzymane, [])
+                nowe_tury += 1
+            przekazane[ruch].extend(salwy)
+        self.assertGreater(nowe_tury, 0)
+        for gra, salwy in zip(rozgrywka.strony, przekazane):
+            oddane = [salwa for tura in gra.tury for runda in tura.rundy for salwa in runda.salwy_oddane]
+            self.assertEqual(list(map(id, salwy)), list(map(id, oddane)))
+
+    def testuj_rozgrywke__salwy_strony_sterowanej_z_zewnatrz(self):
+        """Czy salwy gracza są rozstrzygane na planszy przeciwnika, a po zakończeniu rundy ruch przechodzi na przeciwnika?"""
+        gracz, przeciwnik = Gra(Plansza(12, 10, ziarno=1)), Gra(Plansza(12, 10, ziarno=2))
+        rozgrywka = Rozgrywka(gracz, przeciwnik)
+        statek = przeciwnik.plansza.statki[-1]
+        with self.assertRaises(ValueError):
+            rozgrywka.oddaj_salwe(1, 1, "nieznana orientacja")
+
+        zatopione = []
+        for pole in statek.pola:
+            if len(gracz.tura.runda.sila_ognia) == 0:
+                rozgrywka.zakoncz_runde()
+                rozgrywka.rozegraj_runde()  # przeciwnik bez własnej logiki ruchu kończy rundę bez salw
+            orientacja = PokryciaSalw.ORIENTACJE_WG_WIELKOSCI[gracz.tura.runda.sila_ognia[0]][0]
+            salwa, zatopione_salwa = rozgrywka.oddaj_salwe(pole.kolumna, pole.rzad, orientacja)
+            self.assertIn(True, salwa.trafienia)
+            zatopione.extend(zatopione_salwa)
+        self.assertIn(statek, zatopione)
+        self.assertTrue(statek.czy_zatopiony())
+        self.assertEqual(przeciwnik.plansza.podaj_ilosc_nietrafionych_pol(),
+                         przeciwnik.plansza.ilosc_pol_statkow - sum(s.rozmiar for s in zatopione) -
+                         sum(s.ile_otrzymanych_trafien() for s in przeciwnik.plansza.niezatopione))
+        self.assertIs(rozgrywka.podaj_atakujacego(), gracz)
+        rozgrywka.zakoncz_runde()
+        self.assertIs(rozgrywka.podaj_atakujacego(), przeciwnik)
+
+    def testuj_rozgrywke__koniec_gry(self):
+        """Czy po zatopieniu ostatniego statku przeciwnika atak w rundzie jest zablokowany, a kolejna salwa odrzucona?"""
+        gracz, przeciwnik = Gra(Plansza(12, 10, ziarno=1)), Gra(Plansza(12, 10, ziarno=2))
+        rozgrywka = Rozgrywka(gracz, przeciwnik)
+        for statek in przeciwnik.plansza.statki[:-1]:
+            przeciwnik.plansza.zatop_statek(statek)
+        ostatni = przeciwnik.plansza.statki[-1]
+        for pole in ostatni.pola:
+            if len(gracz.tura.runda.sila_ognia) == 0:
+                rozgrywka.zakoncz_runde()
+                rozgrywka.rozegraj_runde()
+            gracz.tura.runda.napastnik.dodaj_ofiare(przeciwnik.plansza.zatopione[0])  # premiowa salwa zostaje w zapasie
+            orientacja = PokryciaSalw.ORIENTACJE_WG_WIELKOSCI[gracz.tura.runda.sila_ognia[0]][0]
+            salwa, zatopione = rozgrywka.oddaj_salwe(pole.kolumna, pole.rzad, orientacja)
+            if rozgrywka.czy_koniec():
+                break
+
+        self.assertEqual(zatopione, [ostatni])
+        self.assertIs(rozgrywka.zwyciezca, gracz)
+        self.assertTrue(gracz.tura.runda.sila_ognia)
+        self.assertFalse(gracz.tura.runda.mozna_atakowac)
+        with self.assertRaises(ValueError):
+            rozgrywka.oddaj_salwe(pole.kolumna, pole.rzad, PokryciaSalw.ORIENTACJE_WG_WIELKOSCI[1][0])
+
+    def testuj_rozgrywke__salwy_ai_przez_silnik(self):
+        """Czy salwy AI są rozstrzygane przez silnik rozgrywki, a rozpoznanie AI poznaje ich wynik i obwiednie zatopionych statków?"""
+        plansza_gracza = Plansza(12, 10, ziarno=2)
+        ai = AI(Plansza(12, 10, ziarno=1), plansza_gracza, ziarno=3)
+        rozgrywka = Rozgrywka(ai, Gra(plansza_gracza))
+        oddane = []
+        oddaj_salwe = rozgrywka.oddaj_salwe
+        rozgrywka.oddaj_salwe = lambda *argumenty: oddane.append(argumenty) or oddaj_salwe(*argumenty)
+        while plansza_gracza.niezatopione:
+            ai.zrob_ruch()
+        salwy = [salwa for tura in ai.tury for runda in tura.rundy for salwa in runda.salwy_oddane]
+        self.assertEqual(len(oddane), len(salwy))
+        for pole in (pole for salwa in salwy for pole in salwa.pola if pole is not None):
+            self.assertEqual(ai.druga_plansza.podaj_pole(pole.kolumna, pole.rzad).znacznik, pole.znacznik)
+        for statek in plansza_gracza.statki:
+            for pole in statek.obwiednia:
+                self.assertIn(ai.druga_plansza.podaj_pole(pole.kolumna, pole.rzad).znacznik, "x.")
+        self.assertEqual(ai.druga_plansza.zatopione, plansza_gracza.zatopione)
+
+
+class TestyRundy(unittest.TestCase):
+    """Testy klasy 'statki.mechanika.Runda'."""
+
+    def testuj_runde__biezaca_sila_ognia(self):
+        """Czy runda podaje siłę ognia napastnika bieżącą (po trafieniach) i pomniejszoną o oddane salwy?"""
+        plansza = Plansza(26, 30, ziarno=1)
+        gra = Gra(plansza)
+        napastnik = gra.tura.runda.napastnik
+        self.assertEqual(gra.tura.runda.sila_ognia, napastnik.RANGA_BAZOWA.sila_ognia)
+        plansza.odkryj_pola(napastnik.pola[:napastnik.rozmiar - napastnik.RANGA_BAZOWA.zakres[0] + 1])
+        self.assertEqual(gra.tura.runda.sila_ognia, napastnik.ranga.sila_ognia)
+        self.assertNotEqual(napastnik.ranga, napastnik.RANGA_BAZOWA)
+        wielkosc_salwy = gra.tura.runda.sila_ognia[0]
+        gra.tura.runda.dodaj_salwe_oddana(Salwa(napastnik.polozenie, plansza.pola[0][:wielkosc_salwy]))
+        self.assertEqual(gra.tura.runda.sila_ognia, napastnik.ranga.sila_ognia[1:])
+        for wielkosc_salwy in gra.tura.runda.sila_ognia:
+            gra.tura.runda.dodaj_salwe_oddana(Salwa(napastnik.polozenie, plansza.pola[1][:wielkosc_salwy]))
+        self.assertEqual(gra.tura.runda.sila_ognia, [])
+        with self.assertRaises(ValueError):
+            gra.tura.runda.dodaj_salwe_oddana(Salwa(napastnik.polozenie, plansza.pola[2][:1]))
+        self.assertEqual(sum(gra.tura.runda.zuzyte_salwy.values()), len(gra.tura.runda.salwy_oddane))
+        napastnik.dodaj_ofiare(plansza.statki[-1])  # premiowa salwa dostępna jeszcze w tej rundzie
+        self.assertEqual(gra.tura.runda.sila_ognia, [napastnik.SALWA_ZA_OFIARE])
+        self.assertEqual(gra.tura.runda.podaj_ilosc_salw(napastnik.SALWA_ZA_OFIARE), 1)
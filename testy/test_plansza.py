@@ -7,20 +7,26 @@
 
 """
 
+import io
 import unittest
+import pickle
+from contextlib import redirect_stdout
+from copy import deepcopy
+from random import Random
 
-from statki.plansza import Plansza, Pole, Salwa, Statek
+from statki.plansza import Plansza, Pole, Salwa, Statek, Rozpoznanie
 
 # TODO: testy funkcji tego modułu
 
 
-def podaj_pusta_plansze(kolumny, rzedy):
+def podaj_pusta_plansze(kolumny, rzedy, magazyn="pola"):
     """Podaj pustą planszę."""
-    plansza = Plansza(kolumny, rzedy)
+    plansza = Plansza(kolumny, rzedy, magazyn)
     for rzad in plansza.pola:
         for pole in rzad:
             pole.znacznik = Pole.ZNACZNIKI.pusty
     plansza.statki, plansza.niezatopione, plansza.zatopione = [], [], []
+    plansza.statki_wg_wspolrzednych = {}
     plansza.ilosc_pol_statkow = 0
     return plansza
 
@@ -36,7 +42,9 @@ def stworz_statek(plansza, *wspolrzedne):
             raise ValueError("Błąd tworzenia statku. Podano współrzędne pól spoza planszy.")
         pole.znacznik = Pole.ZNACZNIKI.statek
 
-    return Statek.fabryka(pola_statku)
+    statek = Statek.fabryka(pola_statku)
+    plansza.zarejestruj_statek(statek)
+    return statek
 
 
 def stworz_salwe(plansza, zrodlo, *wspolrzedne):
@@ -140,6 +148,296 @@ class TestyPlanszy(unittest.TestCase):
                     self.plansza.sprawdz_pola_statku(statek)
 
 
+    def testuj_plansze__rozmieszczenie_statkow(self):
+        """
+        Czy obie strategie rozmieszczenia umieszczają prawidłowe statki o sumarycznym rozmiarze wynikającym z zapełnienia?
+        """
+        for rozmieszczenie in ["obszary", "losowe"]:
+            with self.subTest(rozmieszczenie=rozmieszczenie):
+                plansza = Plansza(26, 30, rozmieszczenie=rozmieszczenie)
+                self.assertEqual(plansza.ilosc_pol_statkow, int(plansza.rozmiar * plansza.ZAPELNIENIE / 100))
+                self.assertEqual(plansza.podaj_ilosc_nietrafionych_pol(), plansza.ilosc_pol_statkow)
+                self.assertEqual(plansza.niedobor, 0)
+                for statek in plansza.statki:
+                    plansza.sprawdz_pola_statku(statek)
+        with self.assertRaises(ValueError):
+            Plansza(10, 10, rozmieszczenie="spiralne")
+
+    def testuj_plansze__rozmieszczenie_wg_obszarow_przy_duzym_zapelnieniu(self):
+        """
+        Czy przy dużym zapełnieniu statki umieszczane są tylko na pustych polach i nie stykają się ze sobą, a brak miejsca na pozostałe statki jest zapisany w planszy?
+        """
+        plansza = podaj_pusta_plansze(26, 30)
+        plansza.rozmiesc_statki_wg_obszarow(60, 9.5, -12)
+        umieszczone = sum(statek.rozmiar for statek in plansza.statki)
+        self.assertGreater(plansza.niedobor, 0)
+        self.assertEqual(umieszczone + plansza.niedobor, int(plansza.rozmiar * 60 / 100))
+        for statek in plansza.statki:
+            with self.subTest(statek=str(statek)):
+                plansza.sprawdz_pola_statku(statek)
+                for pole in statek.obwiednia:
+                    self.assertIsNone(plansza.podaj_statek(pole))
+
+    def testuj_plansze__niedobor_przy_losowym_rozmieszczeniu(self):
+        """
+        Czy losowe rozmieszczenie przerwane limitem iteracji zapisuje brak miejsca w planszy, nie pisząc nic na standardowe wyjście?
+        """
+        plansza = podaj_pusta_plansze(12, 10)
+        plansza.los = Random(1)
+        wyjscie = io.StringIO()
+        with redirect_stdout(wyjscie):
+            plansza.rozmiesc_statki_losowo(60, 9.5, -12)
+        umieszczone = sum(statek.rozmiar for statek in plansza.statki)
+        self.assertEqual(wyjscie.getvalue(), "")
+        self.assertGreater(plansza.niedobor, 0)
+        self.assertEqual(umieszczone + plansza.niedobor, int(plansza.rozmiar * 60 / 100))
+
+    def testuj_plansze__ziarno(self):
+        """
+        Czy plansze wygenerowane z tym samym ziarnem są identyczne, a z różnymi - różne?
+        """
+        def podaj_opis_planszy(ziarno, rozmieszczenie):
+            plansza = Plansza(26, 30, rozmieszczenie=rozmieszczenie, ziarno=ziarno)
+            znaczniki = "".join(pole.znacznik for rzad in plansza.pola for pole in rzad)
+            return znaczniki, [str(statek) for statek in plansza.statki]
+
+        for rozmieszczenie in ["obszary", "losowe"]:
+            with self.subTest(rozmieszczenie=rozmieszczenie):
+                self.assertEqual(podaj_opis_planszy(1, rozmieszczenie), podaj_opis_planszy(1, rozmieszczenie))
+                self.assertNotEqual(podaj_opis_planszy(1, rozmieszczenie), podaj_opis_planszy(2, rozmieszczenie))
+
+    def testuj_plansze__wlasne_pule_nazw(self):
+        """
+        Czy flota planszy zależy tylko od jej ziarna, a nie od nazw wylosowanych wcześniej na innych planszach?
+        """
+        def podaj_flote(plansza):
+            return [(statek.nazwa, [pole.podaj_wspolrzedne() for pole in statek.pola]) for statek in plansza.statki]
+
+        flota = podaj_flote(Plansza(12, 12, ziarno=5))
+        Plansza(26, 30, ziarno=6)
+        Statek.fabryka([Pole(0, 1, 1)])  # statek spoza planszy losuje nazwę ze wspólnej puli rangi
+        self.assertEqual(podaj_flote(Plansza(12, 12, ziarno=5)), flota)
+
+    def testuj_plansze__nieprawidlowy_magazyn(self):
+        """
+        Czy próba stworzenia planszy z nieznanym rodzajem magazynu zwraca odpowiedni błąd?
+        """
+        with self.assertRaises(ValueError):
+            Plansza(10, 10, "tablica")
+
+    def testuj_plansze__magazyny(self):
+        """
+        Czy plansze z magazynem bitowym i bajtowym odkrywają, zatapiają i zliczają pola tak samo jak plansza z domyślnym magazynem?
+        """
+        for magazyn in ["pola", "bity", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = podaj_pusta_plansze(12, 10, magazyn)
+                patrolowiec = stworz_statek(plansza, (2, 2), (2, 3))
+                korweta = stworz_statek(plansza, (6, 6), (7, 6), (8, 6), (8, 7))
+                plansza.statki = [korweta, patrolowiec]
+                plansza.niezatopione = plansza.statki[:]
+                plansza.ilosc_pol_statkow = 6
+
+                plansza.odkryj_pola([plansza.podaj_pole(2, 2), plansza.podaj_pole(5, 5),
+                                     plansza.podaj_pole(6, 6)])
+                self.assertEqual(plansza.podaj_pole(2, 2).znacznik, Pole.ZNACZNIKI.trafiony)
+                self.assertEqual(plansza.podaj_pole(5, 5).znacznik, Pole.ZNACZNIKI.pudlo)
+                self.assertEqual(plansza.podaj_ilosc_nietrafionych_pol(), 4)
+                self.assertTrue(plansza.czy_sa_trafione_pola())
+                self.assertEqual(len(plansza.podaj_nieodwiedzone_pola()), 12 * 10 - 3)
+
+                plansza.odkryj_pola([plansza.podaj_pole(2, 3)])
+                plansza.oznacz_zatopione()
+                self.assertEqual(plansza.zatopione, [patrolowiec])
+                self.assertEqual(plansza.niezatopione, [korweta])
+                self.assertEqual(plansza.podaj_pole(2, 3).znacznik, Pole.ZNACZNIKI.zatopiony)
+                self.assertEqual(plansza.podaj_ilosc_nietrafionych_pol(), 3)
+
+
+    def testuj_plansze__liczniki_trafien(self):
+        """
+        Czy liczniki trafień planszy i statków zgadzają się ze znacznikami pól niezależnie od sposobu odkrycia pól?
+        """
+        for magazyn in ["pola", "bity", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = Plansza(26, 30, magazyn)
+                statek, drugi_statek = plansza.statki[:2]
+                plansza.odkryj_pola(statek.pola[:1] + statek.obwiednia)
+                plansza.odkryj_pola(statek.pola[:1])  # ponowne odkrycie nie zmienia liczników
+                self.assertEqual(statek.ile_otrzymanych_trafien(), 1)
+                self.assertFalse(statek.czy_zatopiony())
+                plansza.zatop_statek(drugi_statek)
+                self.assertTrue(drugi_statek.czy_zatopiony())
+                self.assertEqual(plansza.zatopione, [drugi_statek])
+                self.assertEqual(
+                    plansza.podaj_ilosc_nietrafionych_pol(),
+                    plansza.magazyn.policz(Pole.ZNACZNIKI.statek)
+                )
+                plansza.odkryj_pola(statek.pola)
+                plansza.oznacz_zatopione()
+                self.assertEqual(plansza.zatopione, [drugi_statek, statek])
+                self.assertEqual(statek.podaj_nietrafione_na_rozmiar(), "0/" + str(statek.rozmiar))
+                self.assertEqual(
+                    plansza.podaj_ilosc_nietrafionych_pol(),
+                    plansza.magazyn.policz(Pole.ZNACZNIKI.statek)
+                )
+
+    def testuj_plansze__serializacja(self):
+        """
+        Czy plansza odtworzona z serializacji ma te same znaczniki pól i te same statki co oryginał?
+        """
+        for magazyn in ["pola", "bity", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = Plansza(26, 30, magazyn)
+                odtworzona = pickle.loads(pickle.dumps(plansza))
+                self.assertEqual(
+                    [pole.znacznik for rzad in odtworzona.pola for pole in rzad],
+                    [pole.znacznik for rzad in plansza.pola for pole in rzad]
+                )
+                self.assertEqual([str(statek) for statek in odtworzona.statki],
+                                 [str(statek) for statek in plansza.statki])
+                statek = odtworzona.statki[0]
+                self.assertIs(odtworzona.podaj_statek(statek.polozenie), statek)
+
+    def testuj_plansze__niezaleznosc_kopii(self):
+        """
+        Czy odkrycie pól na kopii planszy nie zmienia oryginału?
+        """
+        for magazyn in ["pola", "bity", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = Plansza(12, 12, magazyn)
+                kopia = deepcopy(plansza)
+                kopia.odkryj_pola(kopia.statki[0].pola)
+                self.assertEqual(kopia.statki[0].ile_otrzymanych_trafien(), kopia.statki[0].rozmiar)
+                self.assertEqual(plansza.statki[0].ile_otrzymanych_trafien(), 0)
+
+    def testuj_plansze__matryca_pol(self):
+        """
+        Czy matryca pól jest tworzona raz na planszę, pokazuje bieżące znaczniki, a kopia planszy ma własną matrycę?
+        """
+        for magazyn in ["pola", "bity", "bajty"]:
+            with self.subTest(magazyn=magazyn):
+                plansza = Plansza(12, 12, magazyn)
+                pola = plansza.pola
+                self.assertIs(plansza.pola, pola)
+                statek = plansza.statki[0]
+                plansza.odkryj_pola(statek.pola[:1])
+                kolumna, rzad = statek.pola[0].podaj_wspolrzedne()
+                self.assertEqual(pola[rzad - 1][kolumna - 1].znacznik, Pole.ZNACZNIKI.trafiony)
+                kopia = deepcopy(plansza)
+                self.assertIsNot(kopia.pola, pola)
+                self.assertIs(kopia.pola[rzad - 1][kolumna - 1], kopia.podaj_pole(kolumna, rzad))
+
+    def testuj_plansze__leniwe_widoki_pol(self):
+        """
+        Czy plansza z magazynem bajtowym tworzy widoki tylko tych pól, do których się odwołano?
+        """
+        plansza = Plansza(26, 30, "bajty")
+        self.assertLess(len(plansza.magazyn.widoki), plansza.rozmiar)
+        pole = plansza.podaj_pole(1, 1)
+        self.assertIs(plansza.podaj_pole(1, 1), pole)
+
+    def testuj_plansze__podawanie_statku(self):
+        """
+        Czy statek jest prawidłowo podawany na podstawie każdego swojego pola (również w postaci stringa)?
+        """
+        plansza = Plansza(26, 30)
+        for statek in plansza.statki:
+            for pole in statek.pola:
+                with self.subTest(pole=str(pole)):
+                    self.assertIs(plansza.podaj_statek(pole), statek)
+                    self.assertIs(plansza.podaj_statek(str(pole), tryb="str"), statek)
+        for pole in plansza.statki[0].obwiednia:
+            with self.subTest(pole=str(pole)):
+                self.assertIsNone(plansza.podaj_statek(pole))
+                self.assertIsNone(plansza.podaj_statek(str(pole), tryb="str"))
+
+    def testuj_plansze__sasiedztwo(self):
+        """
+        Czy tablice sąsiedztwa są wspólne dla plansz tej samej wielkości i podają te same pola co współrzędne?
+        """
+        plansza = Plansza(12, 15)
+        self.assertIs(plansza.sasiedztwo, Plansza(12, 15).sasiedztwo)
+        self.assertIs(deepcopy(plansza).sasiedztwo, plansza.sasiedztwo)
+        for rzad in plansza.pola:
+            for pole in rzad:
+                for kierunek, (przesuniecie_kolumny, przesuniecie_rzedu) in zip(Plansza.KIERUNKI, Plansza.PRZESUNIECIA):
+                    with self.subTest(pole=str(pole), kierunek=kierunek):
+                        self.assertEqual(
+                            plansza.podaj_sasiednie_pole(pole, kierunek),
+                            plansza.podaj_pole(pole.kolumna + przesuniecie_kolumny, pole.rzad + przesuniecie_rzedu)
+                        )
+
+    def testuj_plansze__czyszczenie_nieudanego_umieszczenia(self):
+        """Czy nieudana próba umieszczenia statku nie zostawia na planszy pól statku?"""
+        plansza = podaj_pusta_plansze(12, 15)
+        for rzad in plansza.pola:
+            for pole in rzad:
+                if pole.kolumna > 2 or pole.rzad > 2:
+                    pole.znacznik = Pole.ZNACZNIKI.obwiednia
+        self.assertIsNone(plansza.umiesc_statek(1, 1, 5))
+        self.assertEqual(plansza.podaj_ilosc_nietrafionych_pol(), 0)
+
+
+class TestyRozpoznania(unittest.TestCase):
+    """Testy klasy 'statki.plansza.Rozpoznanie'."""
+
+    def setUp(self):
+        """Przygotuj planszę i jej rozpoznanie do testów."""
+        self.plansza = Plansza(12, 10, ziarno=3)
+        self.rozpoznanie = Rozpoznanie(self.plansza)
+
+    def testuj_rozpoznanie__mgla_wojny(self):
+        """
+        Czy rozpoznanie zna tylko wyniki oddanych strzałów, a strzały trafiają w rzeczywistą planszę?
+        """
+        statek = self.plansza.statki[-1]
+        pole = statek.pola[0]
+        self.assertEqual(len(self.rozpoznanie.podaj_nieodwiedzone_pola()), self.plansza.rozmiar)
+        self.assertEqual(self.rozpoznanie.podaj_pole(*pole.podaj_wspolrzedne()).znacznik, Pole.ZNACZNIKI.pusty)
+
+        self.rozpoznanie.odkryj_pola([self.rozpoznanie.podaj_pole(*pole.podaj_wspolrzedne())])
+        self.assertEqual(self.rozpoznanie.podaj_pole(*pole.podaj_wspolrzedne()).znacznik, Pole.ZNACZNIKI.trafiony)
+        self.assertEqual(pole.znacznik, Pole.ZNACZNIKI.trafiony)
+        self.assertEqual(statek.ile_otrzymanych_trafien(), 1)
+        self.assertTrue(self.rozpoznanie.czy_sa_trafione_pola())
+        self.assertEqual(self.rozpoznanie.magazyn.policz(Pole.ZNACZNIKI.statek), 0)
+
+    def testuj_rozpoznanie__zatopienie(self):
+        """
+        Czy po zatopieniu statku rozpoznanie zna jego pola i obwiednię, a kopia rozpoznania jest niezależna?
+        """
+        statek = self.plansza.statki[-1]
+        kopia = self.rozpoznanie.kopiuj()
+        self.rozpoznanie.odkryj_pola(statek.pola)
+        self.rozpoznanie.oznacz_zatopione()
+        self.assertEqual(self.rozpoznanie.zatopione, [statek])
+        self.assertEqual(self.plansza.zatopione, [statek])
+        self.assertFalse(self.rozpoznanie.czy_sa_trafione_pola())
+        for pole in statek.obwiednia:
+            with self.subTest(pole=str(pole)):
+                self.assertEqual(self.rozpoznanie.podaj_pole(*pole.podaj_wspolrzedne()).znacznik,
+                                 Pole.ZNACZNIKI.obwiednia)
+        nieodwiedzone = self.plansza.rozmiar - statek.rozmiar - len(statek.obwiednia)
+        self.assertEqual(len(self.rozpoznanie.podaj_nieodwiedzone_pola()), nieodwiedzone)
+        self.assertEqual(len(kopia.podaj_nieodwiedzone_pola()), self.plansza.rozmiar)
+
+
+    def testuj_rozpoznanie__pula_nieodwiedzonych_i_front(self):
+        """
+        Czy pula pól nieodwiedzonych i front trafień zgadzają się ze znanymi znacznikami pól w trakcie całej gry?
+        """
+        los = Random(8)
+        while self.rozpoznanie.nieodwiedzone:
+            pole = self.rozpoznanie.losuj_nieodwiedzone_pole(los)
+            self.rozpoznanie.odkryj_pola([pole])
+            self.rozpoznanie.oznacz_zatopione()
+            magazyn = self.rozpoznanie.magazyn
+            self.assertEqual(sorted(self.rozpoznanie.nieodwiedzone), magazyn.podaj_indeksy(Pole.ZNACZNIKI.pusty))
+            self.assertEqual(sorted(self.rozpoznanie.front), magazyn.podaj_indeksy(Pole.ZNACZNIKI.trafiony))
+        self.assertEqual(self.plansza.niezatopione, [])
+
+
 class TestyPola(unittest.TestCase):
     """Testy klasy 'statki.plansza.Pole'."""
 
@@ -165,19 +463,35 @@ class TestyPola(unittest.TestCase):
         """
         drugie = Pole(id(self), 10, 10, Pole.ZNACZNIKI.pusty)
         self.assertEqual(self.pole, drugie)
+        self.assertTrue(self.pole.czy_identyczne(drugie))
 
     def testuj_pole__roznica(self):
         """
-        Czy dwa pola należące do różnych plansz, mające różne współrzędne i różne znaczniki są różne?
+        Czy dwa pola należące do różnych plansz albo mające różne współrzędne są różne?
         """
         drugie_inna_plansza = Pole(id(object()), 10, 10, Pole.ZNACZNIKI.pusty)
         drugie_inne_wspolrzedne = Pole(id(self), 13, 3, Pole.ZNACZNIKI.pusty)
-        drugie_inny_znacznik = Pole(id(self), 10, 10, Pole.ZNACZNIKI.zatopiony)
 
-        for drugie in [drugie_inna_plansza, drugie_inne_wspolrzedne,
-                       drugie_inny_znacznik]:
+        for drugie in [drugie_inna_plansza, drugie_inne_wspolrzedne]:
             with self.subTest(pole=str(drugie)):
                 self.assertNotEqual(self.pole, drugie)
+                self.assertFalse(self.pole.czy_identyczne(drugie))
+
+    def testuj_pole__roznica_znacznikow(self):
+        """
+        Czy dwa pola różniące się tylko znacznikiem są równe, ale nie identyczne?
+        """
+        drugie_inny_znacznik = Pole(id(self), 10, 10, Pole.ZNACZNIKI.zatopiony)
+        self.assertEqual(self.pole, drugie_inny_znacznik)
+        self.assertFalse(self.pole.czy_identyczne(drugie_inny_znacznik))
+
+    def testuj_pole__stalosc_hasha(self):
+        """
+        Czy pole pozostaje odnajdywalne w zbiorze po zmianie znacznika?
+        """
+        zbior = {self.pole}
+        self.pole.znacznik = Pole.ZNACZNIKI.pudlo
+        self.assertIn(self.pole, zbior)
 
     def testuj_pole__obsluga_wyjatkowosci_w_zbiorach(self):
         """
@@ -298,7 +612,53 @@ class TestySalwy(unittest.TestCase):
 
 class TestyStatku(unittest.TestCase):
     """Testy klasy 'statki.plansza.Statek'."""
-    pass
+
+    def testuj_statek__rangi_wg_rozmiaru(self):
+        """Czy fabryka tworzy statki rangi odpowiadającej rozmiarowi, z siłą ognia tej rangi?"""
+        for ranga in Statek.RANGI:
+            for rozmiar in ranga.zakres:
+                with self.subTest(ranga=ranga.nazwa, rozmiar=rozmiar):
+                    plansza = podaj_pusta_plansze(10, 10)
+                    statek = stworz_statek(plansza, *[(i % 10 + 1, i // 10 + 1) for i in range(rozmiar)])
+                    self.assertIs(statek.RANGA_BAZOWA, ranga)
+                    self.assertIs(statek.ranga, ranga)
+                    self.assertEqual(statek.sila_ognia, ranga.sila_ognia)
+
+    def testuj_statek__obnizanie_rangi(self):
+        """
+        Czy trafienia obniżają rangę rzeczywistą i siłę ognia statku do rangi wynikającej z ilości nietrafionych pól?
+        """
+        plansza = podaj_pusta_plansze(10, 10)
+        statek = stworz_statek(plansza, *[(i % 10 + 1, i // 10 + 1) for i in range(19)])  # pancernik
+        self.assertIs(statek.ranga, Statek.RANGI.pancernik)
+        plansza.odkryj_pola(statek.pola[:2])
+        self.assertIs(statek.ranga, Statek.RANGI.pancernik)  # 17 nietrafionych pól
+        plansza.odkryj_pola(statek.pola[2:3])
+        self.assertIs(statek.ranga, Statek.RANGI.krazownik)  # 16 nietrafionych pól
+        self.assertEqual(statek.sila_ognia, Statek.RANGI.krazownik.sila_ognia)
+        plansza.odkryj_pola(statek.pola[3:7])
+        self.assertIs(statek.ranga, Statek.RANGI.niszczyciel)  # 12 nietrafionych pól
+        plansza.odkryj_pola(statek.pola[7:18])
+        self.assertIs(statek.ranga, Statek.RANGI.kuter)
+        self.assertIs(statek.RANGA_BAZOWA, Statek.RANGI.pancernik)
+        plansza.oznacz_zatopione()
+        self.assertFalse(statek.czy_zatopiony())
+        plansza.odkryj_pola(statek.pola[18:])
+        plansza.oznacz_zatopione()
+        self.assertIs(statek.ranga, Statek.RANGI.kuter)
+
+    def testuj_statek__premie_za_ofiary(self):
+        """Czy każda ofiara dodaje statkowi premiową salwę w 1 pole, zachowywaną po obniżeniu rangi?"""
+        plansza = podaj_pusta_plansze(10, 10)
+        statek = stworz_statek(plansza, *[(i + 1, 1) for i in range(7)])  # fregata
+        ofiary = [stworz_statek(plansza, (1, 5)), stworz_statek(plansza, (3, 5), (4, 5))]
+        for ofiara in ofiary:
+            statek.dodaj_ofiare(ofiara)
+        self.assertEqual(statek.ofiary, ofiary)
+        self.assertEqual(statek.sila_ognia, Statek.RANGI.fregata.sila_ognia + [1, 1])
+        self.assertTrue(str(statek).endswith(Statek.ORDER * 2))
+        plansza.odkryj_pola(statek.pola[:1])
+        self.assertEqual(statek.sila_ognia, Statek.RANGI.korweta.sila_ognia + [1, 1])
 
 
 # def main():
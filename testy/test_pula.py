@@ -0,0 +1,74 @@
+"""
+
+    testy.test_pula
+    ~~~~~~~~~~~~~~~
+
+    Testy jednostkowe modułu 'statki.pula'.
+
+"""
+
+import unittest
+import pickle
+
+from statki.pula import PulaPlansz, generuj_plansze
+
+
+def podaj_opis_planszy(zserializowana):
+    """Podaj opis zserializowanej planszy: znaczniki wszystkich pól i opisy statków."""
+    plansza = pickle.loads(zserializowana)
+    znaczniki = "".join(pole.znacznik for rzad in plansza.pola for pole in rzad)
+    return znaczniki, [str(statek) for statek in plansza.statki]
+
+
+class TestyPuliPlansz(unittest.TestCase):
+    """Testy klasy 'statki.pula.PulaPlansz'."""
+
+    def setUp(self):
+        """Przygotuj pustą pulę do testów."""
+        self.pula = PulaPlansz(wielkosc=2)
+
+    def testuj_pule__generowanie_przy_pustej_puli(self):
+        """Czy pusta pula podaje planszę wygenerowaną na bieżąco, nie uruchamiając uzupełniania w tle?"""
+        plansza = self.pula.podaj_plansze(12, 10, zapelnienie=30)
+        self.assertEqual((plansza.kolumny, plansza.rzedy), (12, 10))
+        self.assertEqual(plansza.ilosc_pol_statkow, int(12 * 10 * 30 / 100))
+        self.assertEqual(self.pula.watki, {})
+        self.pula.uzupelnij(12, 10, zapelnienie=30).join()
+        self.assertEqual(self.pula.podaj_ilosc_plansz(12, 10, zapelnienie=30), 2)
+        self.assertEqual(self.pula.podaj_ilosc_plansz(12, 10), 0)
+
+    def testuj_pule__wypelnianie_zawczasu(self):
+        """Czy wypełniona zawczasu pula wydaje plansze bez generowania i uzupełnia się w tle dopiero po wydaniu?"""
+        self.assertEqual(self.pula.wypelnij(12, 10), 2)
+        self.assertEqual(self.pula.wypelnij(12, 10), 0)
+        self.assertEqual(self.pula.watki, {})
+        self.pula.podaj_plansze(12, 10, uzupelniaj=False)
+        self.assertEqual((self.pula.podaj_ilosc_plansz(12, 10), self.pula.watki), (1, {}))
+        self.pula.podaj_plansze(12, 10)
+        self.pula.uzupelnij(12, 10).join()
+        self.assertEqual(self.pula.podaj_ilosc_plansz(12, 10), 2)
+
+    def testuj_pule__wydawanie_plansz(self):
+        """Czy plansze wydane z puli są odrębne i mają pola oznaczone własnym identyfikatorem?"""
+        self.pula.wypelnij(12, 10)
+        plansze = [self.pula.podaj_plansze(12, 10) for _ in range(2)]
+        self.assertIsNot(plansze[0].statki[0], plansze[1].statki[0])
+        for plansza in plansze:
+            with self.subTest(plansza=id(plansza)):
+                self.assertEqual(plansza.podaj_pole(1, 1).id_planszy, id(plansza))
+                self.assertIs(plansza.podaj_statek(plansza.statki[0].polozenie), plansza.statki[0])
+        self.assertNotEqual(plansze[0].podaj_pole(1, 1), plansze[1].podaj_pole(1, 1))
+        self.pula.uzupelnij(12, 10).join()
+        self.assertEqual(self.pula.podaj_ilosc_plansz(12, 10), 2)
+
+
+class TestyGenerowaniaPlansz(unittest.TestCase):
+    """Testy funkcji 'statki.pula.generuj_plansze'."""
+
+    def testuj_generowanie__powtarzalnosc(self):
+        """Czy te same ziarno i parametry dają te same plansze niezależnie od ilości procesów?"""
+        jeden_proces = [podaj_opis_planszy(plansza) for plansza in generuj_plansze(6, 12, 10, ziarno=7, procesy=1)]
+        dwa_procesy = [podaj_opis_planszy(plansza) for plansza in generuj_plansze(6, 12, 10, ziarno=7, procesy=2, porcja=1)]
+        self.assertEqual(len(jeden_proces), 6)
+        self.assertEqual(jeden_proces, dwa_procesy)
+        self.assertNotEqual(jeden_proces[0], jeden_proces[1])
@@ -0,0 +1,70 @@
+"""
+
+    testy.test_turniej
+    ~~~~~~~~~~~~~~~~~~
+
+    Testy jednostkowe modułu 'statki.turniej'.
+
+"""
+
+import unittest
+
+from statki.turniej import Statystyki, Srednia, podaj_zadania, rozegraj_partie, rozegraj_turniej
+
+
+class TestyTurnieju(unittest.TestCase):
+    """Testy funkcji rozgrywania turnieju."""
+
+    def testuj_turniej__zadania(self):
+        """Czy każda strategia zaczyna tyle samo partii, a każda partia ma inne ziarno?"""
+        zadania = list(podaj_zadania(["AI", "MocneAI"], [(12, 10), (15, 15)], [20], 3))
+        self.assertEqual(len(zadania), 2 * 2 * 3)
+        self.assertEqual(len({zadanie.ziarno for zadanie in zadania}), len(zadania))
+        self.assertEqual(sum(zadanie.strategie[0] == "AI" for zadanie in zadania), len(zadania) // 2)
+
+    def testuj_turniej__powtarzalnosc(self):
+        """Czy wyniki partii (również mocnego AI, bez zmiany jego ustawień) nie zależą od procesu, w którym zostały rozegrane?"""
+        zadania = list(podaj_zadania(["AI", "MocneAI"], [(12, 10)], [20], 2))
+        w_procesie_glownym = [rozegraj_partie(zadanie) for zadanie in zadania]
+        w_puli = list(rozegraj_turniej(zadania, procesy=2, porcja=1))  # w kolejności ukończenia
+        self.assertEqual(sorted(w_procesie_glownym), sorted(w_puli))
+        for wynik in w_procesie_glownym:
+            self.assertIn(wynik.zwyciezca, (0, 1))
+            self.assertGreater(wynik.strzaly, 0)
+
+
+class TestyStatystyk(unittest.TestCase):
+    """Testy klas 'statki.turniej.Statystyki' i 'statki.turniej.Srednia'."""
+
+    def testuj_srednia(self):
+        """Czy średnia krocząca i jej margines odpowiadają wartościom liczonym wprost?"""
+        srednia = Srednia()
+        for wartosc in [2, 4, 4, 4, 5, 5, 7, 9]:
+            srednia.dodaj(wartosc)
+        self.assertAlmostEqual(srednia.srednia, 5.0)
+        self.assertAlmostEqual(srednia.podaj_margines(z=1.0), (32 / 7) ** 0.5 / 8 ** 0.5)
+
+    def testuj_srednia__opis(self):
+        """Czy opis średniej bez wartości to '–', a z jedną wartością - sama średnia (bez marginesu)?"""
+        srednia = Srednia()
+        self.assertEqual(srednia.podaj_opis(), "–")
+        srednia.dodaj(3)
+        self.assertEqual(srednia.podaj_opis(), "3.0")
+        srednia.dodaj(5)
+        self.assertEqual(srednia.podaj_opis(), "4.0 ± {:.1f}".format(srednia.podaj_margines()))
+
+    def testuj_statystyki__wiersze(self):
+        """Czy wynik partii jest uwzględniany w statystykach obu stron?"""
+        statystyki = Statystyki()
+        zadanie = next(podaj_zadania(["AI", "MocneAI"], [(12, 10)], [20], 1))
+        wynik = rozegraj_partie(zadanie)
+        statystyki.dodaj(wynik)
+        wygrany = statystyki.wiersze[(wynik.strategie[wynik.zwyciezca], wynik.strategie[1 - wynik.zwyciezca],
+                                      "12x10 (20%)")]
+        przegrany = statystyki.wiersze[(wynik.strategie[1 - wynik.zwyciezca], wynik.strategie[wynik.zwyciezca],
+                                        "12x10 (20%)")]
+        self.assertEqual((wygrany.partie, wygrany.wygrane, wygrany.strzaly.srednia), ([1], [1], wynik.strzaly))
+        self.assertEqual((przegrany.partie, przegrany.wygrane, przegrany.strzaly.n), ([1], [0], 0))
+        tabela = statystyki.podaj_tabele().splitlines()
+        self.assertEqual(len(tabela), 3)
+        self.assertNotIn("nan", "\n".join(tabela))
@@ -6,22 +6,64 @@
 
 """
 
+import argparse
 import tkinter as tk
+from time import perf_counter
 
 from statki.gui.interfejs import Interfejs
+from statki.gui.plansza import PlanszaGUI
+from statki.pula import PULA
 
+KOLUMNY, RZEDY = 15, 15  # dopuszczalny rozmiar planszy: 8-26 kolumn x 8-30 rzędów
 
-def main():
+
+def policz_widzety(widzet):
+    """Policz widżet i wszystkie jego widżety potomne."""
+    return 1 + sum(policz_widzety(potomny) for potomny in widzet.winfo_children())
+
+
+def wypisz_pomiar(okno_glowne, poczatek):
+    """Wypisz czas do pierwszego wyrysowania okna, ilość widżetów i szczytowe zużycie pamięci procesu."""
+    okno_glowne.update()  # wymusza wyrysowanie okna
+    czas = perf_counter() - poczatek
+    print("Czas do pierwszego wyrysowania: {:.3f} s".format(czas))
+    print("Ilość widżetów: {}".format(policz_widzety(okno_glowne)))
+    try:
+        import resource
+    except ImportError:  # brak modułu w systemie Windows
+        return
+    print("Szczytowe zużycie pamięci: {} kB".format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def main(argumenty=None):
     """Uruchom grę."""
+    parser = argparse.ArgumentParser(description="Statki")
+    parser.add_argument("-r", "--renderer", choices=PlanszaGUI.RENDERERY, default="przyciski",
+                        help="sposób rysowania plansz: osobne przyciski lub jedna kanwa (domyślnie przyciski)")
+    parser.add_argument("--pomiar", action="store_true",
+                        help="wypisz czas do pierwszego wyrysowania okna, ilość widżetów i zużycie pamięci, "
+                             "a po zamknięciu okna - statystyki zbiorczych aktualizacji GUI")
+    argumenty = parser.parse_args(argumenty)
+
+    poczatek = perf_counter()
+    PULA.wypelnij(KOLUMNY, RZEDY)  # plansze obu stron gotowe przed zbudowaniem okna
     okno_glowne = tk.Tk()
     okno_glowne.title("Statki")
-    Interfejs(
+    interfejs = Interfejs(
         rodzic=okno_glowne,
-        kolumny=15,
-        rzedy=15
-    )  # dopuszczalny rozmiar planszy: 8-26 kolumn x 8-30 rzędów
+        kolumny=KOLUMNY,
+        rzedy=RZEDY,
+        renderer=argumenty.renderer
+    )
     okno_glowne.resizable(False, False)
+    if argumenty.pomiar:
+        wypisz_pomiar(okno_glowne, poczatek)
     okno_glowne.mainloop()
+    if argumenty.pomiar:
+        harmonogram = interfejs.harmonogram
+        print("Zbiorcze aktualizacje GUI: {} zapisów, {} zleconych i {} wykonanych wywołań Tk "
+              "(zaoszczędzone: {})".format(harmonogram.ilosc_zapisow, harmonogram.suma_zleconych,
+                                           harmonogram.suma_wykonanych, harmonogram.podaj_oszczednosc()))
 
 
 if __name__ == "__main__":
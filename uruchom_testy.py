@@ -10,12 +10,20 @@ import unittest
 
 import testy.test_plansza as tpl
 import testy.test_pamiec as tpm
+import testy.test_pula as tpu
+import testy.test_mechanika as tme
+import testy.test_turniej as ttu
+import testy.test_komunikaty as tko
 
 loader, suite = unittest.TestLoader(), unittest.TestSuite()
 
 # zbierz moduły testowe w jeden komplet
 suite.addTests(loader.loadTestsFromModule(tpl))
 suite.addTests(loader.loadTestsFromModule(tpm))
+suite.addTests(loader.loadTestsFromModule(tpu))
+suite.addTests(loader.loadTestsFromModule(tme))
+suite.addTests(loader.loadTestsFromModule(ttu))
+suite.addTests(loader.loadTestsFromModule(tko))
 
 # uruchom komplet testów
 rezultat = unittest.TextTestRunner(verbosity=2).run(suite)